@@ -0,0 +1,2 @@
+#!/usr/bin/python3
+"""Initialize the api.v1 package"""
@@ -0,0 +1,204 @@
+#!/usr/bin/python3
+"""REST API server module for AirBnB clone project
+
+Serves the views of api.v1.views over HTTP/1.1 with asyncio streams:
+
+    $ HBNB_API_HOST=0.0.0.0 HBNB_API_PORT=5000 python3 -m api.v1.app
+
+Requests that change objects do not save storage themselves; they wake a
+background writer which saves once for all the changes made within
+HBNB_API_FLUSH_MS milliseconds, after their responses were sent. The
+records are gathered on the event loop and the file is written on a
+thread (see FileStorage.save_later()), so requests are answered while
+it is written.
+"""
+import asyncio
+import logging
+import sys
+from http import HTTPStatus
+from os import getenv
+from urllib.parse import parse_qs, urlsplit
+from models import storage
+from api.v1.views import HTTPError, dispatch, encode, etag, etags
+
+_CHANGES = ("POST", "PUT", "DELETE")
+logger = logging.getLogger(__name__)
+
+
+class Writer:
+    """Background task saving storage after changes, off the request path"""
+
+    def __init__(self, delay=0.05):
+        """Initialize a writer coalescing the changes of delay seconds"""
+        self.delay = delay
+        self.saves = 0
+        self.__event = None
+        self.__task = None
+        self.__writing = None
+
+    def start(self):
+        """Start the writer on the running event loop"""
+        self.__event = asyncio.Event()
+        self.__task = asyncio.ensure_future(self.__run())
+
+    def schedule(self):
+        """Ask for a save in the background"""
+        self.__event.set()
+
+    async def close(self):
+        """Stop the writer, then save every change
+
+        The save is not skipped when nothing was scheduled since the last
+        one, as that one may have failed.
+        """
+        self.__task.cancel()
+        try:
+            await self.__task
+        except asyncio.CancelledError:
+            pass
+        if self.__writing is not None:
+            await asyncio.wait([self.__writing])
+        storage.save()
+        self.saves += 1
+
+    async def __run(self):
+        """Wait for changes and save them"""
+        while True:
+            await self.__event.wait()
+            await asyncio.sleep(self.delay)
+            await self.__save()
+
+    async def __save(self):
+        """Save storage, writing the files on a thread
+
+        A failed save is logged and its changes stay unsaved, so the
+        next change saves them again.
+        """
+        self.__event.clear()
+        loop = asyncio.get_running_loop()
+        try:
+            self.__writing = loop.run_in_executor(None, storage.save_later())
+            await asyncio.shield(self.__writing)
+        except Exception:
+            logger.exception("saving storage failed")
+            return
+        self.saves += 1
+
+
+def respond(method, target, headers, body):
+    """Return (status, headers, body) answering one request
+
+    GET responses carry an ETag and become 304 Not Modified when it is
+    listed in If-None-Match. Unexpected errors are logged and answered
+    with 500.
+    """
+    url = urlsplit(target)
+    try:
+        status, payload, extra = dispatch(method, url.path,
+                                          parse_qs(url.query), body, headers)
+    except HTTPError as error:
+        status, payload, extra = error.status, {"error": error.message}, {}
+    except Exception:
+        logger.exception("%s %s failed", method, target)
+        status, payload, extra = 500, {"error": "Internal server error"}, {}
+    data = encode(payload)
+    response = {"Content-Type": "application/json"}
+    response.update(extra)
+    if method == "GET" and status == 200:
+        response["ETag"] = etag(data)
+        if response["ETag"] in etags(headers.get("if-none-match", "")):
+            return 304, {"ETag": response["ETag"]}, b""
+    return status, response, data
+
+
+class Server:
+    """HTTP/1.1 server running respond() for every request
+
+    Another function with the signature of respond() can be given to
+    serve something else than the API.
+    """
+
+    def __init__(self, host="0.0.0.0", port=5000, flush_ms=50,
+                 respond=respond):
+        """Initialize the server"""
+        self.host = host
+        self.port = port
+        self.respond = respond
+        self.writer = Writer(flush_ms / 1000)
+        self.server = None
+
+    async def start(self):
+        """Start listening; port 0 picks a free port"""
+        self.writer.start()
+        self.server = await asyncio.start_server(self.__handle, self.host,
+                                                 self.port)
+        self.port = self.server.sockets[0].getsockname()[1]
+
+    async def close(self):
+        """Stop listening and save the pending changes"""
+        self.server.close()
+        await self.server.wait_closed()
+        await self.writer.close()
+
+    async def serve_forever(self):
+        """Start the server and run until cancelled"""
+        await self.start()
+        try:
+            await self.server.serve_forever()
+        finally:
+            await self.close()
+
+    async def __handle(self, reader, client):
+        """Answer the requests of one connection"""
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                method, target, version = line.decode("latin-1").split()
+                headers = {}
+                while True:
+                    line = await reader.readline()
+                    if line in (b"\r\n", b"\n", b""):
+                        break
+                    name, _, value = line.decode("latin-1").partition(":")
+                    headers[name.strip().lower()] = value.strip()
+                body = await reader.readexactly(
+                    int(headers.get("content-length", 0)))
+                status, response, data = self.respond(method, target,
+                                                      headers, body)
+                if method in _CHANGES and status < 300:
+                    self.writer.schedule()
+                close = (version == "HTTP/1.0" or
+                         headers.get("connection", "").lower() == "close")
+                response["Content-Length"] = str(len(data))
+                if close:
+                    response["Connection"] = "close"
+                head = [f"HTTP/1.1 {status} {HTTPStatus(status).phrase}"]
+                head.extend(f"{name}: {value}"
+                            for name, value in response.items())
+                head = "\r\n".join(head) + "\r\n\r\n"
+                client.write(head.encode("latin-1") + data)
+                await client.drain()
+                if close:
+                    break
+        except (ValueError, asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            client.close()
+
+
+def main(argv):
+    """Run the API server until interrupted"""
+    server = Server(getenv("HBNB_API_HOST", "0.0.0.0"),
+                    int(getenv("HBNB_API_PORT", "5000")),
+                    int(getenv("HBNB_API_FLUSH_MS", "50")))
+    try:
+        asyncio.run(server.serve_forever())
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,259 @@
+#!/usr/bin/python3
+"""REST API views module for AirBnB clone project
+
+dispatch() maps a request to a view and returns (status, payload,
+headers). Views only change objects in memory; the server saves storage
+after the changing requests.
+"""
+import hashlib
+import json
+from datetime import datetime
+from models import storage
+from models.base_model import BaseModel
+from models.user import User
+from models.state import State
+from models.city import City
+from models.amenity import Amenity
+from models.place import Place
+from models.review import Review
+from models.engine.query import Query, QueryError
+from models.engine.search import places_search
+
+PREFIX = "/api/v1"
+PER_PAGE = 100
+collections = {
+    "base_models": BaseModel,
+    "users": User,
+    "states": State,
+    "cities": City,
+    "amenities": Amenity,
+    "places": Place,
+    "reviews": Review
+}
+_PROTECTED = ("id", "created_at", "updated_at", "__class__")
+_CLAUSES = (("where", "where"), ("group_by", "group by"),
+            ("order_by", "order by"), ("fields", "fields"))
+
+
+class HTTPError(Exception):
+    """Error answered with status and a JSON {"error": message} body"""
+
+    def __init__(self, status, message):
+        """Initialize the error"""
+        super().__init__(message)
+        self.status = status
+        self.message = message
+
+
+def encode(payload):
+    """Return the JSON body of payload"""
+    return json.dumps(payload).encode()
+
+
+def etag(body):
+    """Return the entity tag of the response body"""
+    return f'"{hashlib.sha1(body).hexdigest()}"'
+
+
+def etags(value):
+    """Return the entity tags listed in an If-Match/If-None-Match value"""
+    return {tag.strip() for tag in value.split(",")}
+
+
+def status(query, body):
+    """GET /status"""
+    return 200, {"status": "OK"}, {}
+
+
+def stats(query, body):
+    """GET /stats: the number of objects of each class"""
+    return 200, {name: storage.count(cls)
+                 for name, cls in collections.items()}, {}
+
+
+def list_objects(cls, query, body):
+    """GET /<collection>?page=&per_page=: one page of objects
+
+    where, group_by, order_by and fields take the clauses of a query of
+    the console's all command, such as where=max_guest>=4 and
+    price_by_night<100, order_by=price_by_night desc, or group_by=city_id
+    with fields=count,avg(price_by_night) for one row per group.
+    """
+    clauses = [f"{keyword} {query[name][-1]}" for name, keyword in _CLAUSES
+               if name in query]
+    if not clauses:
+        return _page(list(storage.all(cls).values()), query)
+    try:
+        parsed = Query.parse(" ".join([cls.__name__] + clauses),
+                             {cls.__name__: cls})
+        results = list(parsed.run(storage))
+    except QueryError as error:
+        raise HTTPError(400, str(error))
+    if parsed.fields is None and not parsed.aggregating():
+        return _page(results, query)
+    return _page(results, query, _row)
+
+
+def search_places(query, body):
+    """POST /places_search: one page of the Places matching the filters
+
+    The body lists ids under "states", "cities" and "amenities"; a Place
+    matches when it is in one of the States or Cities, if any are given,
+    and has all of the Amenities.
+    """
+    filters = _json(body)
+    ids = {}
+    for name in ("states", "cities", "amenities"):
+        value = filters.get(name) or []
+        if not isinstance(value, list) or \
+                not all(isinstance(item, str) for item in value):
+            raise HTTPError(400, f"{name} must be a list of ids")
+        ids[name] = value
+    return _page(list(places_search(storage, **ids).values()), query)
+
+
+def create_object(cls, query, body):
+    """POST /<collection>: a new object with the attributes of the body"""
+    attrs = _attributes(cls, _json(body))
+    obj = cls()
+    for name, value in attrs.items():
+        setattr(obj, name, value)
+    return 201, obj.to_dict(), {"Location": f"{PREFIX}/"
+                                f"{_collection(cls)}/{obj.id}"}
+
+
+def get_object(obj, query, body):
+    """GET /<collection>/<id>"""
+    return 200, obj.to_dict(), {}
+
+
+def update_object(obj, query, body):
+    """PUT /<collection>/<id>: set the attributes of the body"""
+    attrs = _attributes(type(obj), _json(body))
+    for name, value in attrs.items():
+        setattr(obj, name, value)
+    obj.updated_at = datetime.now()
+    return 200, obj.to_dict(), {}
+
+
+def delete_object(obj, query, body):
+    """DELETE /<collection>/<id>"""
+    storage.delete(obj)
+    return 200, {}, {}
+
+
+routes = {
+    ("GET", "status"): status,
+    ("GET", "stats"): stats,
+    ("POST", "places_search"): search_places
+}
+collection_routes = {
+    "GET": list_objects,
+    "POST": create_object
+}
+object_routes = {
+    "GET": get_object,
+    "PUT": update_object,
+    "DELETE": delete_object
+}
+
+
+def dispatch(method, path, query, body, headers):
+    """Run the view for the request and return (status, payload, headers)
+
+    PUT and DELETE honour If-Match with the ETag of the current object.
+    """
+    if not path.startswith(PREFIX + "/"):
+        raise HTTPError(404, "Not found")
+    parts = path[len(PREFIX) + 1:].strip("/").split("/")
+    if len(parts) == 1 and (method, parts[0]) in routes:
+        return routes[(method, parts[0])](query, body)
+    cls = collections.get(parts[0])
+    if cls is None or len(parts) > 2:
+        raise HTTPError(404, "Not found")
+    if len(parts) == 1:
+        view = collection_routes.get(method)
+        if view is None:
+            raise HTTPError(405, "Method not allowed")
+        return view(cls, query, body)
+    view = object_routes.get(method)
+    if view is None:
+        raise HTTPError(405, "Method not allowed")
+    obj = storage.get(cls, parts[1])
+    if obj is None:
+        raise HTTPError(404, "Not found")
+    expected = headers.get("if-match")
+    if expected and expected != "*" and \
+            etag(encode(obj.to_dict())) not in etags(expected):
+        raise HTTPError(412, "Precondition failed")
+    return view(obj, query, body)
+
+
+def _collection(cls):
+    """Return the collection name of cls"""
+    for name, value in collections.items():
+        if value is cls:
+            return name
+
+
+def _page(objects, query, render=None):
+    """Return the response of the page of objects asked for by query
+
+    Each object of the page is rendered by render(obj), obj.to_dict() by
+    default.
+    """
+    page = _positive(query, "page", 1)
+    per_page = _positive(query, "per_page", PER_PAGE)
+    start = (page - 1) * per_page
+    headers = {"X-Total-Count": str(len(objects))}
+    if start + per_page < len(objects):
+        headers["Link"] = (f'<?page={page + 1}&per_page={per_page}>; '
+                           f'rel="next"')
+    if render is None:
+        return 200, [obj.to_dict() for obj in
+                     objects[start:start + per_page]], headers
+    return 200, [render(obj) for obj in objects[start:start + per_page]], \
+        headers
+
+
+def _row(row):
+    """Return a projection or a row of aggregates that JSON can encode"""
+    return {name: value.isoformat() if isinstance(value, datetime) else value
+            for name, value in row.items()}
+
+
+def _positive(query, name, default):
+    """Return the positive integer query parameter name"""
+    value = query.get(name, [str(default)])[-1]
+    try:
+        value = int(value)
+    except ValueError:
+        value = 0
+    if value < 1:
+        raise HTTPError(400, f"{name} must be a positive integer")
+    return value
+
+
+def _attributes(cls, attrs):
+    """Return the attributes of a body that may be set on cls
+
+    The protected ones are left out. Names starting with "_" or naming
+    a method of cls raise HTTPError 400, before anything is changed.
+    """
+    for name in attrs:
+        if name not in _PROTECTED and (name.startswith("_") or
+                                       callable(getattr(cls, name, None))):
+            raise HTTPError(400, f"{name} cannot be set")
+    return {name: value for name, value in attrs.items()
+            if name not in _PROTECTED}
+
+
+def _json(body):
+    """Return the JSON object of a request body"""
+    try:
+        attrs = json.loads(body or b"null")
+    except ValueError:
+        attrs = None
+    if not isinstance(attrs, dict):
+        raise HTTPError(400, "Not a JSON")
+    return attrs
@@ -0,0 +1,80 @@
+#!/usr/bin/python3
+"""Benchmark bulk imports and exports of Places
+
+Usage: ./benchmarks/bench_bulk.py [rows ...]
+
+For every number of rows (100,000 and 1,000,000 by default), writes a
+dataset of that many Places as NDJSON and as CSV, then imports each one
+into an empty store and exports it again with models.engine.bulk, every
+run in its own process. Prints the rows per second, the peak RSS of the
+process and the size of the file. The store is reloaded lazily
+(HBNB_STORAGE_LAZY=1), so exports do not build the objects.
+"""
+import json
+import os
+import random
+import subprocess
+import sys
+import tempfile
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+RUN = ("import resource, sys\n"
+       "from models.engine.bulk import main\n"
+       "status = main(sys.argv[1:])\n"
+       "print(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,"
+       " file=sys.stderr)\n"
+       "sys.exit(status)\n")
+
+
+def dataset(path, total, rng):
+    """Write total Places to path as NDJSON and to its .csv twin"""
+    cities = [f"city-{i}" for i in range(1000)]
+    columns = ("city_id", "name", "number_rooms", "max_guest",
+               "price_by_night", "latitude", "longitude")
+    with open(path, 'w') as ndjson, open(path[:-6] + "csv", 'w') as csv:
+        csv.write(",".join(columns) + "\n")
+        for i in range(total):
+            row = {"city_id": rng.choice(cities), "name": f"Place {i}",
+                   "number_rooms": rng.randrange(1, 6),
+                   "max_guest": rng.randrange(1, 12),
+                   "price_by_night": rng.randrange(20, 500),
+                   "latitude": round(rng.uniform(-60, 60), 6),
+                   "longitude": round(rng.uniform(-180, 180), 6)}
+            ndjson.write(json.dumps(row) + "\n")
+            csv.write(",".join(str(row[name]) for name in columns) + "\n")
+
+
+def run(directory, *args):
+    """Run the bulk tool in directory; return (rows/s, peak RSS in MB)"""
+    result = subprocess.run([sys.executable, "-c", RUN, *args],
+                            cwd=directory, capture_output=True, text=True,
+                            env=dict(os.environ, PYTHONPATH=ROOT,
+                                     HBNB_STORAGE_LAZY="1"),
+                            check=True)
+    report, peak = result.stderr.splitlines()[-2:]
+    rate = float(report.rpartition("(")[2].split()[0])
+    return rate, int(peak) / 1024
+
+
+def main():
+    """Run the benchmark and print one table per number of rows"""
+    sizes = [int(arg) for arg in sys.argv[1:]] or [100000, 1000000]
+    directory = tempfile.mkdtemp()
+    for total in sizes:
+        path = os.path.join(directory, "places.ndjson")
+        dataset(path, total, random.Random(total))
+        print(f"\n{total} rows")
+        print(f"{'run':<16} {'rows/s':>9} {'peak MB':>8} {'file MB':>8}")
+        for name in ("places.ndjson", "places.csv"):
+            source = os.path.join(directory, name)
+            for command, target in (("import", source),
+                                    ("export", "out." + name[7:])):
+                rate, peak = run(directory, command, "Place", target)
+                size = os.path.getsize(os.path.join(directory, target))
+                print(f"{command + ' ' + name[7:]:<16} {rate:>9.0f} "
+                      f"{peak:>8.1f} {size / 2 ** 20:>8.1f}")
+            os.remove(os.path.join(directory, "file.json"))
+
+
+if __name__ == '__main__':
+    main()
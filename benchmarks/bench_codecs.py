@@ -0,0 +1,53 @@
+#!/usr/bin/python3
+"""Benchmark FileStorage save and reload throughput for every codec
+
+Usage: ./benchmarks/bench_codecs.py [objects]
+
+Stores objects (100,000 by default) Users and Places, then times a full
+save (every object encoded) and a reload with each available codec.
+"""
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+def main():
+    """Run the benchmark and print one line per codec"""
+    total = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    os.chdir(tempfile.mkdtemp())
+    from models.engine.codecs import codecs
+    from models.engine.file_storage import FileStorage
+    from models.place import Place
+    from models.user import User
+
+    FileStorage._FileStorage__objects = {}
+    for i in range(total):
+        obj = User() if i % 2 else Place()
+        obj.name = f"object {i}"
+    print(f"{'codec':>8} {'save/s':>10} {'reload/s':>10} {'MB':>7}")
+    for name in codecs:
+        try:
+            storage = FileStorage(codec=name)
+        except ValueError:
+            continue
+        objects = storage.all()
+        objects.records.clear()
+        start = time.perf_counter()
+        storage.compact()
+        saved = time.perf_counter() - start
+        snapshot = dict(objects)
+        FileStorage._FileStorage__objects = {}
+        start = time.perf_counter()
+        storage.reload()
+        loaded = time.perf_counter() - start
+        size = os.path.getsize(storage.file_path) / 2 ** 20
+        print(f"{name:>8} {total / saved:>10.0f} {total / loaded:>10.0f} "
+              f"{size:>7.1f}")
+        FileStorage._FileStorage__objects = snapshot
+
+
+if __name__ == '__main__':
+    main()
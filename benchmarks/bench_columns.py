@@ -0,0 +1,123 @@
+#!/usr/bin/python3
+"""Benchmark selections and aggregates of Places against a loop
+
+Usage: ./benchmarks/bench_columns.py [places ...]
+
+For every number of places (100,000 and 1,000,000 by default), stores
+that many Places spread over 1,000 cities, then times storage.select()
+and storage.aggregate() (the columnar snapshot of FileStorage) and a
+loop over the Places for a few filters and aggregates, checking that
+both find the same result. Building the snapshot, sorting a column on
+its first range lookup and changing a price once both are built are
+timed as well.
+"""
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+FILTERS = (("max_guest>=4 and price<100",
+            [("max_guest", ">=", 4), ("price_by_night", "<", 100)]),
+           ("100<=price<102",
+            [("price_by_night", ">=", 100), ("price_by_night", "<", 102)]))
+
+
+def populate(total, rng):
+    """Store total Places with a city, a price and a number of guests"""
+    from models.engine.file_storage import FileStorage
+    from models.place import Place
+    FileStorage._FileStorage__objects = {}
+    cities = [f"city-{i}" for i in range(1000)]
+    for _ in range(total):
+        place = Place()
+        place.city_id = rng.choice(cities)
+        place.price_by_night = rng.randrange(20, 500)
+        place.max_guest = rng.randrange(1, 12)
+
+
+def loop_select(places, conditions):
+    """Return the keys of the places meeting conditions, one by one"""
+    from models.engine.columns import matches
+    return [key for key, obj in places
+            if all(matches(getattr(obj, field, None), op, value)
+                   for field, op, value in conditions)]
+
+
+def loop_average(places, conditions):
+    """Return {city_id: average price} of the places meeting conditions"""
+    from models.engine.columns import matches
+    totals = {}
+    for _, obj in places:
+        if not all(matches(getattr(obj, field, None), op, value)
+                   for field, op, value in conditions):
+            continue
+        total = totals.setdefault(obj.city_id, [0, 0])
+        total[0] += obj.price_by_night
+        total[1] += 1
+    return {city: price / count for city, (price, count) in totals.items()}
+
+
+def timed(function, repeat):
+    """Return (result, mean seconds) of repeat calls of function()"""
+    start = time.perf_counter()
+    for _ in range(repeat):
+        result = function()
+    return result, (time.perf_counter() - start) / repeat
+
+
+def main():
+    """Run the benchmark and print one table per number of places"""
+    sizes = [int(arg) for arg in sys.argv[1:]] or [100000, 1000000]
+    os.chdir(tempfile.mkdtemp())
+    from models import storage
+    from models.place import Place
+
+    for total in sizes:
+        rng = random.Random(total)
+        start = time.perf_counter()
+        populate(total, rng)
+        print(f"\n{total} places stored in {time.perf_counter() - start:.1f}s")
+        start = time.perf_counter()
+        storage.select(Place, [("max_guest", "=", 0)])
+        print(f"snapshot built in {time.perf_counter() - start:.2f}s")
+        start = time.perf_counter()
+        storage.select(Place, [("price_by_night", "<", 0)])
+        print(f"price column sorted in {time.perf_counter() - start:.2f}s")
+        places = list(storage.all(Place).items())
+        print(f"{'query':<28} {'columns ms':>10} {'loop ms':>9} "
+              f"{'speedup':>8} {'same':>5}")
+        for label, conditions in FILTERS:
+            found, fast = timed(lambda: sorted(storage.select(
+                Place, conditions)), 20)
+            expected, slow = timed(lambda: sorted(loop_select(
+                places, conditions)), 1)
+            print(f"{label:<28} {fast * 1e3:>10.2f} {slow * 1e3:>9.1f} "
+                  f"{slow / fast:>7.0f}x {str(found == expected):>5}")
+        for label, conditions in (("avg price per city", []),
+                                  ("avg price per city, filtered",
+                                   FILTERS[0][1])):
+            found, fast = timed(lambda: {
+                city: summary["price_by_night"]["avg"]
+                for city, summary in storage.aggregate(
+                    Place, ("price_by_night",), "city_id",
+                    conditions).items()}, 5)
+            expected, slow = timed(lambda: loop_average(places, conditions),
+                                   1)
+            same = found.keys() == expected.keys() and all(
+                abs(found[city] - expected[city]) < 1e-9 for city in found)
+            print(f"{label:<28} {fast * 1e3:>10.2f} {slow * 1e3:>9.1f} "
+                  f"{slow / fast:>7.0f}x {str(same):>5}")
+        changed = [obj for _, obj in places[:10000]]
+        start = time.perf_counter()
+        for obj in changed:
+            obj.price_by_night = rng.randrange(20, 500)
+        print(f"changing a price costs "
+              f"{(time.perf_counter() - start) / len(changed) * 1e6:.1f} us")
+        del places, changed
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,56 @@
+#!/usr/bin/python3
+"""Benchmark the memory used by BaseModel and compact model instances
+
+Usage: ./benchmarks/bench_compact.py [objects]
+
+Builds objects (1,000,000 by default) Places through the kwargs
+constructor with each representation and reports the memory they hold.
+"""
+import os
+import sys
+import tracemalloc
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+def measure(cls, records):
+    """Return (bytes, seconds) to build one cls instance per record
+
+    The build is timed without tracemalloc, whose hooks would dominate it.
+    """
+    start = time.perf_counter()
+    objects = [cls(**record) for record in records]
+    elapsed = time.perf_counter() - start
+    del objects
+    tracemalloc.start()
+    objects = [cls(**record) for record in records]
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del objects
+    return size, elapsed
+
+
+def main():
+    """Run the benchmark and print one line per representation"""
+    total = int(sys.argv[1]) if len(sys.argv) > 1 else 1000000
+    from models.place import Place
+    from models.compact import compact
+
+    template = Place(id="", created_at="2024-01-01T12:00:00.000000",
+                     updated_at="2024-01-01T12:30:00.000000").to_dict()
+    records = []
+    for i in range(total):
+        record = dict(template, id=f"{i:08d}-0000-4000-8000-000000000000",
+                      name=f"Place {i}", number_rooms=i % 5,
+                      price_by_night=50 + i % 200, latitude=i / total)
+        records.append(record)
+    print(f"{'model':>12} {'MB':>9} {'bytes/obj':>10} {'build s':>8}")
+    for label, cls in (("BaseModel", Place), ("compact", compact(Place))):
+        size, elapsed = measure(cls, records)
+        print(f"{label:>12} {size / 2 ** 20:>9.1f} {size / total:>10.0f} "
+              f"{elapsed:>8.2f}")
+
+
+if __name__ == '__main__':
+    main()
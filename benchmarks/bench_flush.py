@@ -0,0 +1,45 @@
+#!/usr/bin/python3
+"""Benchmark FileStorage flush cost against the number of changed objects
+
+Usage: ./benchmarks/bench_flush.py [total_objects]
+
+A store of total_objects Users is flushed once, then a growing number of
+them is modified before each timed flush. With dirty tracking the encoding
+work follows the number of changed objects, not the size of the store.
+"""
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+def main():
+    """Run the benchmark and print one line per changed-object count"""
+    total = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    os.chdir(tempfile.mkdtemp())
+    from models import storage
+    from models.user import User
+
+    users = [User() for _ in range(total)]
+    storage.save()
+    storage.compact_every = total * 2
+    print(f"{'changed':>8} {'snapshot ms':>12} {'wal ms':>8}")
+    for changed in (0, 1, 10, 100, 1000, 10000):
+        if changed > total:
+            break
+        timings = []
+        for mode in ("snapshot", "wal"):
+            storage.mode = mode
+            for user in users[:changed]:
+                user.first_name = f"name-{changed}"
+            start = time.perf_counter()
+            storage.save()
+            timings.append((time.perf_counter() - start) * 1000)
+        storage.compact()
+        print(f"{changed:>8} {timings[0]:>12.2f} {timings[1]:>8.2f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,94 @@
+#!/usr/bin/python3
+"""Benchmark spatial searches of Places against a full scan
+
+Usage: ./benchmarks/bench_geo.py [places ...]
+
+For every number of places (100,000 and 1,000,000 by default), stores
+that many Places, most of them around 500 cities and the others spread
+over the globe, then times storage.near() (the grid of FileStorage) and
+a full scan of the Places (models.engine.geo.scan) for radius and
+nearest-neighbour searches around random cities, checking that both
+find the same Places. Building the grid on the first search and moving
+a Place once it is built are timed as well.
+"""
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+SEARCHES = (("within 10 km", 10, None), ("within 100 km", 100, None),
+            ("10 nearest", None, 10), ("100 nearest", None, 100))
+
+
+def populate(total, rng):
+    """Store total Places and return the cities they gather around"""
+    from models.engine.file_storage import FileStorage
+    from models.place import Place
+    FileStorage._FileStorage__objects = {}
+    cities = [(rng.uniform(-60, 60), rng.uniform(-180, 180))
+              for _ in range(500)]
+    for i in range(total):
+        place = Place()
+        if i % 5:
+            latitude, longitude = rng.choice(cities)
+            place.latitude = max(-90.0, min(90.0, rng.gauss(latitude, 0.2)))
+            place.longitude = (rng.gauss(longitude, 0.2) + 180) % 360 - 180
+        else:
+            place.latitude = rng.uniform(-90, 90)
+            place.longitude = rng.uniform(-180, 180)
+    return cities
+
+
+def timed(function, points):
+    """Return (results, mean seconds) of function(*point) for each point"""
+    start = time.perf_counter()
+    results = [function(*point) for point in points]
+    return results, (time.perf_counter() - start) / len(points)
+
+
+def main():
+    """Run the benchmark and print one table per number of places"""
+    sizes = [int(arg) for arg in sys.argv[1:]] or [100000, 1000000]
+    os.chdir(tempfile.mkdtemp())
+    from models import storage
+    from models.place import Place
+    from models.engine.geo import scan
+
+    for total in sizes:
+        rng = random.Random(total)
+        start = time.perf_counter()
+        cities = populate(total, rng)
+        print(f"\n{total} places stored in {time.perf_counter() - start:.1f}s")
+        start = time.perf_counter()
+        storage.near(Place, 0, 0, k=1)
+        print(f"grid built in {time.perf_counter() - start:.2f}s")
+        places = list(storage.all(Place).items())
+        points = [rng.choice(cities) for _ in range(200)]
+        scanned = points[:max(3, 2000000 // total)]
+        print(f"{'search':<14} {'grid ms':>9} {'scan ms':>9} {'speedup':>8} "
+              f"{'found':>7} {'same':>5}")
+        for label, km, k in SEARCHES:
+            found, grid = timed(lambda lat, lon: [
+                obj.id for _, obj in storage.near(Place, lat, lon, km, k)],
+                points)
+            expected, full = timed(lambda lat, lon: [
+                key.partition(".")[2] for _, key in
+                scan(places, lat, lon, km, k)], scanned)
+            same = found[:len(expected)] == expected
+            mean = sum(map(len, found)) / len(found)
+            print(f"{label:<14} {grid * 1e3:>9.3f} {full * 1e3:>9.1f} "
+                  f"{full / grid:>7.0f}x {mean:>7.1f} {str(same):>5}")
+        moved = [obj for _, obj in places[:10000]]
+        start = time.perf_counter()
+        for obj in moved:
+            obj.latitude = rng.uniform(-90, 90)
+        print(f"moving a place costs "
+              f"{(time.perf_counter() - start) / len(moved) * 1e6:.1f} us")
+        del places, moved
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,77 @@
+#!/usr/bin/python3
+"""Benchmark the sharded layout across worker counts
+
+Usage: ./benchmarks/bench_shards.py [objects] [max_workers]
+
+Stores objects (100,000 by default) spread over every class, then for
+1, 2, 4... workers up to max_workers (the number of CPUs) times a full
+save (every object encoded) and a lazy reload in the sharded layout, and
+checks that the shards are identical to the ones a single process writes.
+"""
+import hashlib
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+def digest(directory):
+    """Return a hash of the names and contents of the files in directory"""
+    h = hashlib.sha1()
+    for name in sorted(os.listdir(directory)):
+        h.update(name.encode())
+        with open(os.path.join(directory, name), 'rb') as f:
+            h.update(f.read())
+    return h.hexdigest()
+
+
+def main():
+    """Run the benchmark and print one line per worker count"""
+    total = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    os.chdir(tempfile.mkdtemp())
+    from models.engine.file_storage import FileStorage
+    from models.amenity import Amenity
+    from models.city import City
+    from models.place import Place
+    from models.review import Review
+    from models.state import State
+    from models.user import User
+
+    classes = (User, Place, City, Review, State, Amenity)
+    FileStorage._FileStorage__objects = {}
+    for i in range(total):
+        classes[i % len(classes)]().name = f"object {i}"
+    most = int(sys.argv[2]) if len(sys.argv) > 2 else os.cpu_count() or 1
+    counts = [1]
+    while counts[-1] * 2 <= most:
+        counts.append(counts[-1] * 2)
+    print(f"{'workers':>8} {'save/s':>10} {'reload/s':>10} {'speedup':>8} "
+          f"{'same':>5}")
+    reference = baseline = None
+    for workers in counts:
+        storage = FileStorage(layout="sharded", workers=workers, lazy=True)
+        objects = storage.all()
+        objects.dirty.update(objects)
+        objects.records.clear()
+        shutil.rmtree(storage.shard_dir, ignore_errors=True)
+        start = time.perf_counter()
+        storage.compact()
+        saved = time.perf_counter() - start
+        snapshot = dict(objects)
+        FileStorage._FileStorage__objects = {}
+        start = time.perf_counter()
+        storage.reload()
+        loaded = time.perf_counter() - start
+        FileStorage._FileStorage__objects = snapshot
+        reference = reference or digest(storage.shard_dir)
+        baseline = baseline or saved + loaded
+        print(f"{workers:>8} {total / saved:>10.0f} {total / loaded:>10.0f} "
+              f"{baseline / (saved + loaded):>7.2f}x "
+              f"{str(digest(storage.shard_dir) == reference):>5}")
+
+
+if __name__ == '__main__':
+    main()
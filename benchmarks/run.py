@@ -0,0 +1,372 @@
+#!/usr/bin/python3
+"""Benchmark suite for the storage, model and console hot paths
+
+Usage: ./benchmarks/run.py [--size=1k|100k|1M] [--only=NAME,...]
+                           [--save=FILE] [--compare=FILE] [--threshold=0.1]
+
+A synthetic store of Users, Places, Cities and Reviews is generated from a
+fixed seed, then every benchmark runs in its own process over a copy of
+it so that its peak RSS is its own. Each reports operations per second,
+the p50 and p99 latency of one timed operation and the peak RSS.
+
+--save writes the results to a JSON file; --compare reads such a file
+and prints the change of every benchmark, exiting with status 1 when one
+of them lost more than --threshold of its throughput.
+"""
+import io
+import json
+import os
+import platform
+import random
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+import uuid
+from datetime import datetime, timedelta
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+SIZES = {"1k": 1000, "100k": 100000, "1M": 1000000}
+SAMPLES = 20000
+CLASSES = ("User", "Place", "City", "Review")
+
+
+def generate(path, total, seed=1234):
+    """Write a file.json of total objects mixed across CLASSES"""
+    rng = random.Random(seed)
+    start = datetime(2024, 1, 1)
+    ids = {name: [] for name in CLASSES}
+    with open(path, 'w') as f:
+        f.write("{")
+        for i in range(total):
+            name = CLASSES[i % len(CLASSES)]
+            obj_id = str(uuid.UUID(int=rng.getrandbits(128), version=4))
+            created = start + timedelta(seconds=rng.randrange(10 ** 7))
+            record = {"id": obj_id, "created_at": created.isoformat(),
+                      "updated_at": created.isoformat(), "__class__": name}
+            if name == "User":
+                record.update(email=f"user{i}@example.com",
+                              first_name=f"First{i}", last_name=f"Last{i}")
+            elif name == "City":
+                record.update(name=f"City {i}", state_id=f"state-{i % 50}")
+            elif name == "Place":
+                record.update(name=f"Place {i}",
+                              city_id=rng.choice(ids["City"] or ["none"]),
+                              user_id=rng.choice(ids["User"] or ["none"]),
+                              number_rooms=rng.randrange(1, 8),
+                              max_guest=rng.randrange(1, 12),
+                              price_by_night=rng.randrange(20, 500),
+                              latitude=rng.uniform(-90, 90),
+                              longitude=rng.uniform(-180, 180),
+                              amenity_ids=[])
+            else:
+                record.update(place_id=rng.choice(ids["Place"] or ["none"]),
+                              user_id=rng.choice(ids["User"] or ["none"]),
+                              text=f"Review {i}")
+            ids[name].append(obj_id)
+            f.write(("" if i == 0 else ", ") +
+                    f"{json.dumps(f'{name}.{obj_id}')}: {json.dumps(record)}")
+        f.write("}")
+
+
+class _Null(io.TextIOBase):
+    """Output stream discarding everything written to it"""
+
+    def write(self, text):
+        """Discard text"""
+        return len(text)
+
+
+def _each(operation, items):
+    """Time operation(item) for every item; return the latencies"""
+    clock = time.perf_counter
+    latencies = []
+    for item in items:
+        start = clock()
+        operation(item)
+        latencies.append(clock() - start)
+    return latencies
+
+
+def _sample(rng, values):
+    """Return up to SAMPLES values picked with rng"""
+    values = list(values)
+    return rng.sample(values, min(len(values), SAMPLES))
+
+
+def model_init(rng):
+    """BaseModel.__init__(**kwargs) of Place records"""
+    from models import storage
+    from models.place import Place
+    records = [obj.to_dict() for obj in _sample(rng, storage.all(Place)
+                                                .values())]
+    return _each(lambda record: Place(**record), records)
+
+
+def to_dict(rng):
+    """to_dict() of objects of every class"""
+    from models import storage
+    return _each(lambda obj: obj.to_dict(),
+                 _sample(rng, storage.all().values()))
+
+
+def storage_save(rng):
+    """FileStorage.save() with every object changed (full encode)"""
+    from models import storage
+    objects = storage.all()
+    latencies = []
+    for _ in range(3):
+        objects.dirty.update(objects)
+        objects.records.clear()
+        start = time.perf_counter()
+        storage.save()
+        latencies.append(time.perf_counter() - start)
+    return latencies, len(objects)
+
+
+def storage_save_one(rng):
+    """FileStorage.save() after changing one object"""
+    from models import storage
+    objects = _sample(rng, storage.all().values())[:20]
+
+    def save(obj):
+        """Change obj and save"""
+        obj.name = "changed"
+        storage.save()
+    return _each(save, objects)
+
+
+def storage_reload(rng):
+    """FileStorage.reload() of the whole store"""
+    from models import storage
+    from models.engine.file_storage import FileStorage
+    total = storage.count()
+    latencies = []
+    for _ in range(3):
+        FileStorage._FileStorage__objects = {}
+        start = time.perf_counter()
+        storage.reload()
+        latencies.append(time.perf_counter() - start)
+    return latencies, total
+
+
+def console_show(rng):
+    """Console dispatch of show <class> <id>"""
+    from console import HBNBCommand
+    from models import storage
+    command = HBNBCommand()
+    lines = [f"show {key.replace('.', ' ', 1)}"
+             for key in _sample(rng, storage.all())]
+    stdout, sys.stdout = sys.stdout, _Null()
+    try:
+        return _each(command.onecmd, lines)
+    finally:
+        sys.stdout = stdout
+
+
+def console_create(rng):
+    """Console dispatch of create <class>, saves deferred"""
+    from console import HBNBCommand
+    from models import storage
+    command = HBNBCommand()
+    lines = [f"create {rng.choice(CLASSES)}" for _ in range(SAMPLES)]
+    stdout, sys.stdout = sys.stdout, _Null()
+    try:
+        with storage.transaction():
+            latencies = _each(command.onecmd, lines)
+            raise _Discard
+    except _Discard:
+        return latencies
+    finally:
+        sys.stdout = stdout
+
+
+def console_startup(rng):
+    """Starting ./console.py and running quit, in a new interpreter"""
+    command = [sys.executable, os.path.join(ROOT, "console.py")]
+    return _each(lambda _: subprocess.run(command, input=b"quit\n",
+                                          stdout=subprocess.DEVNULL,
+                                          check=True), range(10))
+
+
+def places_search(rng):
+    """places_search() for two amenities, in a state one time in two"""
+    from models import storage
+    from models.city import City
+    from models.place import Place
+    from models.engine.search import places_search as search
+    amenities = [f"amenity-{i}" for i in range(20)]
+    for place in storage.all(Place).values():
+        place.amenity_ids = rng.sample(amenities, rng.randrange(6))
+    states = sorted({city.state_id for city in
+                     storage.all(City).values()})
+    searches = [{"amenities": rng.sample(amenities, 2),
+                 "states": [rng.choice(states)] if i % 2 else []}
+                for i in range(1000)]
+    return _each(lambda ids: search(storage, **ids), searches)
+
+
+def place_query(rng):
+    """A price and guests range query, or the average price per city
+
+    The columnar snapshot and its sorted indexes are built beforehand.
+    """
+    from models import storage
+    from models.engine.query import Query
+    from models.place import Place
+    classes = {"Place": Place}
+    Query.parse("Place where price_by_night<0 and max_guest<0",
+                classes).count(storage)
+    queries = []
+    for i in range(200):
+        low = rng.randrange(20, 500)
+        if i % 2:
+            text = (f"Place where price_by_night>={low} and price_by_night<"
+                    f"{low + 20} and max_guest>={rng.randrange(1, 12)}")
+        else:
+            text = (f"Place where price_by_night<{low} group by city_id "
+                    f"fields count,avg(price_by_night)")
+        queries.append(Query.parse(text, classes))
+    return _each(lambda query: query.count(storage), queries)
+
+
+class _Discard(Exception):
+    """Raised to roll a benchmark transaction back"""
+
+
+benchmarks = {
+    "model_init": model_init,
+    "to_dict": to_dict,
+    "storage_save": storage_save,
+    "storage_save_one": storage_save_one,
+    "storage_reload": storage_reload,
+    "console_show": console_show,
+    "console_create": console_create,
+    "console_startup": console_startup,
+    "places_search": places_search,
+    "place_query": place_query
+}
+
+
+def percentile(values, fraction):
+    """Return the value below which fraction of the sorted values fall"""
+    values = sorted(values)
+    return values[min(len(values) - 1, int(fraction * len(values)))]
+
+
+def peak_rss_mb():
+    """Return the peak resident set size of this process in MB"""
+    try:
+        import resource
+    except ImportError:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / (2 ** 20 if sys.platform == "darwin" else 2 ** 10)
+
+
+def child(name, data):
+    """Run the benchmark name over a copy of the store data; print JSON"""
+    os.chdir(tempfile.mkdtemp(dir=os.path.dirname(data)))
+    os.symlink(data, "file.json")
+    result = benchmarks[name](random.Random(name))
+    if isinstance(result, tuple):
+        latencies, operations = result
+    else:
+        latencies, operations = result, len(result)
+    print(json.dumps({
+        "ops_per_sec": operations / sum(latencies),
+        "p50_us": percentile(latencies, 0.5) * 1e6,
+        "p99_us": percentile(latencies, 0.99) * 1e6,
+        "peak_rss_mb": peak_rss_mb(),
+        "operations": operations
+    }))
+    return 0
+
+
+def run(names, size):
+    """Return the results of the benchmarks names on a store of size"""
+    directory = tempfile.mkdtemp()
+    try:
+        data = os.path.join(directory, "file.json")
+        generate(data, SIZES[size])
+        results = {}
+        for name in names:
+            output = subprocess.run(
+                [sys.executable, os.path.abspath(__file__),
+                 f"--child={name}", f"--data={data}"],
+                stdout=subprocess.PIPE, check=True, text=True).stdout
+            results[name] = json.loads(output.splitlines()[-1])
+            print_result(name, results[name])
+        return results
+    finally:
+        shutil.rmtree(directory, ignore_errors=True)
+
+
+def print_result(name, result, baseline=None):
+    """Print one line of results, with the change from baseline if any"""
+    rss = result["peak_rss_mb"]
+    line = (f"{name:<18} {result['ops_per_sec']:>12.0f} "
+            f"{result['p50_us']:>10.1f} {result['p99_us']:>10.1f} "
+            f"{rss if rss is None else round(rss, 1):>9}")
+    if baseline is not None:
+        change = result["ops_per_sec"] / baseline["ops_per_sec"] - 1
+        line += f" {change:>+8.1%}"
+    print(line)
+
+
+def compare(results, path, threshold):
+    """Print the change from the baseline at path; return regressions"""
+    with open(path, 'r') as f:
+        baseline = json.load(f)["results"]
+    print(f"\ncompared with {path}:")
+    regressions = []
+    for name, result in results.items():
+        if name not in baseline:
+            continue
+        print_result(name, result, baseline[name])
+        if result["ops_per_sec"] < baseline[name]["ops_per_sec"] * (
+                1 - threshold):
+            regressions.append(name)
+    if regressions:
+        print(f"regressions: {', '.join(regressions)}")
+    return regressions
+
+
+def main(argv):
+    """Command line entry point"""
+    options = dict(arg[2:].split("=", 1) for arg in argv
+                   if arg.startswith("--") and "=" in arg)
+    if "child" in options:
+        return child(options["child"], options["data"])
+    size = options.get("size", "1k")
+    if size not in SIZES:
+        print(f"unknown size: {size}", file=sys.stderr)
+        return 2
+    names = options["only"].split(",") if "only" in options else \
+        list(benchmarks)
+    unknown = [name for name in names if name not in benchmarks]
+    if unknown:
+        print(f"unknown benchmarks: {', '.join(unknown)}", file=sys.stderr)
+        return 2
+    print(f"{SIZES[size]} objects")
+    print(f"{'benchmark':<18} {'ops/s':>12} {'p50 us':>10} {'p99 us':>10} "
+          f"{'peak MB':>9}")
+    results = run(names, size)
+    if "save" in options:
+        with open(options["save"], 'w') as f:
+            json.dump({"size": size, "python": platform.python_version(),
+                       "platform": platform.platform(),
+                       "date": datetime.now().isoformat(timespec="seconds"),
+                       "results": results}, f, indent=2)
+    if "compare" in options and compare(
+            results, options["compare"],
+            float(options.get("threshold", 0.1))):
+        return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main(sys.argv[1:]))
@@ -1,6 +1,11 @@
 #!/usr/bin/python3
 """Console module for AirBnB clone project"""
 import cmd
+import json
+from datetime import datetime
+import re
+import sys
+import time
 from models import storage
 from models.base_model import BaseModel
 from models.user import User
@@ -9,6 +14,8 @@ from models.city import City
 from models.amenity import Amenity
 from models.place import Place
 from models.review import Review
+from models.engine.metrics import metrics
+from models.engine.query import Query, QueryError
 import shlex
 
 class HBNBCommand(cmd.Cmd):
@@ -24,6 +31,71 @@ class HBNBCommand(cmd.Cmd):
         "Review": Review
     }
 
+    @staticmethod
+    def __split(arg):
+        """Split a command line into arguments like shlex.split
+
+        Lines without quotes or backslashes, the vast majority, are split
+        on whitespace without going through shlex.
+        """
+        if '"' in arg or "'" in arg or "\\" in arg:
+            return shlex.split(arg)
+        return arg.split()
+
+    @staticmethod
+    def __flag(arg, flag):
+        """Return whether the word flag is in arg, and arg without it"""
+        stripped = re.sub(rf"(^|\s){re.escape(flag)}(?=\s|$)", " ", arg)
+        return stripped != arg, stripped.strip()
+
+    @staticmethod
+    def __print_list(strings):
+        """Print strings like print(list(strings)), one at a time"""
+        write = sys.stdout.write
+        write("[")
+        separator = ""
+        for string in strings:
+            write(separator + repr(string))
+            separator = ", "
+        write("]\n")
+
+    def batch(self, stream, flush_every=1000):
+        """Run the commands read from stream without a prompt
+
+        Commands run inside storage transactions, so storage is written
+        once every flush_every commands (only at the end if 0) instead of
+        after every create, update and destroy. A command that raises
+        is reported like an invalid one and the next ones still run.
+        Returns the number of commands run.
+        """
+        count = 0
+        lines = (line.rstrip('\r\n') for line in stream)
+        lines = (line for line in lines if line.strip())
+        for line in lines:
+            with storage.transaction():
+                while line is not None:
+                    count += 1
+                    try:
+                        stop = self.onecmd(line)
+                    except Exception as error:
+                        print(f"** {error} **")
+                        stop = False
+                    if stop:
+                        return count
+                    if flush_every and count % flush_every == 0:
+                        break
+                    line = next(lines, None)
+        return count
+
+    def onecmd(self, line):
+        """Run one command, timing it when profiling is on"""
+        if not metrics.enabled:
+            return super().onecmd(line)
+        name = self.parseline(line)[0] or "empty"
+        if not name.isidentifier():
+            name = "unknown"
+        return metrics.call(f"console.{name}", super().onecmd, line)
+
     def do_quit(self, arg):
         """Quit command to exit the program"""
         return True
@@ -39,7 +111,7 @@ class HBNBCommand(cmd.Cmd):
 
     def do_create(self, arg):
         """Creates a new instance of a class"""
-        args = shlex.split(arg)
+        args = self.__split(arg)
         if not args:
             print("** class name missing **")
             return
@@ -51,8 +123,12 @@ class HBNBCommand(cmd.Cmd):
         print(new_instance.id)
 
     def do_show(self, arg):
-        """Prints the string representation of an instance"""
-        args = shlex.split(arg)
+        """Prints the string representation of an instance
+
+        Usage: show [--json] <class> <id>
+        """
+        as_json, arg = self.__flag(arg, "--json")
+        args = self.__split(arg)
         if not args:
             print("** class name missing **")
             return
@@ -62,16 +138,15 @@ class HBNBCommand(cmd.Cmd):
         if len(args) < 2:
             print("** instance id missing **")
             return
-        key = f"{args[0]}.{args[1]}"
-        objects = storage.all()
-        if key not in objects:
+        obj = storage.get(args[0], args[1])
+        if obj is None:
             print("** no instance found **")
             return
-        print(objects[key])
+        print(json.dumps(obj.to_dict()) if as_json else obj)
 
     def do_destroy(self, arg):
         """Deletes an instance based on class name and id"""
-        args = shlex.split(arg)
+        args = self.__split(arg)
         if not args:
             print("** class name missing **")
             return
@@ -81,30 +156,135 @@ class HBNBCommand(cmd.Cmd):
         if len(args) < 2:
             print("** instance id missing **")
             return
-        key = f"{args[0]}.{args[1]}"
-        objects = storage.all()
-        if key not in objects:
+        obj = storage.get(args[0], args[1])
+        if obj is None:
             print("** no instance found **")
             return
-        del objects[key]
+        storage.delete(obj)
         storage.save()
 
     def do_all(self, arg):
-        """Prints all string representations of instances"""
-        args = shlex.split(arg)
-        objects = storage.all()
+        """Prints all string representations of instances
+
+        Usage: all [--json] [<class> [where <field><op><value> [and ...]]
+                   [group by <field>] [order by <field> [asc|desc]]
+                   [limit <n>] [fields <field>|<aggregate>,...]]
+        The list is printed one instance at a time. With a condition, an
+        order, a limit or fields, the results are printed one per line as
+        they are found. Aggregates (count, count(<field>), min(<field>),
+        max(<field>), avg(<field>), sum(<field>)) or group by print one
+        line per group instead. --json prints one JSON object per line,
+        taken from the serialized records storage already holds.
+        """
+        as_json, arg = self.__flag(arg, "--json")
+        args = self.__split(arg)
         if args and args[0] not in self.__classes:
             print("** class doesn't exist **")
             return
-        result = []
-        for obj in objects.values():
-            if not args or obj.__class__.__name__ == args[0]:
-                result.append(str(obj))
-        print(result)
+        if len(args) > 1:
+            query = self.__query(arg)
+            if query is None:
+                return
+            if as_json:
+                results = query.run(storage)
+                if query.fields is None and not query.aggregating():
+                    results = (obj.to_dict() for obj in results)
+                for result in results:
+                    print(json.dumps(result, default=datetime.isoformat))
+            else:
+                for result in query.run(storage):
+                    print(result)
+            return
+        cls = args[0] if args else None
+        if as_json:
+            write = sys.stdout.write
+            for _, record in storage.records(cls):
+                if "\n" in record:
+                    record = json.dumps(json.loads(record))
+                write(record + "\n")
+            return
+        objects = storage.all(cls) if cls else storage.all()
+        self.__print_list(str(obj) for obj in objects.values())
+
+    def do_count(self, arg):
+        """Prints the number of instances of a class
+
+        Usage: count <class> [where <field><op><value> [and ...]]
+        """
+        args = self.__split(arg)
+        if not args:
+            print("** class name missing **")
+            return
+        if args[0] not in self.__classes:
+            print("** class doesn't exist **")
+            return
+        query = self.__query(arg)
+        if query is not None:
+            print(query.count(storage))
+
+    def do_near(self, arg):
+        """Prints the instances nearest to a point, with their distance
+
+        Usage: near <class> <latitude> <longitude> [within <km>] [limit <n>]
+        One instance per line, nearest first, after its distance in km.
+        Without within, the 10 nearest instances are printed.
+        """
+        args = self.__split(arg)
+        if not args:
+            print("** class name missing **")
+            return
+        if args[0] not in self.__classes:
+            print("** class doesn't exist **")
+            return
+        coordinates = []
+        for i, name in ((1, "latitude"), (2, "longitude")):
+            if len(args) <= i:
+                print(f"** {name} missing **")
+                return
+            try:
+                coordinates.append(float(args[i]))
+            except ValueError:
+                print(f"** {name} must be a number **")
+                return
+        options = {}
+        words = args[3:]
+        for i in range(0, len(words), 2):
+            word = words[i].lower()
+            if word not in ("within", "limit"):
+                print(f"** expected within or limit, found {words[i]} **")
+                return
+            if i + 1 >= len(words):
+                print(f"** {word} value missing **")
+                return
+            try:
+                options[word] = (float if word == "within" else int)(
+                    words[i + 1])
+            except ValueError:
+                print(f"** {word} must be a number **")
+                return
+        if "within" not in options:
+            options.setdefault("limit", 10)
+        try:
+            found = storage.near(args[0], *coordinates,
+                                 km=options.get("within"),
+                                 k=options.get("limit"))
+        except ValueError as error:
+            print(f"** {error} **")
+            return
+        for distance, obj in found:
+            print(f"{distance:.3f} km {obj}")
+
+    def __query(self, arg):
+        """Return the Query written in arg, or None after printing why not"""
+        try:
+            return Query.parse(arg, self.__classes)
+        except QueryError as error:
+            print(f"** {error} **")
+            return None
 
     def do_update(self, arg):
         """Updates an instance based on class name and id"""
-        args = shlex.split(arg)
+        args = self.__split(arg)
         if not args:
             print("** class name missing **")
             return
@@ -114,9 +294,8 @@ class HBNBCommand(cmd.Cmd):
         if len(args) < 2:
             print("** instance id missing **")
             return
-        key = f"{args[0]}.{args[1]}"
-        objects = storage.all()
-        if key not in objects:
+        obj = storage.get(args[0], args[1])
+        if obj is None:
             print("** no instance found **")
             return
         if len(args) < 3:
@@ -125,7 +304,6 @@ class HBNBCommand(cmd.Cmd):
         if len(args) < 4:
             print("** value missing **")
             return
-        obj = objects[key]
         if args[2] in ["id", "created_at", "updated_at"]:
             return
         try:
@@ -142,5 +320,60 @@ class HBNBCommand(cmd.Cmd):
         setattr(obj, args[2], value)
         obj.save()
 
+    def do_stats(self, arg):
+        """Prints the timers and counters collected since startup
+
+        Usage: stats [reset]
+        Profiling is turned on by setting HBNB_PROFILE=1; with
+        HBNB_PROFILE_DIR set too, every command is run under cProfile.
+        """
+        if arg.strip() == "reset":
+            metrics.reset()
+            return
+        if hasattr(storage, "stats"):
+            print(" ".join(f"{name}={value}"
+                           for name, value in storage.stats().items()))
+        if not metrics.enabled:
+            print("** profiling is off, set HBNB_PROFILE=1 **")
+            return
+        print(metrics.report())
+
+if metrics.enabled:
+    metrics.wrap(HBNBCommand, "_HBNBCommand__split", "console.parse")
+
+def main(argv):
+    """Command line entry point: [--batch [FILE]] [--flush-every=N]
+
+    Without --batch the interactive interpreter runs. With it, commands
+    are read from FILE (standard input if missing or "-") and the number
+    of commands per second is reported on standard error.
+    """
+    args = [arg for arg in argv if not arg.startswith("--")]
+    options = dict(arg[2:].split("=", 1) for arg in argv
+                   if arg.startswith("--") and "=" in arg)
+    if "--batch" not in argv:
+        HBNBCommand().cmdloop()
+        return 0
+    try:
+        flush_every = int(options.get("flush-every", 1000))
+    except ValueError:
+        flush_every = -1
+    if flush_every < 0:
+        print("usage: ./console.py [--batch [FILE]] [--flush-every=N]",
+              file=sys.stderr)
+        return 2
+    path = args[0] if args else "-"
+    stream = sys.stdin if path == "-" else open(path, 'r')
+    start = time.perf_counter()
+    try:
+        count = HBNBCommand().batch(stream, flush_every)
+    finally:
+        if stream is not sys.stdin:
+            stream.close()
+    elapsed = time.perf_counter() - start
+    print(f"{count} commands in {elapsed:.3f}s "
+          f"({count / max(elapsed, 1e-9):.0f} commands/s)", file=sys.stderr)
+    return 0
+
 if __name__ == '__main__':
-    HBNBCommand().cmdloop()
\ No newline at end of file
+    sys.exit(main(sys.argv[1:]))
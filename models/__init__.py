@@ -1,6 +1,28 @@
 #!/usr/bin/python3
 """Initialize the models package"""
-from models.engine.file_storage import FileStorage
+from os import getenv
 
-storage = FileStorage()
-storage.reload()
\ No newline at end of file
+if getenv("HBNB_TYPE_STORAGE") == "db":
+    from models.engine.db_storage import DBStorage
+    storage = DBStorage(getenv("HBNB_DB_PATH", "hbnb.db"))
+elif getenv("HBNB_TYPE_STORAGE") == "cache":
+    from models.engine.cache_storage import CacheStorage
+    storage = CacheStorage(getenv("HBNB_CACHE_PATH", "hbnb.data"),
+                           int(getenv("HBNB_CACHE_SIZE", "10000")),
+                           getenv("HBNB_DURABILITY", "flush"))
+else:
+    from models.engine.file_storage import FileStorage
+    storage = FileStorage(mode=getenv("HBNB_STORAGE_MODE", "snapshot"),
+                          lazy=getenv("HBNB_STORAGE_LAZY") == "1",
+                          compact_models=getenv("HBNB_COMPACT_MODELS") == "1",
+                          codec=getenv("HBNB_STORAGE_CODEC", "json"),
+                          durability=getenv("HBNB_DURABILITY", "flush"),
+                          group_commit_ms=int(getenv("HBNB_GROUP_COMMIT_MS",
+                                                     "50")),
+                          shared=getenv("HBNB_STORAGE_SHARED") == "1",
+                          layout=getenv("HBNB_STORAGE_LAYOUT", "single"),
+                          workers=int(getenv("HBNB_STORAGE_WORKERS", "1")))
+if getenv("HBNB_PROFILE") == "1":
+    from models.engine.metrics import metrics
+    metrics.instrument(storage)
+storage.defer_reload()
@@ -2,6 +2,7 @@
 """BaseModel module for AirBnB clone project"""
 from uuid import uuid4
 from datetime import datetime
+import models
 
 class BaseModel:
     """Base class for all AirBnB objects"""
@@ -15,17 +16,30 @@ class BaseModel:
         """
         from models import storage  # Import inside method
         if kwargs:
+            attrs = {}
             for key, value in kwargs.items():
                 if key != '__class__':
-                    if key in ['created_at', 'updated_at']:
+                    if (key in ['created_at', 'updated_at'] and
+                            isinstance(value, str)):
                         value = datetime.fromisoformat(value)
-                    setattr(self, key, value)
+                    attrs[key] = value
+            self.__dict__.update(attrs)
         else:
-            self.id = str(uuid4())
-            self.created_at = datetime.now()
-            self.updated_at = datetime.now()
+            now = datetime.now()
+            self.__dict__.update(id=str(uuid4()), created_at=now,
+                                 updated_at=now)
             storage.new(self)
 
+    def __setattr__(self, name, value):
+        """Set an attribute and flag the instance as changed in storage"""
+        models.storage.track(self, name, value)
+        super().__setattr__(name, value)
+
+    def __delattr__(self, name):
+        """Delete an attribute and flag the instance as changed in storage"""
+        models.storage.track(self, name, getattr(type(self), name, None))
+        super().__delattr__(name)
+
     def __str__(self):
         """Return string representation of the instance"""
         return f"[{self.__class__.__name__}] ({self.id}) {self.__dict__}"
@@ -34,6 +48,7 @@ class BaseModel:
         """Update updated_at with current datetime and save to storage"""
         from models import storage  # Import inside method
         self.updated_at = datetime.now()
+        storage.new(self)
         storage.save()
 
     def to_dict(self):
@@ -0,0 +1,218 @@
+#!/usr/bin/python3
+"""Compact model module for AirBnB clone project
+
+compact(cls) builds a slot-based version of a model class from the
+attributes it declares. Instances have no per-instance dictionary and keep
+their timestamps as integers, but they honour the same contract as
+BaseModel: the kwargs constructor, __str__, save() and to_dict().
+"""
+from collections.abc import MutableMapping
+from datetime import datetime, timedelta
+from functools import lru_cache
+from uuid import uuid4
+import models
+
+_EPOCH = datetime(1970, 1, 1)
+_EPOCH_DAY = _EPOCH.toordinal()
+_TIMESTAMPS = ("created_at", "updated_at")
+
+
+def to_micros(value):
+    """Return a naive datetime (or ISO string) as microseconds since 1970"""
+    if isinstance(value, str):
+        value = datetime.fromisoformat(value)
+    seconds = ((value.toordinal() - _EPOCH_DAY) * 86400 + value.hour * 3600 +
+               value.minute * 60 + value.second)
+    return seconds * 1000000 + value.microsecond
+
+
+def from_micros(value):
+    """Return the naive datetime for microseconds since 1970"""
+    return _EPOCH + timedelta(microseconds=value)
+
+
+class _Attributes(MutableMapping):
+    """Live dictionary view of the attributes set on a compact instance"""
+
+    def __init__(self, obj):
+        """Initialize a view over obj"""
+        self.obj = obj
+
+    def __getitem__(self, name):
+        """Return the attribute name if it is set on the instance"""
+        if name in self.obj._names:
+            try:
+                return object.__getattribute__(self.obj, name)
+            except AttributeError:
+                raise KeyError(name)
+        extra = self.obj._extra
+        if extra is None or name not in extra:
+            raise KeyError(name)
+        return extra[name]
+
+    def __setitem__(self, name, value):
+        """Set the attribute name without reporting it to storage"""
+        if name in self.obj._names:
+            object.__setattr__(self.obj, name, value)
+        else:
+            if self.obj._extra is None:
+                object.__setattr__(self.obj, "_extra", {})
+            self.obj._extra[name] = value
+
+    def __delitem__(self, name):
+        """Unset the attribute name"""
+        if name in self.obj._names:
+            try:
+                object.__delattr__(self.obj, name)
+            except AttributeError:
+                raise KeyError(name)
+        elif self.obj._extra is None or name not in self.obj._extra:
+            raise KeyError(name)
+        else:
+            del self.obj._extra[name]
+
+    def __iter__(self):
+        """Iterate over the names of the attributes set on the instance"""
+        for name in ("id",) + _TIMESTAMPS + self.obj._fields[1:]:
+            try:
+                object.__getattribute__(self.obj, name)
+            except AttributeError:
+                continue
+            yield name
+        if self.obj._extra:
+            yield from list(self.obj._extra)
+
+    def __len__(self):
+        """Return the number of attributes set on the instance"""
+        return sum(1 for _ in self)
+
+    def __repr__(self):
+        """Return the representation of the equivalent dictionary"""
+        return repr(dict(self))
+
+
+class CompactModel:
+    """Base class for the slot-based models built by compact()"""
+
+    __slots__ = ("_created_at", "_updated_at", "_extra")
+    _fields = ("id",)
+    _names = frozenset(_fields + _TIMESTAMPS)
+    _defaults = {}
+
+    def __init__(self, *args, **kwargs):
+        """Initialize a new instance, like BaseModel.__init__"""
+        setattr = object.__setattr__
+        setattr(self, "_extra", None)
+        if kwargs:
+            names = self._names
+            for key, value in kwargs.items():
+                if key in names:
+                    setattr(self, key, value)
+                elif key != '__class__':
+                    self.__dict__[key] = value
+        else:
+            now = to_micros(datetime.now())
+            setattr(self, "id", str(uuid4()))
+            setattr(self, "_created_at", now)
+            setattr(self, "_updated_at", now)
+            models.storage.new(self)
+
+    @property
+    def __dict__(self):
+        """Return a live dictionary view of the attributes that are set"""
+        return _Attributes(self)
+
+    @property
+    def created_at(self):
+        """Return the creation datetime"""
+        return from_micros(self._created_at)
+
+    @created_at.setter
+    def created_at(self, value):
+        """Set the creation datetime from a datetime or ISO string"""
+        object.__setattr__(self, "_created_at", to_micros(value))
+
+    @created_at.deleter
+    def created_at(self):
+        """Unset the creation datetime"""
+        object.__delattr__(self, "_created_at")
+
+    @property
+    def updated_at(self):
+        """Return the last update datetime"""
+        return from_micros(self._updated_at)
+
+    @updated_at.setter
+    def updated_at(self, value):
+        """Set the last update datetime from a datetime or ISO string"""
+        object.__setattr__(self, "_updated_at", to_micros(value))
+
+    @updated_at.deleter
+    def updated_at(self):
+        """Unset the last update datetime"""
+        object.__delattr__(self, "_updated_at")
+
+    def __getattr__(self, name):
+        """Return undeclared attributes, then declared defaults"""
+        if not name.startswith("_"):
+            extra = self._extra
+            if extra is not None and name in extra:
+                return extra[name]
+            if name in self._defaults:
+                return self._defaults[name]
+        raise AttributeError(f"'{type(self).__name__}' object has no "
+                             f"attribute '{name}'")
+
+    def __setattr__(self, name, value):
+        """Set an attribute and flag the instance as changed in storage"""
+        models.storage.track(self, name, value)
+        self.__dict__[name] = value
+
+    def __delattr__(self, name):
+        """Delete an attribute and flag the instance as changed in storage"""
+        models.storage.track(self, name, self._defaults.get(name))
+        try:
+            del self.__dict__[name]
+        except KeyError:
+            raise AttributeError(name)
+
+    def __str__(self):
+        """Return string representation of the instance"""
+        return f"[{self.__class__.__name__}] ({self.id}) {self.__dict__}"
+
+    def save(self):
+        """Update updated_at with current datetime and save to storage"""
+        self.updated_at = datetime.now()
+        models.storage.new(self)
+        models.storage.save()
+
+    def to_dict(self):
+        """Return dictionary representation of the instance"""
+        result = dict(self.__dict__)
+        result['__class__'] = self.__class__.__name__
+        result['created_at'] = self.created_at.isoformat()
+        result['updated_at'] = self.updated_at.isoformat()
+        return result
+
+
+@lru_cache(maxsize=None)
+def compact(cls):
+    """Return a slot-based version of the model class cls
+
+    The new class has the same name, one slot per attribute declared on
+    cls or its bases, and those declared values as defaults.
+    """
+    defaults = {}
+    for base in reversed(cls.__mro__):
+        for name, value in vars(base).items():
+            if not name.startswith("_") and not callable(value):
+                defaults[name] = value
+    fields = ("id",) + tuple(defaults)
+    return type(cls.__name__, (CompactModel,), {
+        "__slots__": fields,
+        "__doc__": f"Compact version of {cls.__name__}",
+        "__module__": __name__,
+        "_fields": fields,
+        "_names": frozenset(fields + _TIMESTAMPS),
+        "_defaults": defaults
+    })
@@ -0,0 +1,320 @@
+#!/usr/bin/python3
+"""Bulk import and export module for AirBnB clone project
+
+Run this module to load a dataset into the store, or to dump a class:
+
+    python3 -m models.engine.bulk import Place places.ndjson
+    python3 -m models.engine.bulk export Place places.csv
+
+Files hold one object per line, as a JSON object (NDJSON, ".ndjson" or
+".jsonl") or as a CSV row under a header naming the attributes. The
+values of the attributes a class declares are checked and converted to
+the type of their default, so "3" becomes the int 3 for number_rooms
+and "abc" is refused; id, created_at and updated_at are generated when
+missing. Other attributes are kept as they are.
+
+The file is read twice, one row at a time: every row is checked before
+any object is stored, so a refused row leaves the store as it was, and
+the objects are then built and stored a chunk at a time. The store is
+written once, or after every chunk for an engine keeping a bounded
+number of objects in memory (CacheStorage). An export streams
+storage.records(), so the objects of a lazy store are not built for
+NDJSON.
+"""
+import csv
+import json
+import shutil
+import sys
+import tempfile
+import time
+from contextlib import nullcontext
+from datetime import datetime
+from itertools import islice
+from uuid import uuid4
+from models.base_model import BaseModel
+from models.user import User
+from models.state import State
+from models.city import City
+from models.amenity import Amenity
+from models.place import Place
+from models.review import Review
+
+classes = {
+    "BaseModel": BaseModel,
+    "User": User,
+    "State": State,
+    "City": City,
+    "Amenity": Amenity,
+    "Place": Place,
+    "Review": Review
+}
+formats = ("ndjson", "csv")
+
+
+class BulkError(ValueError):
+    """Raised for a row that does not fit the class it is imported into"""
+
+
+def _integer(value):
+    """Return value as an int, from an int, a whole float or a string"""
+    if type(value) is int:
+        return value
+    if type(value) is float and value.is_integer():
+        return int(value)
+    if type(value) is str:
+        return int(value)
+    raise TypeError
+
+
+def _number(value):
+    """Return value as a float, from an int, a float or a string"""
+    if type(value) in (int, float, str):
+        return float(value)
+    raise TypeError
+
+
+def _string(value):
+    """Return value, which must be a string"""
+    if type(value) is not str:
+        raise TypeError
+    return value
+
+
+def _list(value):
+    """Return value as a list, from a list or its JSON text"""
+    if type(value) is str:
+        value = json.loads(value)
+    if type(value) is not list:
+        raise TypeError
+    return value
+
+
+def _date(value):
+    """Return value as a datetime, from its ISO format"""
+    if type(value) is datetime:
+        return value
+    return datetime.fromisoformat(_string(value))
+
+
+_CONVERTERS = {int: (_integer, "an integer"), float: (_number, "a number"),
+               str: (_string, "a string"), list: (_list, "a list")}
+
+
+def declared(cls):
+    """Return {name: default} of the attributes cls declares, in order"""
+    fields = {}
+    for klass in reversed(cls.__mro__):
+        for name, value in vars(klass).items():
+            if not name.startswith("_") and not callable(value):
+                fields[name] = value
+    return fields
+
+
+def converters(cls):
+    """Return {name: (convert, description)} of the checked attributes"""
+    found = {"id": (_string, "a string"),
+             "created_at": (_date, "an ISO date"),
+             "updated_at": (_date, "an ISO date")}
+    for name, default in declared(cls).items():
+        if type(default) in _CONVERTERS:
+            found[name] = _CONVERTERS[type(default)]
+    return found
+
+
+def columns(cls):
+    """Return the names of the CSV columns of cls"""
+    return ["id", "created_at", "updated_at", *declared(cls)]
+
+
+def read_ndjson(f):
+    """Yield (line number, row) of the JSON objects of f, one per line"""
+    for number, line in enumerate(f, 1):
+        if not line.strip():
+            continue
+        try:
+            row = json.loads(line)
+        except ValueError as error:
+            raise BulkError(f"line {number}: {error}")
+        if type(row) is not dict:
+            raise BulkError(f"line {number}: expected a JSON object")
+        yield number, row
+
+
+def read_csv(f):
+    """Yield (line number, row) of the CSV rows of f, empty cells left out"""
+    reader = csv.DictReader(f)
+    for row in reader:
+        if None in row:
+            raise BulkError(f"line {reader.line_num}: more cells than "
+                            f"columns")
+        yield reader.line_num, {name: value for name, value in row.items()
+                                if value not in ("", None)}
+
+
+def convert(cls, number, row, checks=None):
+    """Return the attributes of the object of cls described by row
+
+    number is the line of row, for errors. Raises BulkError for a row
+    whose class is another one or whose declared attributes cannot be
+    converted.
+    """
+    checks = converters(cls) if checks is None else checks
+    values = dict.fromkeys(("id", "created_at", "updated_at"))
+    for field, value in row.items():
+        check = checks.get(field)
+        if check is not None:
+            try:
+                value = check[0](value)
+            except (TypeError, ValueError):
+                raise BulkError(f"line {number}: {field} must be "
+                                f"{check[1]}, not {value!r}")
+        elif field == "__class__":
+            if value != cls.__name__:
+                raise BulkError(f"line {number}: {value!r} is not "
+                                f"a {cls.__name__}")
+            continue
+        values[field] = value
+    if values["id"] is None:
+        values["id"] = str(uuid4())
+    if values["created_at"] is None:
+        values["created_at"] = datetime.now()
+    if values["updated_at"] is None:
+        values["updated_at"] = values["created_at"]
+    return values
+
+
+def build(cls, rows, checks=None):
+    """Return the objects of cls made from the (line number, row) rows"""
+    checks = converters(cls) if checks is None else checks
+    return [cls(**convert(cls, number, row, checks)) for number, row in rows]
+
+
+def import_rows(storage, cls, f, read=read_ndjson, chunk_size=10000):
+    """Add the objects of the rows read(f) yields to storage; return them
+
+    f is read twice, and copied to a temporary file first if it cannot
+    seek. The first pass checks every row, so a row that does not fit
+    cls raises BulkError and leaves storage as it was. The second pass
+    builds and stores the objects chunk_size at a time. Storage is saved
+    once at the end, or after every chunk when it only keeps a bounded
+    number of objects in memory (storage.bounded), so that they can be
+    dropped. Objects with the id of a stored object replace it.
+    """
+    if chunk_size < 1:
+        raise ValueError("chunk_size must be positive")
+    if not f.seekable():
+        with tempfile.TemporaryFile('w+', newline="") as spool:
+            shutil.copyfileobj(f, spool)
+            return import_rows(storage, cls, spool, read, chunk_size)
+    f.seek(0)
+    checks = converters(cls)
+    for number, row in read(f):
+        convert(cls, number, row, checks)
+    f.seek(0)
+    rows = read(f)
+    bounded = getattr(storage, "bounded", False)
+    count = 0
+    while True:
+        objects = build(cls, islice(rows, chunk_size), checks)
+        for obj in objects:
+            storage.new(obj)
+        count += len(objects)
+        if bounded and objects:
+            storage.save()
+        if len(objects) < chunk_size:
+            break
+    if not bounded:
+        storage.save()
+    return count
+
+
+def write_ndjson(f, records):
+    """Write the (key, JSON text) records to f, one per line"""
+    count = 0
+    for count, (_, record) in enumerate(records, 1):
+        f.write(record)
+        f.write("\n")
+    return count
+
+
+def write_csv(f, records, cls):
+    """Write the (key, JSON text) records of cls to f as CSV rows
+
+    Only the columns of cls are written; lists are written as JSON.
+    """
+    names = columns(cls)
+    writer = csv.writer(f)
+    writer.writerow(names)
+    count = 0
+    for count, (_, record) in enumerate(records, 1):
+        values = json.loads(record)
+        writer.writerow([json.dumps(value) if type(value) is list else
+                         "" if value is None else value
+                         for value in map(values.get, names)])
+    return count
+
+
+def export_rows(storage, cls, f, fmt="ndjson"):
+    """Write the objects of cls in storage to f; return their number"""
+    records = storage.records(cls)
+    if fmt == "csv":
+        return write_csv(f, records, cls)
+    return write_ndjson(f, records)
+
+
+def _format(path, options):
+    """Return the format named by options, or the one of path"""
+    fmt = options.get("format")
+    if fmt is None:
+        fmt = "csv" if path.lower().endswith(".csv") else "ndjson"
+    if fmt not in formats:
+        raise BulkError(f"unknown format {fmt}")
+    return fmt
+
+
+def _open(path, mode, standard):
+    """Return the file at path opened for CSV, or standard for "-" """
+    if path == "-":
+        return nullcontext(standard)
+    return open(path, mode, newline="")
+
+
+def main(argv):
+    """Command line entry point: import|export CLASS FILE [--format=FMT]
+
+    FILE is "-" for standard input or output. The number of rows per
+    second is reported on standard error.
+    """
+    args = [arg for arg in argv if not arg.startswith("--")]
+    options = dict(arg[2:].split("=", 1) for arg in argv
+                   if arg.startswith("--") and "=" in arg)
+    if len(args) != 3 or args[0] not in ("import", "export") or \
+            args[1] not in classes:
+        print("usage: python3 -m models.engine.bulk import|export CLASS "
+              "FILE [--format=ndjson|csv] [--chunk-size=N]",
+              file=sys.stderr)
+        return 2
+    from models import storage
+    command, cls, path = args[0], classes[args[1]], args[2]
+    start = time.perf_counter()
+    try:
+        fmt = _format(path, options)
+        if command == "import":
+            read = read_csv if fmt == "csv" else read_ndjson
+            with _open(path, 'r', sys.stdin) as f:
+                count = import_rows(storage, cls, f, read,
+                                    int(options.get("chunk-size", 10000)))
+        else:
+            with _open(path, 'w', sys.stdout) as f:
+                count = export_rows(storage, cls, f, fmt)
+    except BulkError as error:
+        print(f"** {error} **", file=sys.stderr)
+        return 1
+    elapsed = time.perf_counter() - start
+    print(f"{count} rows {command}ed in {elapsed:.3f}s "
+          f"({count / max(elapsed, 1e-9):.0f} rows/s)", file=sys.stderr)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,694 @@
+#!/usr/bin/python3
+"""CacheStorage module for AirBnB clone project"""
+import json
+import os
+from collections import OrderedDict
+from collections.abc import Mapping
+from contextlib import contextmanager
+from weakref import WeakValueDictionary
+from models.base_model import BaseModel
+from models.user import User
+from models.state import State
+from models.city import City
+from models.amenity import Amenity
+from models.place import Place
+from models.review import Review
+from models.engine.columns import OPERATORS, Columns, matches
+from models.engine.durability import Durability
+from models.engine.geo import Grid, scan
+from models.engine.index import Index
+from models.engine.object_map import ObjectMap
+
+
+class _View(Mapping):
+    """Read-only mapping of keys to objects, built one at a time"""
+
+    def __init__(self, storage, class_name=None):
+        """Initialize a view over the objects of class_name, or all"""
+        self.storage = storage
+        self.class_name = class_name
+
+    def __getitem__(self, key):
+        """Return the object stored under key"""
+        class_name, _, obj_id = key.partition(".")
+        if self.class_name not in (None, class_name):
+            raise KeyError(key)
+        obj = self.storage.get(class_name, obj_id)
+        if obj is None:
+            raise KeyError(key)
+        return obj
+
+    def __iter__(self):
+        """Iterate over the keys without building any object"""
+        return self.storage.keys(self.class_name)
+
+    def __len__(self):
+        """Return the number of objects"""
+        return self.storage.count(self.class_name)
+
+    def __contains__(self, key):
+        """Return whether an object is stored under key"""
+        return (self.class_name in (None, key.partition(".")[0]) and
+                self.storage.exists(key))
+
+
+class CacheStorage:
+    """Keeps a bounded working set of objects in memory over a data file
+
+    The data file is an append-only log of JSON lines in the format of
+    the write-ahead log; only the offset and length of the last line of
+    every key are kept in memory, with the indexes declared in __indexes,
+    the element indexes of the list attributes declared in __lists, the
+    spatial grids of the coordinates declared in __points and columnar
+    snapshots of the numbers declared in __numbers.
+    At most cache_size objects live in memory: the least recently used
+    clean ones are dropped and read again from the file when needed.
+    Objects changed since the last save stay in memory until it, so
+    bounded is True: saving often keeps memory bounded. Once the dead
+    lines outweigh the live ones, save() rewrites the file.
+
+    all() returns a lazy mapping that builds the objects one at a time as
+    it is iterated, so scanning the store keeps memory bounded. Holding on
+    to an object across evictions and changing it still works, but get()
+    may return another instance of it in the meantime.
+    """
+
+    __classes = {
+        "BaseModel": BaseModel,
+        "User": User,
+        "State": State,
+        "City": City,
+        "Amenity": Amenity,
+        "Place": Place,
+        "Review": Review
+    }
+    __indexes = {
+        "City": ("state_id",),
+        "Place": ("city_id", "user_id"),
+        "Review": ("place_id", "user_id"),
+        "User": ("email",)
+    }
+    __lists = {
+        "Place": ("amenity_ids",)
+    }
+    __points = {
+        "Place": ("latitude", "longitude")
+    }
+    __numbers = {
+        "Place": ("price_by_night", "max_guest", "number_rooms",
+                  "number_bathrooms", "latitude", "longitude")
+    }
+    bounded = True
+
+    def __init__(self, path="hbnb.data", cache_size=10000,
+                 durability="flush"):
+        """Initialize the engine
+
+        Args:
+            path: the data file
+            cache_size: maximum number of clean objects kept in memory
+            durability: "none", "flush", "group" or "fsync"
+        """
+        self.path = path
+        self.cache_size = cache_size
+        self.durability = Durability(durability)
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.__objects = ObjectMap()
+        self.__recent = OrderedDict()
+        self.__evicted = WeakValueDictionary()
+        self.__locations = {}
+        self.__indexes_by_class = {
+            class_name: {field: Index(field) for field in fields}
+            for class_name, fields in self.__indexes.items()}
+        for class_name, fields in self.__lists.items():
+            self.__indexes_by_class.setdefault(class_name, {}).update(
+                {field: Index(field, multi=True) for field in fields})
+        self.__grids = {class_name: Grid(*fields)
+                        for class_name, fields in self.__points.items()}
+        self.__snapshots = {class_name: Columns(fields) for class_name, fields
+                            in self.__numbers.items()}
+        self.__live = 0
+        self.__size = 0
+        self.__file = None
+        self.__deferred = False
+
+    def stats(self):
+        """Return the cache counters as a dictionary"""
+        return {"size": len(self.__objects), "capacity": self.cache_size,
+                "hits": self.hits, "misses": self.misses,
+                "evictions": self.evictions}
+
+    def all(self, cls=None):
+        """Return a lazy mapping of every object, or of the objects of cls"""
+        return _View(self, self.__class_name(cls) if cls else None)
+
+    def keys(self, class_name=None):
+        """Yield the keys of every object, of class_name if given"""
+        self.__ready()
+        objects = self.__objects
+        names = [class_name] if class_name else list(self.__locations)
+        for name in names:
+            locations = self.__locations.get(name, {})
+            for key in list(locations):
+                if key in objects or key not in objects.dirty:
+                    yield key
+        for key in list(objects.dirty):
+            if key in objects and not self.__saved(key) and \
+                    class_name in (None, key.partition(".")[0]):
+                yield key
+
+    def exists(self, key):
+        """Return whether an object is stored under key"""
+        self.__ready()
+        objects = self.__objects
+        if key in objects:
+            return True
+        return key not in objects.dirty and self.__saved(key)
+
+    def get(self, cls, id):
+        """Return the object of cls with the given id, or None"""
+        self.__ready()
+        class_name = self.__class_name(cls)
+        key = f"{class_name}.{id}"
+        objects = self.__objects
+        if key in objects:
+            self.hits += 1
+            self.__recent[key] = None
+            self.__recent.move_to_end(key)
+            return objects[key]
+        if key in objects.dirty:
+            return None
+        location = self.__locations.get(class_name, {}).get(key)
+        if location is None:
+            return None
+        self.misses += 1
+        value = self.__read(location)
+        obj = self.__classes[value['__class__']](**value)
+        self.__admit(key, obj)
+        return obj
+
+    def count(self, cls=None):
+        """Return the number of stored objects, of cls if given"""
+        self.__ready()
+        class_name = self.__class_name(cls) if cls else None
+        total = sum(len(locations) for name, locations in
+                    self.__locations.items()
+                    if class_name in (None, name))
+        for key in self.__objects.dirty:
+            name = key.partition(".")[0]
+            if class_name not in (None, name):
+                continue
+            saved = self.__saved(key)
+            if key in self.__objects and not saved:
+                total += 1
+            elif key not in self.__objects and saved:
+                total -= 1
+        return total
+
+    def version(self, cls=None):
+        """Return a number that changes whenever an object of cls changes
+
+        Evicting objects counts as a change.
+        """
+        self.__ready()
+        return self.__objects.version(self.__class_name(cls) if cls
+                                      else None)
+
+    def find(self, cls, **eq):
+        """Return the objects of cls whose attributes equal the given values
+
+        Declared indexes narrow the saved candidates down; objects changed
+        since the last save are always checked.
+        """
+        self.__ready()
+        class_name = self.__class_name(cls)
+        keys = None
+        for field, value in eq.items():
+            index = self.__indexes_by_class.get(class_name, {}).get(field)
+            if index is not None and not index.multi:
+                found = index.get(value)
+                keys = set(found) if keys is None else keys & found
+        if keys is None:
+            keys = self.keys(class_name)
+        else:
+            prefix = f"{class_name}."
+            keys = list(keys) + [key for key in self.__objects.dirty
+                                 if key.startswith(prefix)]
+        result = {}
+        for key in keys:
+            if key in result:
+                continue
+            obj = self.get(class_name, key.partition(".")[2])
+            if obj is not None and all(getattr(obj, field, None) == value
+                                       for field, value in eq.items()):
+                result[key] = obj
+        return result
+
+    def having(self, cls, field, values):
+        """Return the objects of cls whose list attribute field holds values
+
+        Behaves like FileStorage.having(); objects changed since the last
+        save are always checked.
+        """
+        self.__ready()
+        class_name = self.__class_name(cls)
+        values = list(values)
+        index = self.__indexes_by_class.get(class_name, {}).get(field)
+        if index is not None and index.multi and values:
+            prefix = f"{class_name}."
+            keys = list(index.get_all(values)) + [
+                key for key in self.__objects.dirty if key.startswith(prefix)]
+        else:
+            keys = self.keys(class_name)
+        result = {}
+        for key in keys:
+            if key in result:
+                continue
+            obj = self.get(class_name, key.partition(".")[2])
+            held = getattr(obj, field, None)
+            if isinstance(held, (list, tuple, set, frozenset)) and \
+                    all(value in held for value in values):
+                result[key] = obj
+        return result
+
+    def near(self, cls, latitude, longitude, km=None, k=None):
+        """Return [(distance in km, object)] of the objects of cls near a point
+
+        Behaves like FileStorage.near(): saved objects are found in the
+        grid of their class, and the ones changed since the last save are
+        measured where they are now.
+        """
+        self.__ready()
+        class_name = self.__class_name(cls)
+        prefix = f"{class_name}."
+        changed = {key for key in self.__objects.dirty
+                   if key.startswith(prefix)}
+        grid = self.__grids.get(class_name)
+        if grid is None:
+            return [(distance, self.get(class_name, key.partition(".")[2]))
+                    for distance, key in scan(self.all(class_name).items(),
+                                              latitude, longitude, km, k)]
+        found = [item for item in grid.near(
+            latitude, longitude, km, None if k is None else k + len(changed))
+            if item[1] not in changed]
+        found += scan(((key, self.__objects[key]) for key in changed
+                       if key in self.__objects), latitude, longitude, km)
+        found.sort()
+        return [(distance, self.get(class_name, key.partition(".")[2]))
+                for distance, key in found[:k]]
+
+    def select(self, cls, conditions):
+        """Return the objects of cls meeting every (field, op, value)
+
+        Behaves like FileStorage.select(): saved objects are narrowed down
+        by the snapshot and indexes of their class, and the ones changed
+        since the last save are always checked.
+        """
+        self.__ready()
+        class_name = self.__class_name(cls)
+        return {key: self.get(class_name, key.partition(".")[2])
+                for key in self.__select(class_name, conditions)}
+
+    def aggregate(self, cls, fields=(), by=None, conditions=()):
+        """Return {group: {field: summary}} of the objects of cls
+
+        Behaves like FileStorage.aggregate(): the numbers of saved objects
+        are read from the snapshot of their class, and those of the ones
+        changed since the last save from the objects.
+        """
+        self.__ready()
+        class_name = self.__class_name(cls)
+        fields = tuple(fields)
+        prefix = f"{class_name}."
+        changed = {key for key in self.__objects.dirty
+                   if key.startswith(prefix)}
+        keys = self.__select(class_name, conditions)
+        if by is None:
+            label = None
+        else:
+            index = self.__indexes_by_class.get(class_name, {}).get(by)
+            indexed = index.keys if index is not None and \
+                not index.multi else {}
+
+            def label(key):
+                """Return the group of the object under key"""
+                if key in indexed and key not in changed:
+                    return indexed[key]
+                return getattr(self.get(class_name, key.partition(".")[2]),
+                               by, None)
+        snapshot = self.__snapshots.get(class_name)
+        if not fields:
+            return Columns(()).aggregate(fields, keys, label)
+        if snapshot is None or not set(fields) <= set(snapshot.fields):
+            return Columns.of(((key, self.get(class_name,
+                                              key.partition(".")[2]))
+                               for key in keys), fields).aggregate(
+                fields, keys, label)
+        result = snapshot.aggregate(fields, [key for key in keys
+                                             if key not in changed], label)
+        moved = [key for key in keys if key in changed]
+        return Columns.of(((key, self.__objects[key]) for key in moved),
+                          fields).aggregate(fields, moved, label, result)
+
+    def records(self, cls=None):
+        """Yield (key, to_dict() as JSON text) of each object of cls"""
+        self.__ready()
+        objects = self.__objects
+        for key in self.keys(self.__class_name(cls) if cls else None):
+            if key in objects:
+                yield key, json.dumps(objects[key].to_dict())
+            else:
+                location = self.__locations[key.partition(".")[0]][key]
+                yield key, json.dumps(self.__read(location))
+
+    def new(self, obj):
+        """Add obj to the objects to be saved"""
+        self.__ready()
+        key = f"{obj.__class__.__name__}.{obj.id}"
+        self.__objects[key] = obj
+        self.__recent[key] = None
+        self.__recent.move_to_end(key)
+
+    def delete(self, obj=None):
+        """Remove obj from storage on the next save"""
+        self.__ready()
+        if obj is not None:
+            key = f"{obj.__class__.__name__}.{obj.id}"
+            if key not in self.__objects and self.exists(key):
+                self.__admit(key, obj)
+            self.__objects.pop(key, None)
+            self.__recent.pop(key, None)
+
+    def track(self, obj, name, value):
+        """Flag obj as changed before its attribute name becomes value
+
+        An object evicted from memory takes its key back; other instances
+        with the key of a stored object are not stored and are ignored.
+        """
+        self.__ready()
+        obj_id = getattr(obj, "id", None)
+        if obj_id is None:
+            return
+        key = f"{obj.__class__.__name__}.{obj_id}"
+        held = self.__objects.get(key)
+        if held is not obj:
+            if held is not None and self.__evicted.get(key) is not obj:
+                return
+            if not self.exists(key):
+                return
+            self.__admit(key, obj)
+        self.__objects.touch(key, name, value)
+
+    @contextmanager
+    def transaction(self):
+        """Group changes so they are saved once, or not at all
+
+        Behaves like FileStorage.transaction().
+        """
+        self.__ready()
+        objects = self.__objects
+        if objects.undo is not None:
+            yield self
+            return
+        objects.undo = {}
+        try:
+            yield self
+        except BaseException:
+            objects.rollback()
+            for key in objects:
+                self.__recent.setdefault(key)
+            raise
+        objects.undo = None
+        self.save()
+
+    def save(self):
+        """Append the objects changed since the last save to the file"""
+        self.__ready()
+        objects = self.__objects
+        if objects.undo is not None or not objects.dirty:
+            return
+        lines = []
+        for key in objects.dirty:
+            if key.partition(".")[0] not in self.__classes:
+                continue
+            if key in objects:
+                value = objects[key].to_dict()
+                lines.append((key, value,
+                              self.__line("put", key, json.dumps(value))))
+            elif self.__saved(key):
+                lines.append((key, None, self.__line("del", key)))
+        f = self.__open()
+        f.seek(0, os.SEEK_END)
+        offset = f.tell()
+        f.write(b"".join(line for _, _, line in lines))
+        self.durability.sync(f)
+        for key, value, line in lines:
+            self.__apply(key, value, offset, len(line))
+            offset += len(line)
+        self.__size = offset
+        objects.dirty.clear()
+        self.__evict()
+        if self.__size > 2 * self.__live and self.__size > 1 << 20:
+            self.compact()
+
+    def save_later(self):
+        """Save at once; return a function that does nothing
+
+        Behaves like FileStorage.save_later() for a store it cannot split:
+        the changed objects are appended now.
+        """
+        self.save()
+        return lambda: None
+
+    def compact(self):
+        """Rewrite the data file with only the last record of every key
+
+        Records are copied one at a time from the old file to the new
+        one, so memory does not grow with the size of the file.
+        """
+        self.__ready()
+        self.save()
+        self.close()
+        starts = []
+
+        def copy(out):
+            """Write the live records to out, noting their new offsets"""
+            offset = 0
+            with open(self.path, 'rb') as f:
+                for keys in self.__locations.values():
+                    for start, length in keys.values():
+                        f.seek(start)
+                        out.write(f.read(length))
+                        starts.append(offset)
+                        offset += length
+
+        self.durability.atomic_write(self.path, copy, "b")
+        offset = 0
+        starts = iter(starts)
+        for keys in self.__locations.values():
+            for key, (_, length) in keys.items():
+                keys[key] = (next(starts), length)
+                offset += length
+        self.__live = self.__size = offset
+
+    def reload(self):
+        """Read the offsets and indexes of the data file
+
+        Objects are only read from the file when they are needed.
+        """
+        objects = self.__objects
+        for key in list(objects):
+            if key not in objects.dirty:
+                self.__forget(key)
+                self.__recent.pop(key, None)
+        self.__locations = {}
+        for fields in self.__indexes_by_class.values():
+            for index in fields.values():
+                index.clear()
+        for grid in self.__grids.values():
+            grid.clear()
+        for snapshot in self.__snapshots.values():
+            snapshot.clear()
+        self.__live = 0
+        self.__deferred = False
+        offset = 0
+        f = self.__open()
+        f.seek(0)
+        for line in f:
+            try:
+                entry = json.loads(line)
+            except ValueError:
+                break
+            self.__apply(entry["key"], entry.get("obj"), offset, len(line))
+            offset += len(line)
+        self.__size = offset
+        f.truncate(offset)
+
+    def defer_reload(self):
+        """Postpone reload() until the first access to storage"""
+        self.__deferred = True
+
+    def close(self):
+        """Close the data file"""
+        if self.__file is not None:
+            self.__file.close()
+            self.__file = None
+
+    def __ready(self):
+        """Run a reload postponed by defer_reload()"""
+        if self.__deferred:
+            self.reload()
+
+    def __open(self):
+        """Return the data file opened for reading and appending"""
+        if self.__file is None:
+            mode = 'r+b' if os.path.exists(self.path) else 'w+b'
+            self.__file = open(self.path, mode)
+        return self.__file
+
+    def __saved(self, key):
+        """Return whether the data file holds a record for key"""
+        return key in self.__locations.get(key.partition(".")[0], {})
+
+    @staticmethod
+    def __line(op, key, record=None):
+        """Return the encoded log line of one change"""
+        if op == "put":
+            return (f'{{"op": "put", "key": {json.dumps(key)}, '
+                    f'"obj": {record}}}\n').encode()
+        return f'{{"op": "del", "key": {json.dumps(key)}}}\n'.encode()
+
+    def __apply(self, key, value, offset, length):
+        """Record that the line at offset holds value for key, or a delete"""
+        class_name = key.partition(".")[0]
+        locations = self.__locations.setdefault(class_name, {})
+        indexes = self.__indexes_by_class.get(class_name, {})
+        previous = locations.pop(key, None)
+        if previous is not None:
+            self.__live -= previous[1]
+        grid = self.__grids.get(class_name)
+        snapshot = self.__snapshots.get(class_name)
+        for index in indexes.values():
+            index.remove(key)
+        if grid is not None:
+            grid.remove(key)
+        if snapshot is not None:
+            snapshot.remove(key)
+        if value is None:
+            return
+        locations[key] = (offset, length)
+        self.__live += length
+        cls = self.__classes.get(class_name)
+        for field, index in indexes.items():
+            if field in value:
+                index.add(key, value[field])
+            else:
+                index.add(key, getattr(cls, field, None))
+        if grid is not None:
+            grid.add(key, value.get(grid.latitude,
+                                    getattr(cls, grid.latitude, None)),
+                     value.get(grid.longitude,
+                               getattr(cls, grid.longitude, None)))
+        if snapshot is not None:
+            snapshot.add(key, *(value.get(field, getattr(cls, field, None))
+                                for field in snapshot.fields))
+
+    def __select(self, class_name, conditions):
+        """Return the keys of the objects of class_name meeting conditions
+
+        Objects changed since the last save are checked on every
+        condition; the others only on those no snapshot or index answers.
+        """
+        prefix = f"{class_name}."
+        changed = {key for key in self.__objects.dirty
+                   if key.startswith(prefix)}
+        snapshot = self.__snapshots.get(class_name)
+        indexes = self.__indexes_by_class.get(class_name, {})
+        conditions = list(conditions)
+        keys = None
+        rest = []
+        covered = []
+        for field, op, value in conditions:
+            if op not in OPERATORS:
+                raise ValueError(f"unknown operator {op}")
+            index = indexes.get(field)
+            if snapshot is not None and snapshot.covers(field, op, value):
+                covered.append((field, op, value))
+            elif op in ("=", "==") and index is not None and \
+                    not index.multi:
+                found = index.get(value)
+                keys = found if keys is None else keys & found
+            else:
+                rest.append((field, op, value))
+        if covered:
+            found = snapshot.select(covered)
+            keys = found if keys is None else \
+                [key for key in found if key in keys]
+        if keys is None:
+            keys = self.__locations.get(class_name, {})
+        result = []
+        for key in keys:
+            if key in changed:
+                continue
+            if rest:
+                obj = self.get(class_name, key.partition(".")[2])
+                if not all(matches(getattr(obj, field, None), op, value)
+                           for field, op, value in rest):
+                    continue
+            result.append(key)
+        for key in changed:
+            obj = self.__objects.get(key)
+            if obj is not None and all(
+                    matches(getattr(obj, field, None), op, value)
+                    for field, op, value in conditions):
+                result.append(key)
+        return result
+
+    def __read(self, location):
+        """Return the record stored at location in the data file"""
+        f = self.__open()
+        f.seek(location[0])
+        return json.loads(f.read(location[1]))["obj"]
+
+    def __admit(self, key, obj):
+        """Keep obj in memory as the most recently used object"""
+        self.__objects.load(key, obj)
+        self.__recent[key] = None
+        self.__recent.move_to_end(key)
+        self.__evict()
+
+    def __evict(self):
+        """Drop least recently used clean objects beyond cache_size"""
+        objects = self.__objects
+        recent = self.__recent
+        excess = len(objects) - self.cache_size
+        if excess <= 0:
+            return
+        for _ in range(len(recent)):
+            if excess <= 0:
+                break
+            key = next(iter(recent))
+            if key not in objects:
+                del recent[key]
+            elif key in objects.dirty:
+                recent.move_to_end(key)
+            else:
+                del recent[key]
+                self.__forget(key)
+                self.evictions += 1
+                excess -= 1
+
+    def __forget(self, key):
+        """Drop the object under key, remembering it until it is freed"""
+        try:
+            self.__evicted[key] = self.__objects[key]
+        except TypeError:
+            pass
+        self.__objects.unload(key)
+
+    @staticmethod
+    def __class_name(cls):
+        """Return the name of cls, which may already be a string"""
+        return cls if isinstance(cls, str) else cls.__name__
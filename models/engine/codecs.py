@@ -0,0 +1,213 @@
+#!/usr/bin/python3
+"""Storage codecs module for AirBnB clone project
+
+A codec turns the records of the store into a snapshot file and back:
+
+    encode(record) / encode_object(obj) -> fragment of one record
+    decode(fragment) -> record dictionary
+    write(f, items) writes the (key, fragment) pairs to the file f
+    read(f) yields (key, record, fragment) for every record of f
+
+A record is the dictionary returned by to_dict(), except that a codec may
+decode created_at and updated_at straight to datetime objects.
+
+models.engine.convert converts a snapshot between formats.
+"""
+import json
+import struct
+from datetime import datetime
+from itertools import islice
+from models.compact import from_micros, to_micros
+from models.engine.stream import iter_items
+
+orjson = None
+
+_TIMESTAMPS = ("created_at", "updated_at")
+_DECODER = json.JSONDecoder()
+
+
+def _isoformat(value):
+    """Serialize the datetime objects json cannot encode by itself"""
+    if isinstance(value, datetime):
+        return value.isoformat()
+    raise TypeError(f"{type(value).__name__} is not JSON serializable")
+
+
+class JSONCodec:
+    """Standard library JSON: one object mapping keys to records"""
+
+    name = "json"
+    extension = ".json"
+    mode = ""
+    text = True
+
+    def encode(self, record):
+        """Return the JSON text of record"""
+        return json.dumps(record, default=_isoformat)
+
+    def encode_object(self, obj):
+        """Return the JSON text of obj"""
+        return json.dumps(obj.to_dict())
+
+    def decode(self, fragment):
+        """Return the record in the JSON text fragment"""
+        return json.loads(fragment)
+
+    def write(self, f, items):
+        """Write the (key, fragment) pairs as one JSON object
+
+        The pairs are joined and written a few thousand at a time, so the
+        text of the whole file is never held in memory at once.
+        """
+        items = iter(items)
+        separator = "{"
+        while True:
+            parts = [f"{json.dumps(key)}: {fragment}"
+                     for key, fragment in islice(items, 4096)]
+            if not parts:
+                break
+            f.write(separator + ", ".join(parts))
+            separator = ", "
+        f.write("{}" if separator == "{" else "}")
+
+    def read(self, f):
+        """Yield (key, record, fragment) while streaming the file"""
+        return iter_items(f)
+
+
+class OrjsonCodec(JSONCodec):
+    """The same JSON file format, read and written with orjson
+
+    orjson cannot parse a document incrementally, so read() holds the
+    whole file in memory; it trades memory for speed.
+    """
+
+    name = "orjson"
+
+    def __init__(self):
+        """Initialize the codec; orjson must be installed
+
+        orjson is only imported here, so that the programs using the
+        other codecs do not pay for it at startup.
+        """
+        global orjson
+        if orjson is None:
+            try:
+                import orjson
+            except ImportError:
+                raise ValueError("the orjson codec needs the orjson package")
+
+    def encode(self, record):
+        """Return the JSON text of record"""
+        return orjson.dumps(record).decode()
+
+    def encode_object(self, obj):
+        """Return the JSON text of obj, letting orjson format datetimes"""
+        record = dict(obj.__dict__)
+        record['__class__'] = obj.__class__.__name__
+        return orjson.dumps(record).decode()
+
+    def decode(self, fragment):
+        """Return the record in the JSON text fragment"""
+        return orjson.loads(fragment)
+
+    def read(self, f):
+        """Yield (key, record, fragment) for every record of the file"""
+        for key, record in orjson.loads(f.read()).items():
+            yield key, record, orjson.dumps(record).decode()
+
+
+class BinaryCodec:
+    """Compact binary snapshot with integer timestamps
+
+    The file starts with MAGIC and holds one entry per record: the key
+    and fragment lengths ("<HI"), the UTF-8 key, then the fragment. A
+    fragment packs created_at and updated_at as microseconds since 1970
+    and the class name length ("<qqH"), the class name, and the other
+    attributes as compact JSON.
+    """
+
+    name = "binary"
+    extension = ".bin"
+    mode = "b"
+    text = False
+    MAGIC = b"HBNB\x01"
+    MISSING = -2 ** 63
+    __entry = struct.Struct("<HI")
+    __header = struct.Struct("<qqH")
+
+    def encode(self, record):
+        """Return the binary fragment of record"""
+        attrs = dict(record)
+        class_name = attrs.pop('__class__', "").encode()
+        stamps = []
+        for name in _TIMESTAMPS:
+            value = attrs.pop(name, None)
+            stamps.append(self.MISSING if value is None else to_micros(value))
+        body = json.dumps(attrs, separators=(",", ":")).encode()
+        return (self.__header.pack(stamps[0], stamps[1], len(class_name)) +
+                class_name + body)
+
+    def encode_object(self, obj):
+        """Return the binary fragment of obj without formatting dates"""
+        record = dict(obj.__dict__)
+        record['__class__'] = obj.__class__.__name__
+        return self.encode(record)
+
+    def decode(self, fragment):
+        """Return the record in the binary fragment"""
+        created, updated, size = self.__header.unpack_from(fragment)
+        start = self.__header.size
+        record = _DECODER.raw_decode(fragment[start + size:].decode())[0]
+        record['__class__'] = fragment[start:start + size].decode()
+        for name, value in zip(_TIMESTAMPS, (created, updated)):
+            if value != self.MISSING:
+                record[name] = from_micros(value)
+        return record
+
+    def write(self, f, items):
+        """Write MAGIC then one entry per (key, fragment) pair"""
+        f.write(self.MAGIC)
+        for key, fragment in items:
+            key = key.encode()
+            f.write(self.__entry.pack(len(key), len(fragment)) + key)
+            f.write(fragment)
+
+    def read(self, f):
+        """Yield (key, record, fragment) while streaming the file"""
+        if f.read(len(self.MAGIC)) != self.MAGIC:
+            raise ValueError("not a binary snapshot")
+        while True:
+            entry = f.read(self.__entry.size)
+            if not entry:
+                return
+            if len(entry) < self.__entry.size:
+                raise ValueError("truncated binary snapshot")
+            key_size, size = self.__entry.unpack(entry)
+            key = f.read(key_size).decode()
+            fragment = f.read(size)
+            if len(fragment) < size:
+                raise ValueError("truncated binary snapshot")
+            yield key, self.decode(fragment), fragment
+
+
+codecs = {
+    "json": JSONCodec,
+    "orjson": OrjsonCodec,
+    "binary": BinaryCodec
+}
+
+
+def get_codec(name):
+    """Return an instance of the codec registered as name"""
+    if name not in codecs:
+        raise ValueError(f"unknown codec: {name}")
+    return codecs[name]()
+
+
+def guess_codec(path):
+    """Return the name of the codec whose extension path ends with"""
+    for name, cls in codecs.items():
+        if path.endswith(cls.extension):
+            return name
+    return "json"
@@ -0,0 +1,357 @@
+#!/usr/bin/python3
+"""Columnar snapshot module for AirBnB clone project
+
+Columns keeps numeric attributes of the objects of one class in array
+buffers, one per attribute with a row per object, so that filters and
+aggregates read machine numbers instead of the attributes of every
+object. Values that are not numbers (strings, None, booleans, NaN) are
+kept aside with their row and compared the way Python compares them, so
+a selection finds exactly the objects a loop over them would.
+
+A column gets a sorted index on its first range lookup. Rows changed
+afterwards are checked one at a time until they are too many, and the
+index is then sorted again, so writes only update one slot of a buffer.
+
+NumPy is used when it is installed and a column has enough rows, to sort
+whole columns and filter them at once; the array module does otherwise.
+"""
+import operator
+from array import array
+from bisect import bisect_left, bisect_right
+from itertools import compress, repeat
+
+OPERATORS = {
+    "=": operator.eq,
+    "==": operator.eq,
+    "!=": operator.ne,
+    "<": operator.lt,
+    "<=": operator.le,
+    ">": operator.gt,
+    ">=": operator.ge
+}
+numpy = None
+_VECTORIZE_MIN = 1024
+_NAN = float("nan")
+
+
+def matches(value, op, other):
+    """Return whether value op other holds, False if they cannot compare"""
+    try:
+        return bool(OPERATORS[op](value, other))
+    except TypeError:
+        return False
+
+
+class Columns:
+    """Snapshot of numeric attributes of the objects of one class, by key"""
+
+    def __init__(self, fields):
+        """Initialize an empty snapshot of the attributes named in fields"""
+        self.fields = tuple(fields)
+        self.keys = []
+        self.rows = {}
+        self.values = {field: array("d") for field in self.fields}
+        self.others = {field: {} for field in self.fields}
+        self.__free = []
+        self.__sorted = {}
+
+    @classmethod
+    def of(cls, items, fields):
+        """Return the snapshot of fields of the (key, object) pairs items"""
+        columns = cls(fields)
+        for key, obj in items:
+            columns.add(key, *(getattr(obj, field, None)
+                               for field in columns.fields))
+        return columns
+
+    def __len__(self):
+        """Return the number of keys in the snapshot"""
+        return len(self.rows)
+
+    def add(self, key, *values):
+        """Set the row of key to values, in the order of fields"""
+        row = self.rows.get(key)
+        if row is None:
+            if self.__free:
+                row = self.__free.pop()
+                self.keys[row] = key
+            else:
+                row = len(self.keys)
+                self.keys.append(key)
+                for column in self.values.values():
+                    column.append(_NAN)
+            self.rows[key] = row
+        for field, value in zip(self.fields, values):
+            self.__set(row, field, value)
+
+    def update(self, key, field, value):
+        """Change the value of field in the row of key"""
+        row = self.rows.get(key)
+        if row is not None and field in self.values:
+            self.__set(row, field, value)
+
+    def remove(self, key):
+        """Drop the row of key"""
+        row = self.rows.pop(key, None)
+        if row is None:
+            return
+        for field in self.fields:
+            self.__set(row, field, _NAN)
+            self.others[field].pop(row, None)
+        self.keys[row] = None
+        self.__free.append(row)
+
+    def clear(self):
+        """Drop every row"""
+        self.keys.clear()
+        self.rows.clear()
+        self.values = {field: array("d") for field in self.fields}
+        self.others = {field: {} for field in self.fields}
+        self.__free.clear()
+        self.__sorted.clear()
+
+    def covers(self, field, op, value):
+        """Return whether the condition field op value can be selected here"""
+        return field in self.values and op in OPERATORS and \
+            type(value) in (int, float) and value == value
+
+    def select(self, conditions):
+        """Return the keys meeting every (field, op, value), in row order
+
+        Every condition must be covered (see covers()). The rows of the
+        narrowest range are read from the sorted index of their column and
+        the other conditions tested on the buffers, or whole columns are
+        tested at once with NumPy when the range is wide.
+        """
+        conditions = list(conditions)
+        bounds = {}
+        odd = set()
+        for field, op, value in conditions:
+            odd.update(self.others[field])
+            if op != "!=":
+                bounds[field] = _narrow(bounds.get(field), op, value)
+        rows = None
+        best = None
+        for field, bound in bounds.items():
+            start, stop = self.__range(field, bound)
+            if best is None or stop - start < best[2] - best[1]:
+                best = (field, start, stop)
+        vectorize = conditions and len(self.keys) >= _VECTORIZE_MIN and (
+            best is None or best[2] - best[1] > len(self.keys) // 8) and \
+            _numpy() is not None
+        if vectorize:
+            rows = self.__scan(conditions)
+        else:
+            if best is None:
+                rows = sorted(row for row in self.rows.values()
+                              if row not in odd)
+            else:
+                rows = self.__slice(*best, bounds[best[0]])
+            for field, op, value in conditions:
+                if best is not None and field == best[0] and op != "!=":
+                    continue
+                column = self.values[field]
+                test = OPERATORS[op]
+                if op == "!=":
+                    rows = [row for row in rows if column[row] == column[row]]
+                held = map(column.__getitem__, rows)
+                rows = list(compress(rows, map(test, held, repeat(value))))
+            rows.sort()
+        if odd:
+            rows = sorted(rows + [row for row in odd
+                                  if self.__accepts(row, conditions)])
+        keys = self.keys
+        return [keys[row] for row in rows]
+
+    def aggregate(self, fields, keys=None, label=None, into=None,
+                  groups=None):
+        """Return {group: {field: summary}} over the rows of keys
+
+        Rows are grouped by label(key) when label is given, all in the
+        group None otherwise; keys defaults to every key. groups, a
+        {group: keys} mapping such as the values of an Index, can give
+        the groups instead of keys and label. The summary of None is
+        {"count": rows in the group}, and the summary of a field holds the
+        "count", "sum", "min", "max" and "avg" of its values that are
+        numbers, with None for those of no value. The summaries are added
+        to those of into, the result of another aggregate(), when it is
+        given.
+        """
+        position = self.rows.__getitem__
+        if groups is not None:
+            groups = {group: list(map(position, members)) if fields
+                      else members for group, members in groups.items()}
+        else:
+            if keys is None:
+                keys = [key for key in self.keys if key is not None]
+            rows = list(map(position, keys)) if fields else keys
+            groups = {} if label else {None: rows}
+            for row, group in zip(rows, map(label, keys) if label else ()):
+                try:
+                    members = groups.setdefault(group, [])
+                except TypeError:
+                    members = groups.setdefault(repr(group), [])
+                members.append(row)
+        result = {} if into is None else into
+        for group, members in groups.items():
+            summaries = {None: {"count": len(members)}}
+            for field in fields:
+                numbers = map(self.values[field].__getitem__, members)
+                if self.others[field]:
+                    numbers = [value for value in numbers if value == value]
+                summaries[field] = _summary(list(numbers))
+            if group in result:
+                _combine(result[group], summaries)
+            else:
+                result[group] = summaries
+        return result
+
+    def __set(self, row, field, value):
+        """Store value in the row of field, keeping non-numbers aside"""
+        others = self.others[field]
+        if type(value) in (int, float) and value == value:
+            others.pop(row, None)
+        else:
+            others[row] = value
+            value = _NAN
+        self.values[field][row] = value
+        order = self.__sorted.get(field)
+        if order is not None:
+            order[2].add(row)
+
+    def __order(self, field):
+        """Return the (values, rows, changed) sorted index of field
+
+        The index is sorted again once the rows changed since it was
+        built are more than a thirty-second of the column.
+        """
+        order = self.__sorted.get(field)
+        if order is not None and len(order[2]) <= max(64,
+                                                      len(self.keys) // 32):
+            return order
+        column = self.values[field]
+        values, rows = array("d"), array("q")
+        if len(column) >= _VECTORIZE_MIN and _numpy() is not None:
+            vector = numpy.frombuffer(column, dtype=numpy.float64)
+            ranked = numpy.argsort(vector, kind="stable")
+            ranked = ranked[~numpy.isnan(vector[ranked])]
+            values.frombytes(vector[ranked].tobytes())
+            rows.frombytes(ranked.astype(numpy.int64).tobytes())
+            del vector
+        else:
+            ranked = sorted((row for row, value in enumerate(column)
+                             if value == value), key=column.__getitem__)
+            values.extend(map(column.__getitem__, ranked))
+            rows.extend(ranked)
+        order = self.__sorted[field] = (values, rows, set())
+        return order
+
+    def __range(self, field, bound):
+        """Return the (start, stop) positions of bound in the index of field"""
+        values = self.__order(field)[0]
+        low, low_closed, high, high_closed = bound
+        start = 0 if low is None else \
+            (bisect_left if low_closed else bisect_right)(values, low)
+        stop = len(values) if high is None else \
+            (bisect_right if high_closed else bisect_left)(values, high)
+        return start, max(start, stop)
+
+    def __slice(self, field, start, stop, bound):
+        """Return the rows of field within bound, from its sorted index"""
+        _, rows, changed = self.__order(field)
+        found = rows[start:stop]
+        if not changed:
+            return found.tolist()
+        column = self.values[field]
+        return [row for row in found if row not in changed] + \
+            [row for row in changed if _within(column[row], bound)]
+
+    def __scan(self, conditions):
+        """Return the rows meeting the conditions by testing whole columns"""
+        mask = numpy.ones(len(self.keys), dtype=bool)
+        for field, op, value in conditions:
+            vector = numpy.frombuffer(self.values[field], dtype=numpy.float64)
+            mask &= OPERATORS[op](vector, value)
+            if op == "!=":
+                mask &= ~numpy.isnan(vector)
+            del vector
+        return numpy.flatnonzero(mask).tolist()
+
+    def __accepts(self, row, conditions):
+        """Return whether row meets the conditions, comparing like Python"""
+        for field, op, value in conditions:
+            others = self.others[field]
+            held = others[row] if row in others else self.values[field][row]
+            if not matches(held, op, value):
+                return False
+        return True
+
+
+def _narrow(bound, op, value):
+    """Return bound, a [low, closed, high, closed] range, narrowed by op"""
+    low, low_closed, high, high_closed = bound or (None, True, None, True)
+    if op in ("=", "==", ">", ">="):
+        closed = op != ">"
+        if low is None or value > low or value == low and not closed:
+            low, low_closed = value, closed
+    if op in ("=", "==", "<", "<="):
+        closed = op != "<"
+        if high is None or value < high or value == high and not closed:
+            high, high_closed = value, closed
+    return (low, low_closed, high, high_closed)
+
+
+def _within(value, bound):
+    """Return whether the number value lies within bound"""
+    low, low_closed, high, high_closed = bound
+    if low is not None and not (value >= low if low_closed else value > low):
+        return False
+    if high is not None and not (value <= high if high_closed
+                                 else value < high):
+        return False
+    return value == value
+
+
+def _summary(numbers):
+    """Return the count, sum, min, max and avg of a list of floats"""
+    if not numbers:
+        return {"count": 0, "sum": 0, "min": None, "max": None, "avg": None}
+    total = sum(numbers)
+    return {"count": len(numbers), "sum": _plain(total),
+            "min": _plain(min(numbers)), "max": _plain(max(numbers)),
+            "avg": total / len(numbers)}
+
+
+def _combine(summaries, others):
+    """Add the {field: summary} others to summaries"""
+    for field, other in others.items():
+        summary = summaries.get(field)
+        if summary is None:
+            summaries[field] = other
+        elif field is None:
+            summary["count"] += other["count"]
+        elif not summary["count"]:
+            summary.update(other)
+        elif other["count"]:
+            count = summary["count"] + other["count"]
+            total = summary["sum"] + other["sum"]
+            summary.update(count=count, sum=total,
+                           min=min(summary["min"], other["min"]),
+                           max=max(summary["max"], other["max"]),
+                           avg=total / count)
+
+
+def _plain(number):
+    """Return number as an int when it is a whole number"""
+    return int(number) if number.is_integer() else number
+
+
+def _numpy():
+    """Return numpy, imported on first use, or None if it is missing"""
+    global numpy
+    if numpy is None:
+        try:
+            import numpy
+        except ImportError:
+            numpy = False
+    return numpy or None
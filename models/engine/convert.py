@@ -0,0 +1,52 @@
+#!/usr/bin/python3
+"""Snapshot conversion module for AirBnB clone project
+
+Run this module to convert a snapshot between formats:
+
+    python3 -m models.engine.convert file.json file.bin
+
+The codecs are guessed from the extensions, or named with --from=CODEC
+and --to=CODEC (see models.engine.codecs).
+"""
+import sys
+import time
+from models.engine.codecs import get_codec, guess_codec
+
+
+def convert(src, dst, src_codec, dst_codec):
+    """Convert the snapshot src to dst and return timing statistics
+
+    Returns (records, read seconds, write seconds); the conversion holds
+    every fragment in memory but never builds model objects.
+    """
+    start = time.perf_counter()
+    with open(src, 'r' + src_codec.mode) as f:
+        items = [(key, dst_codec.encode(record))
+                 for key, record, _ in src_codec.read(f)]
+    middle = time.perf_counter()
+    with open(dst, 'w' + dst_codec.mode) as f:
+        dst_codec.write(f, items)
+    return len(items), middle - start, time.perf_counter() - middle
+
+
+def main(argv):
+    """Command line entry point: SRC DST [--from CODEC] [--to CODEC]"""
+    args = [arg for arg in argv if not arg.startswith("--")]
+    options = dict(arg[2:].split("=", 1) for arg in argv
+                   if arg.startswith("--") and "=" in arg)
+    if len(args) != 2:
+        print("usage: python3 -m models.engine.convert SRC DST "
+              "[--from=CODEC] [--to=CODEC]", file=sys.stderr)
+        return 2
+    src, dst = args
+    src_codec = get_codec(options.get("from", guess_codec(src)))
+    dst_codec = get_codec(options.get("to", guess_codec(dst)))
+    count, read, write = convert(src, dst, src_codec, dst_codec)
+    print(f"{count} records: read {src_codec.name} in {read:.3f}s "
+          f"({count / max(read, 1e-9):.0f}/s), write {dst_codec.name} in "
+          f"{write:.3f}s ({count / max(write, 1e-9):.0f}/s)")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main(sys.argv[1:]))
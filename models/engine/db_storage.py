@@ -0,0 +1,482 @@
+#!/usr/bin/python3
+"""DBStorage module for AirBnB clone project"""
+import json
+import sqlite3
+from math import degrees, pi
+from contextlib import contextmanager
+from models.base_model import BaseModel
+from models.user import User
+from models.state import State
+from models.city import City
+from models.amenity import Amenity
+from models.place import Place
+from models.review import Review
+from models.engine.columns import OPERATORS, Columns, matches
+from models.engine.geo import EARTH_KM, scan
+from models.engine.object_map import ObjectMap
+
+class DBStorage:
+    """Stores instances in a SQLite database, one table per class
+
+    Each table has an id primary key, created_at and updated_at, one
+    column per attribute the class declares and an "extra" column holding
+    the other attributes as JSON. Columns have no declared type so values
+    come back exactly as they were stored; lists, booleans and None go to
+    "extra" for the same reason. The columns in __indexes are indexed.
+    The list attributes in __lists also get a table of (element, id)
+    rows, kept up to date by save(), that having() looks elements up in.
+    near() reads the rows of a band of latitudes around the point, on
+    the indexed latitude column of the classes in __points. select()
+    and aggregate() narrow the rows they read with the comparisons the
+    columns can answer.
+
+    Objects read from the database are kept in an identity map that tracks
+    changes like FileStorage does, and save() writes the changed ones with
+    one executemany() per class inside a single transaction.
+    """
+
+    __classes = {
+        "BaseModel": BaseModel,
+        "User": User,
+        "State": State,
+        "City": City,
+        "Amenity": Amenity,
+        "Place": Place,
+        "Review": Review
+    }
+    __indexes = {
+        "City": ("state_id",),
+        "Place": ("city_id", "user_id", "latitude"),
+        "Review": ("place_id", "user_id"),
+        "User": ("email",)
+    }
+    __points = {
+        "Place": ("latitude", "longitude")
+    }
+    __lists = {
+        "Place": ("amenity_ids",)
+    }
+    __scalars = (str, int, float)
+    bounded = False
+
+    def __init__(self, path="hbnb.db"):
+        """Initialize the engine for the database file at path"""
+        self.path = path
+        self.__objects = ObjectMap()
+        self.__connection = None
+        self.__columns = {}
+        for class_name, cls in self.__classes.items():
+            fields = []
+            for base in reversed(cls.__mro__):
+                for name, value in vars(base).items():
+                    if not name.startswith("_") and not callable(value) and \
+                            name not in fields:
+                        fields.append(name)
+            self.__columns[class_name] = fields
+
+    def __connect(self):
+        """Return the database connection, creating the schema if needed"""
+        if self.__connection is None:
+            self.__connection = sqlite3.connect(self.path)
+            self.__connection.execute("PRAGMA journal_mode=WAL")
+            self.__connection.execute("PRAGMA synchronous=NORMAL")
+            with self.__connection:
+                for class_name, fields in self.__columns.items():
+                    columns = ", ".join(f'"{name}"' for name in fields)
+                    self.__connection.execute(
+                        f'CREATE TABLE IF NOT EXISTS "{class_name}" '
+                        f'(id TEXT PRIMARY KEY, created_at, updated_at'
+                        f'{", " if fields else ""}{columns}, extra TEXT)')
+                    for field in self.__indexes.get(class_name, ()):
+                        self.__connection.execute(
+                            f'CREATE INDEX IF NOT EXISTS '
+                            f'"{class_name}_{field}" ON "{class_name}" '
+                            f'("{field}")')
+                for class_name, fields in self.__lists.items():
+                    for field in fields:
+                        self.__create_postings(class_name, field)
+        return self.__connection
+
+    def all(self, cls=None):
+        """Return a dictionary of every object, or of the objects of cls"""
+        objects = self.__objects
+        names = [self.__class_name(cls)] if cls else list(self.__classes)
+        for class_name in names:
+            if class_name in self.__classes:
+                self.__fetch(class_name)
+        if cls is None:
+            return objects
+        return dict(objects.partition(self.__class_name(cls)))
+
+    def get(self, cls, id):
+        """Return the object of cls with the given id, or None"""
+        class_name = self.__class_name(cls)
+        key = f"{class_name}.{id}"
+        if key in self.__objects or key in self.__objects.dirty:
+            return self.__objects.get(key)
+        if class_name not in self.__classes:
+            return None
+        self.__fetch(class_name, "WHERE id = ?", (id,))
+        return self.__objects.get(key)
+
+    def count(self, cls=None):
+        """Return the number of stored objects, of cls if given"""
+        names = [self.__class_name(cls)] if cls else list(self.__classes)
+        total = 0
+        for class_name in names:
+            if class_name not in self.__classes:
+                continue
+            prefix = f"{class_name}."
+            if any(key.startswith(prefix) for key in self.__objects.dirty):
+                total += len(self.all(class_name))
+            else:
+                total += self.__connect().execute(
+                    f'SELECT COUNT(*) FROM "{class_name}"').fetchone()[0]
+        return total
+
+    def version(self, cls=None):
+        """Return a value that changes whenever an object of cls changes
+
+        Commits made by other connections to the database count as a
+        change of every class.
+        """
+        data_version = self.__connect().execute(
+            "PRAGMA data_version").fetchone()[0]
+        return (data_version, self.__objects.version(
+            self.__class_name(cls) if cls else None))
+
+    def find(self, cls, **eq):
+        """Return the objects of cls whose attributes equal the given values
+
+        Declared columns are matched in SQL; unsaved changes are then
+        taken into account by comparing the objects themselves.
+        """
+        class_name = self.__class_name(cls)
+        if class_name not in self.__classes:
+            return {}
+        columns = self.__columns[class_name]
+        where, params = [], []
+        for field, value in eq.items():
+            if field in columns and type(value) in self.__scalars:
+                where.append(f'"{field}" = ?')
+                params.append(value)
+        if len(where) == len(eq):
+            clause = " AND ".join(where)
+            self.__fetch(class_name, f"WHERE {clause}" if clause else "",
+                         params)
+        else:
+            self.__fetch(class_name)
+        result = {}
+        for key, obj in self.__objects.partition(class_name).items():
+            if all(getattr(obj, field, None) == value
+                   for field, value in eq.items()):
+                result[key] = obj
+        return result
+
+    def having(self, cls, field, values):
+        """Return the objects of cls whose list attribute field holds values
+
+        Behaves like FileStorage.having(): for a field declared in
+        __lists, the ids are found by joining the rows of each value.
+        """
+        class_name = self.__class_name(cls)
+        if class_name not in self.__classes:
+            return {}
+        values = list(values)
+        if field in self.__lists.get(class_name, ()) and values and \
+                all(type(value) in self.__scalars for value in values):
+            table = f'"{class_name}_{field}"'
+            joins = "".join(f" JOIN {table} AS t{i} ON t{i}.value = ? AND "
+                            f"t{i}.id = t0.id" for i in range(1, len(values)))
+            self.__fetch(class_name,
+                         f"WHERE id IN (SELECT t0.id FROM {table} AS t0"
+                         f"{joins} WHERE t0.value = ?)",
+                         values[1:] + values[:1])
+        else:
+            self.__fetch(class_name)
+        result = {}
+        for key, obj in self.__objects.partition(class_name).items():
+            held = getattr(obj, field, None)
+            if isinstance(held, (list, tuple, set, frozenset)) and \
+                    all(value in held for value in values):
+                result[key] = obj
+        return result
+
+    def near(self, cls, latitude, longitude, km=None, k=None):
+        """Return [(distance in km, object)] of the objects of cls near a point
+
+        Behaves like FileStorage.near(). Without km, the band read grows
+        until it holds k objects close enough to be the nearest.
+        """
+        class_name = self.__class_name(cls)
+        if class_name not in self.__classes:
+            return []
+        fields = self.__points.get(class_name)
+        partition = self.__objects.partition
+        if fields is None:
+            self.__fetch(class_name)
+            return [(distance, self.__objects[key]) for distance, key in
+                    scan(partition(class_name).items(), latitude,
+                         longitude, km, k)]
+        if isinstance(latitude, bool) or \
+                not isinstance(latitude, (int, float)):
+            raise ValueError("latitude and longitude must be numbers")
+        reach = km if km is not None else 100
+        while True:
+            band = degrees(reach / EARTH_KM)
+            self.__fetch(class_name,
+                         f'WHERE "{fields[0]}" BETWEEN ? AND ?',
+                         (latitude - band, latitude + band))
+            found = scan(partition(class_name).items(), latitude, longitude,
+                         reach, k, fields)
+            if km is not None or len(found) == k or \
+                    reach >= EARTH_KM * pi:
+                return [(distance, self.__objects[key])
+                        for distance, key in found]
+            reach *= 4
+
+    def select(self, cls, conditions):
+        """Return the objects of cls meeting every (field, op, value)
+
+        Behaves like FileStorage.select(): comparisons of declared columns
+        with numbers or strings narrow the rows read in SQL, and every
+        condition is then checked on the objects, so unsaved changes and
+        values stored elsewhere than in their column count too.
+        """
+        class_name = self.__class_name(cls)
+        if class_name not in self.__classes:
+            return {}
+        return {key: self.__objects[key]
+                for key in self.__select(class_name, conditions)}
+
+    def aggregate(self, cls, fields=(), by=None, conditions=()):
+        """Return {group: {field: summary}} of the objects of cls
+
+        Behaves like FileStorage.aggregate(), on the objects select()
+        reads.
+        """
+        class_name = self.__class_name(cls)
+        if class_name not in self.__classes:
+            return {}
+        objects = self.__objects
+        keys = self.__select(class_name, conditions)
+        if by is None:
+            label = None
+        else:
+            def label(key):
+                """Return the group of the object under key"""
+                return getattr(objects[key], by, None)
+        return Columns.of(((key, objects[key]) for key in keys),
+                          fields).aggregate(tuple(fields), keys, label)
+
+    def records(self, cls=None):
+        """Yield (key, to_dict() as JSON text) of each object of cls"""
+        for key, obj in self.all(cls).items():
+            yield key, json.dumps(obj.to_dict())
+
+    def new(self, obj):
+        """Add obj to the objects to be saved"""
+        self.__objects[f"{obj.__class__.__name__}.{obj.id}"] = obj
+
+    def delete(self, obj=None):
+        """Remove obj from storage on the next save"""
+        if obj is not None:
+            key = f"{obj.__class__.__name__}.{obj.id}"
+            if key not in self.__objects:
+                self.get(obj.__class__.__name__, obj.id)
+            self.__objects.pop(key, None)
+            self.__objects.dirty.add(key)
+
+    def track(self, obj, name, value):
+        """Flag obj as changed before its attribute name becomes value"""
+        objects = self.__objects
+        key = f"{obj.__class__.__name__}.{getattr(obj, 'id', None)}"
+        if objects.get(key) is obj:
+            objects.touch(key, name, value)
+
+    @contextmanager
+    def transaction(self):
+        """Group changes so they are saved once, or not at all
+
+        Behaves like FileStorage.transaction().
+        """
+        objects = self.__objects
+        if objects.undo is not None:
+            yield self
+            return
+        objects.undo = {}
+        try:
+            yield self
+        except BaseException:
+            objects.rollback()
+            raise
+        objects.undo = None
+        self.save()
+
+    def save(self):
+        """Write the objects changed since the last save"""
+        objects = self.__objects
+        if objects.undo is not None or not objects.dirty:
+            return
+        upserts, deletes, lists = {}, {}, {}
+        for key in objects.dirty:
+            class_name, _, obj_id = key.partition(".")
+            if class_name not in self.__classes:
+                continue
+            if class_name in self.__lists:
+                lists.setdefault(class_name, []).append(
+                    (obj_id, objects.get(key)))
+            if key in objects:
+                row = self.__row(class_name, objects[key])
+                upserts.setdefault(class_name, []).append(row)
+            else:
+                deletes.setdefault(class_name, []).append((obj_id,))
+        connection = self.__connect()
+        with connection:
+            for class_name, rows in upserts.items():
+                marks = ", ".join("?" * len(rows[0]))
+                connection.executemany(
+                    f'INSERT OR REPLACE INTO "{class_name}" VALUES ({marks})',
+                    rows)
+            for class_name, ids in deletes.items():
+                connection.executemany(
+                    f'DELETE FROM "{class_name}" WHERE id = ?', ids)
+            for class_name, changes in lists.items():
+                for field in self.__lists[class_name]:
+                    table = f'"{class_name}_{field}"'
+                    connection.executemany(
+                        f'DELETE FROM {table} WHERE id = ?',
+                        [(obj_id,) for obj_id, obj in changes])
+                    connection.executemany(
+                        f'INSERT OR IGNORE INTO {table} VALUES (?, ?)',
+                        [(value, obj_id) for obj_id, obj in changes
+                         if obj is not None for value in
+                         self.__elements(getattr(obj, field, None))])
+        objects.dirty.clear()
+
+    def save_later(self):
+        """Save at once; return a function that does nothing
+
+        Behaves like FileStorage.save_later() for a store it cannot split:
+        the changed rows are written now.
+        """
+        self.save()
+        return lambda: None
+
+    def reload(self):
+        """Open the database and forget the unchanged objects in memory"""
+        self.__connect()
+        for key in list(self.__objects):
+            if key not in self.__objects.dirty:
+                self.__objects.unload(key)
+
+    def defer_reload(self):
+        """Forget the unchanged objects without opening the database yet
+
+        Rows are always read on demand, so only connecting is postponed:
+        the database is opened by the first access to storage.
+        """
+        for key in list(self.__objects):
+            if key not in self.__objects.dirty:
+                self.__objects.unload(key)
+
+    def close(self):
+        """Close the database connection"""
+        if self.__connection is not None:
+            self.__connection.close()
+            self.__connection = None
+
+    def __create_postings(self, class_name, field):
+        """Create the table of the elements of class_name.field if missing
+
+        A new table is filled from the rows already in the database.
+        """
+        connection = self.__connection
+        table = f"{class_name}_{field}"
+        if connection.execute(
+                "SELECT 1 FROM sqlite_master WHERE type = 'table' AND "
+                "name = ?", (table,)).fetchone():
+            return
+        connection.execute(f'CREATE TABLE "{table}" (value, id TEXT, '
+                           f'PRIMARY KEY (value, id)) WITHOUT ROWID')
+        connection.execute(f'CREATE INDEX "{table}_id" ON "{table}" (id)')
+        rows = connection.execute(f'SELECT id, extra FROM "{class_name}" '
+                                  f'WHERE extra IS NOT NULL').fetchall()
+        connection.executemany(
+            f'INSERT OR IGNORE INTO "{table}" VALUES (?, ?)',
+            [(value, obj_id) for obj_id, extra in rows
+             for value in self.__elements(json.loads(extra).get(field))])
+
+    @classmethod
+    def __elements(cls, value):
+        """Return the elements of the list value that can be stored"""
+        if not isinstance(value, (list, tuple, set, frozenset)):
+            return []
+        return [element for element in value
+                if type(element) in cls.__scalars]
+
+    def __row(self, class_name, obj):
+        """Return the table row of obj"""
+        attrs = dict(obj.__dict__)
+        row = [attrs.pop("id"), attrs.pop("created_at").isoformat(),
+               attrs.pop("updated_at").isoformat()]
+        for name in self.__columns[class_name]:
+            value = attrs.get(name)
+            if type(value) in self.__scalars:
+                row.append(attrs.pop(name))
+            else:
+                row.append(None)
+        row.append(json.dumps(attrs) if attrs else None)
+        return row
+
+    def __select(self, class_name, conditions):
+        """Return the keys of the objects of class_name meeting conditions
+
+        Rows whose column is NULL are read too: the attribute may then
+        hold the class default or a value kept in "extra".
+        """
+        conditions = list(conditions)
+        columns = self.__columns[class_name]
+        where, params = [], []
+        for field, op, value in conditions:
+            if op not in OPERATORS:
+                raise ValueError(f"unknown operator {op}")
+            if field in columns and op != "!=" and \
+                    type(value) in self.__scalars and value == value:
+                where.append(f'("{field}" {"=" if op == "==" else op} ? '
+                             f'OR "{field}" IS NULL)')
+                params.append(value)
+        self.__fetch(class_name,
+                     f"WHERE {' AND '.join(where)}" if where else "", params)
+        return [key for key, obj in
+                self.__objects.partition(class_name).items()
+                if all(matches(getattr(obj, field, None), op, value)
+                       for field, op, value in conditions)]
+
+    def __fetch(self, class_name, where="", params=()):
+        """Load the rows of class_name matching where into the identity map
+
+        Objects already in memory, or deleted but not saved yet, are kept
+        as they are.
+        """
+        objects = self.__objects
+        cls = self.__classes[class_name]
+        fields = self.__columns[class_name]
+        cursor = self.__connect().execute(
+            f'SELECT * FROM "{class_name}" {where}', params)
+        for row in cursor:
+            key = f"{class_name}.{row[0]}"
+            if key in objects or key in objects.dirty:
+                continue
+            attrs = {"id": row[0], "created_at": row[1], "updated_at": row[2]}
+            for name, value in zip(fields, row[3:-1]):
+                if value is not None:
+                    attrs[name] = value
+            if row[-1]:
+                attrs.update(json.loads(row[-1]))
+            objects.load(key, cls(**attrs))
+
+    @staticmethod
+    def __class_name(cls):
+        """Return the name of cls, which may already be a string"""
+        return cls if isinstance(cls, str) else cls.__name__
@@ -0,0 +1,101 @@
+#!/usr/bin/python3
+"""Durability module for AirBnB clone project"""
+import os
+import threading
+
+
+class Durability:
+    """How hard storage tries to get its writes onto the disk
+
+    Levels, from fastest to safest:
+        none: leave data in the process buffers until the file is closed
+        flush: hand every write to the operating system
+        group: flush every write and fsync at most every interval seconds
+        fsync: fsync every write before returning
+
+    Snapshots are always written to a temporary file renamed over the old
+    one, so a crash in the middle of a save never leaves a truncated file.
+    """
+
+    levels = ("none", "flush", "group", "fsync")
+
+    def __init__(self, level="flush", interval=0.05):
+        """Initialize a durability policy
+
+        Args:
+            level: one of levels
+            interval: seconds between two fsyncs at the "group" level
+        """
+        if level not in self.levels:
+            raise ValueError(f"unknown durability level: {level}")
+        self.level = level
+        self.interval = interval
+        self.__lock = threading.Lock()
+        self.__pending = None
+        self.__timer = None
+
+    def sync(self, f):
+        """Make what was just written to the open file f durable enough"""
+        if self.level == "none":
+            return
+        f.flush()
+        if self.level == "fsync":
+            os.fsync(f.fileno())
+        elif self.level == "group":
+            with self.__lock:
+                self.__pending = f
+                if self.__timer is None:
+                    self.__timer = threading.Timer(self.interval, self.commit)
+                    self.__timer.daemon = True
+                    self.__timer.start()
+
+    def commit(self):
+        """fsync the file written to since the last group commit"""
+        with self.__lock:
+            f, self.__pending = self.__pending, None
+            timer, self.__timer = self.__timer, None
+        if timer is not None:
+            timer.cancel()
+        if f is None:
+            return
+        try:
+            os.fsync(f.fileno())
+        except (OSError, ValueError):
+            pass
+
+    def atomic_write(self, path, write, mode=""):
+        """Replace the file at path with what write(f) writes
+
+        The data goes to a temporary file in the same directory which is
+        renamed over path once complete.
+        """
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        try:
+            with open(tmp_path, 'w' + mode) as f:
+                write(f)
+                if self.level in ("group", "fsync"):
+                    f.flush()
+                    os.fsync(f.fileno())
+            os.replace(tmp_path, path)
+        except BaseException:
+            try:
+                os.remove(tmp_path)
+            except FileNotFoundError:
+                pass
+            raise
+        if self.level in ("group", "fsync"):
+            self.__sync_directory(path)
+
+    @staticmethod
+    def __sync_directory(path):
+        """fsync the directory of path so that a rename is durable"""
+        try:
+            fd = os.open(os.path.dirname(os.path.abspath(path)), os.O_RDONLY)
+        except OSError:
+            return
+        try:
+            os.fsync(fd)
+        except OSError:
+            pass
+        finally:
+            os.close(fd)
@@ -1,6 +1,10 @@
 #!/usr/bin/python3
 """FileStorage module for AirBnB clone project"""
 import json
+import os
+import shutil
+from contextlib import contextmanager, nullcontext
+from itertools import chain
 from models.base_model import BaseModel
 from models.user import User
 from models.state import State
@@ -8,12 +12,73 @@ from models.city import City
 from models.amenity import Amenity
 from models.place import Place
 from models.review import Review
+from models.compact import compact
+from models.engine.codecs import get_codec
+from models.engine.columns import OPERATORS, Columns, matches
+from models.engine.durability import Durability
+from models.engine.geo import scan
+from models.engine.lock import FileLock
+from models.engine.object_map import ObjectMap
+from models.engine.pool import parallel_map
+from models.engine.wal import WriteAheadLog
 
 class FileStorage:
-    """Serializes instances to JSON file and deserializes JSON file to instances"""
-    
+    """Serializes instances to JSON file and deserializes JSON file to instances
+
+    In "snapshot" mode (the default) every save() rewrites the whole file.
+    In "wal" mode save() appends the objects changed since the last flush
+    to a write-ahead log next to the file, and the log is compacted into
+    a new snapshot once it holds compact_every records.
+
+    Objects are partitioned by class, and the attributes listed in
+    __indexes are indexed so that find() does not scan the whole store.
+    The elements of the list attributes in __lists are indexed as well,
+    for having(), the coordinates named in __points in a spatial grid,
+    for near(), and the numbers named in __numbers in a columnar
+    snapshot, for select() and aggregate().
+
+    With lazy=True, reload() only keeps the JSON text of each record and
+    an object is built the first time all(), get() or find() needs it.
+    With compact_models=True, the objects built from disk are instances of
+    the slot-based classes made by models.compact.compact().
+
+    The snapshot format is chosen by codec (see models.engine.codecs); its
+    extension replaces the one of __file_path. Snapshots are replaced
+    atomically and durability (see models.engine.durability) decides when
+    writes are flushed and fsynced.
+
+    With shared=True several processes can use the same file: saves hold
+    an exclusive lock on a file next to it and first merge what the
+    other processes saved, and reads check whether the files changed on
+    disk (see refresh()) before answering.
+
+    With layout="sharded" the snapshot is a directory holding one file
+    per class, each in the format of the single file. With workers > 1,
+    the shards of a large store are encoded and written by that many
+    forked processes, and a lazy reload splits them into records in
+    parallel. Building objects stays in this process: handing them over
+    from a worker costs as much as building them here.
+    """
+
     __file_path = "file.json"
-    __objects = {}
+    __indexes = {
+        "City": ("state_id",),
+        "Place": ("city_id", "user_id"),
+        "Review": ("place_id", "user_id"),
+        "User": ("email",)
+    }
+    __lists = {
+        "Place": ("amenity_ids",)
+    }
+    __points = {
+        "Place": ("latitude", "longitude")
+    }
+    __numbers = {
+        "Place": ("price_by_night", "max_guest", "number_rooms",
+                  "number_bathrooms", "latitude", "longitude")
+    }
+    __objects = ObjectMap(indexes=__indexes, lists=__lists, points=__points,
+                          numbers=__numbers)
     __classes = {
         "BaseModel": BaseModel,
         "User": User,
@@ -23,32 +88,785 @@ class FileStorage:
         "Place": Place,
         "Review": Review
     }
+    modes = ("snapshot", "wal")
+    layouts = ("single", "sharded")
+    parallel_min = 10000
+    bounded = False
+
+    def __init__(self, mode="snapshot", compact_every=1000, lazy=False,
+                 compact_models=False, codec="json", durability="flush",
+                 group_commit_ms=50, shared=False, layout="single",
+                 workers=1):
+        """Initialize the storage engine
+
+        Args:
+            mode: "snapshot" to rewrite the file on every save,
+                "wal" to append changes to a write-ahead log
+            compact_every: number of log records that triggers a compaction
+            lazy: build objects on first access instead of on reload
+            compact_models: build slot-based objects when reading from disk
+            codec: name of the snapshot codec, "json", "orjson" or "binary"
+            durability: "none", "flush", "group" or "fsync"
+            group_commit_ms: milliseconds between fsyncs at the "group" level
+            shared: coordinate with other processes using the same file
+            layout: "single" for one snapshot file, "sharded" for one
+                file per class
+            workers: processes writing and reading the shards, 0 for one
+                per CPU
+        """
+        if mode not in self.modes:
+            raise ValueError(f"unknown storage mode: {mode}")
+        if layout not in self.layouts:
+            raise ValueError(f"unknown storage layout: {layout}")
+        self.mode = mode
+        self.compact_every = compact_every
+        self.lazy = lazy
+        self.compact_models = compact_models
+        self.codec = get_codec(codec)
+        self.file_path = (os.path.splitext(self.__file_path)[0] +
+                          self.codec.extension)
+        self.layout = layout
+        self.shard_dir = os.path.splitext(self.__file_path)[0] + ".shards"
+        self.workers = workers or os.cpu_count() or 1
+        self.durability = Durability(durability, group_commit_ms / 1000)
+        self.__log = WriteAheadLog(self.file_path + ".log", self.durability)
+        self.shared = shared
+        self.__lock = FileLock(self.file_path + ".lock")
+        self.__deferred = False
+        self.__previous = None
+
+    def __table(self):
+        """Return __objects, upgrading it if it was replaced by a dict
+
+        Runs a reload postponed by defer_reload() first.
+        """
+        if self.__deferred:
+            self.__deferred = False
+            self.reload(classes=())
+        if type(FileStorage.__objects) is not ObjectMap:
+            table = ObjectMap(FileStorage.__objects, FileStorage.__indexes,
+                              FileStorage.__lists, FileStorage.__points,
+                              FileStorage.__numbers)
+            table.dirty.update(table)
+            table.rewrite = True
+            FileStorage.__objects = table
+        table = FileStorage.__objects
+        if table.codec != self.codec.name:
+            self.__recode(table)
+        return table
+
+    def all(self, cls=None):
+        """Return the dictionary __objects, or a copy of the objects of cls
+
+        Args:
+            cls: a class or class name to restrict the result to
+        """
+        objects = self.__table()
+        if self.shared:
+            self.refresh()
+        if cls is None:
+            self.__read(objects)
+            self.__hydrate(objects)
+            return objects
+        class_name = self.__class_name(cls)
+        self.__read(objects, class_name)
+        self.__hydrate(objects, class_name)
+        return dict(objects.partition(class_name))
+
+    def get(self, cls, id):
+        """Return the object of cls with the given id, or None"""
+        objects = self.__table()
+        if self.shared:
+            self.refresh()
+        key = f"{self.__class_name(cls)}.{id}"
+        self.__read(objects, key.partition(".")[0])
+        if key not in objects:
+            record = objects.stashed(key.partition(".")[0]).get(key)
+            if record is None:
+                return None
+            self.__build(objects, key, self.codec.decode(record), record)
+        return objects.get(key)
+
+    def count(self, cls=None):
+        """Return the number of stored objects, of cls if given
+
+        Records that have not been turned into objects yet are counted
+        without building them.
+        """
+        objects = self.__table()
+        if self.shared:
+            self.refresh()
+        if cls is None:
+            self.__read(objects)
+            return len(objects) + sum(map(len, objects.raw.values()))
+        class_name = self.__class_name(cls)
+        self.__read(objects, class_name)
+        return (len(objects.partition(class_name)) +
+                len(objects.stashed(class_name)))
+
+    def version(self, cls=None):
+        """Return a number that changes whenever an object of cls changes
 
-    def all(self):
-        """Return the dictionary __objects"""
-        return self.__objects
+        Without cls, it changes whenever any object does. In shared mode
+        the changes merged from other processes count too.
+        """
+        objects = self.__table()
+        if self.shared:
+            self.refresh()
+        return objects.version(self.__class_name(cls) if cls is not None
+                               else None)
+
+    def find(self, cls, **eq):
+        """Return the objects of cls whose attributes equal the given values
+
+        Declared indexes answer for the attributes they cover, and only
+        the remaining attributes are compared on the candidates left.
+        """
+        objects = self.__table()
+        if self.shared:
+            self.refresh()
+        class_name = self.__class_name(cls)
+        self.__read(objects, class_name)
+        self.__hydrate(objects, class_name)
+        keys = None
+        rest = {}
+        for field, value in eq.items():
+            index = objects.index(class_name, field)
+            if index is not None and not index.multi:
+                found = index.get(value)
+                keys = found if keys is None else keys & found
+            else:
+                rest[field] = value
+        if keys is None:
+            candidates = objects.partition(class_name).items()
+        elif not rest:
+            return {key: objects[key] for key in keys}
+        else:
+            candidates = ((key, objects[key]) for key in keys)
+        result = {}
+        for key, obj in candidates:
+            if all(getattr(obj, field, None) == value
+                   for field, value in rest.items()):
+                result[key] = obj
+        return result
+
+    def having(self, cls, field, values):
+        """Return the objects of cls whose list attribute field holds values
+
+        Every one of values must be in the list. When field is declared
+        in __lists, the keys indexed under each value are intersected, so
+        the cost is about the number of objects holding the rarest value.
+        """
+        objects = self.__table()
+        if self.shared:
+            self.refresh()
+        class_name = self.__class_name(cls)
+        self.__read(objects, class_name)
+        self.__hydrate(objects, class_name)
+        values = list(values)
+        index = objects.index(class_name, field)
+        if index is not None and index.multi and values:
+            return {key: objects[key] for key in index.get_all(values)}
+        result = {}
+        for key, obj in objects.partition(class_name).items():
+            held = getattr(obj, field, None)
+            if isinstance(held, (list, tuple, set, frozenset)) and \
+                    all(value in held for value in values):
+                result[key] = obj
+        return result
+
+    def near(self, cls, latitude, longitude, km=None, k=None):
+        """Return [(distance in km, object)] of the objects of cls near a point
+
+        Only the objects within km of the point are returned if km is
+        given, and only the k nearest if k is given; the nearest come
+        first. Classes declared in __points are searched in their grid,
+        the others scanned. Raises ValueError for invalid coordinates.
+        """
+        objects = self.__table()
+        if self.shared:
+            self.refresh()
+        class_name = self.__class_name(cls)
+        self.__read(objects, class_name)
+        self.__hydrate(objects, class_name)
+        grid = objects.grid(class_name)
+        if grid is not None:
+            found = grid.near(latitude, longitude, km, k)
+        else:
+            found = scan(objects.partition(class_name).items(), latitude,
+                         longitude, km, k)
+        return [(distance, objects[key]) for distance, key in found]
+
+    def select(self, cls, conditions):
+        """Return the objects of cls meeting every (field, op, value)
+
+        op is one of =, ==, !=, <, <=, > and >=, and a condition holds
+        when Python says so (values that cannot be compared never match).
+        Conditions on the numbers in __numbers are answered by the
+        columnar snapshot of the class, equalities on indexed attributes
+        by their index, and only the others are checked on the objects
+        left. Raises ValueError for an unknown operator.
+        """
+        objects = self.__table()
+        if self.shared:
+            self.refresh()
+        class_name = self.__class_name(cls)
+        self.__read(objects, class_name)
+        self.__hydrate(objects, class_name)
+        return {key: objects[key]
+                for key in self.__select(objects, class_name, conditions)}
+
+    def aggregate(self, cls, fields=(), by=None, conditions=()):
+        """Return {group: {field: summary}} of the objects of cls
+
+        The objects meeting conditions (see select()) are grouped by their
+        attribute by, or all in the group None. The summary of None is
+        {"count": objects in the group}; the summary of each of fields
+        holds the "count", "sum", "min", "max" and "avg" of its values that
+        are numbers. Numbers in __numbers are read from the columnar
+        snapshot, and indexed attributes group without touching objects;
+        without conditions the buckets of their index are the groups.
+        """
+        objects = self.__table()
+        if self.shared:
+            self.refresh()
+        class_name = self.__class_name(cls)
+        self.__read(objects, class_name)
+        self.__hydrate(objects, class_name)
+        fields = tuple(fields)
+        if conditions:
+            keys = self.__select(objects, class_name, conditions)
+        else:
+            keys = list(objects.partition(class_name))
+        snapshot = None
+        if not fields:
+            snapshot = Columns(())
+        elif set(fields) <= set(objects.numbers.get(class_name, ())):
+            snapshot = objects.snapshot(class_name)
+        if snapshot is None:
+            snapshot = Columns.of(((key, objects[key]) for key in keys),
+                                  fields)
+        if by is None:
+            label = None
+        else:
+            index = objects.index(class_name, by)
+            indexed = index.keys if index is not None and \
+                not index.multi else {}
+            if indexed and not conditions and len(indexed) == len(keys):
+                return snapshot.aggregate(fields, groups=index.values)
+
+            def label(key):
+                """Return the group of the object under key"""
+                if key in indexed:
+                    return indexed[key]
+                return getattr(objects[key], by, None)
+        return snapshot.aggregate(fields, keys, label)
+
+    def records(self, cls=None):
+        """Yield (key, to_dict() as JSON text) of each object, of cls if given
+
+        Cached records and records not turned into objects yet are used as
+        they are, so most objects are neither encoded nor built.
+        """
+        objects = self.__table()
+        if self.shared:
+            self.refresh()
+        class_name = self.__class_name(cls) if cls is not None else None
+        self.__read(objects, class_name)
+        keys = objects if class_name is None else \
+            objects.partition(class_name)
+        if class_name is None:
+            stashed = list(objects.raw.values())
+        else:
+            stashed = [objects.stashed(class_name)]
+        if self.codec.text:
+            for key in keys:
+                yield key, objects.record(key, self.codec.encode_object)
+            for records in stashed:
+                yield from records.items()
+            return
+        json_codec = get_codec("json")
+        for key in keys:
+            yield key, json.dumps(objects[key].to_dict())
+        for records in stashed:
+            for key, record in records.items():
+                yield key, json_codec.encode(self.codec.decode(record))
 
     def new(self, obj):
         """Add new object to __objects with key <obj class name>.id"""
         key = f"{obj.__class__.__name__}.{obj.id}"
-        self.__objects[key] = obj
+        self.__table()[key] = obj
+
+    def delete(self, obj=None):
+        """Remove obj from __objects if it is stored"""
+        if obj is not None:
+            key = f"{obj.__class__.__name__}.{obj.id}"
+            self.__table().pop(key, None)
+
+    def track(self, obj, name, value):
+        """Flag obj as changed before its attribute name becomes value"""
+        objects = self.__table()
+        key = f"{obj.__class__.__name__}.{getattr(obj, 'id', None)}"
+        if objects.get(key) is obj:
+            objects.touch(key, name, value)
+
+    @contextmanager
+    def transaction(self):
+        """Group changes so they are saved once, or not at all
+
+        Every save() inside the block, including BaseModel.save() and the
+        console commands, is deferred until the block ends, and then a
+        single save() writes all the changes. If the block raises, the
+        objects are put back in the state they had when it started and
+        nothing is written. A nested transaction is part of the outer one.
+        """
+        objects = self.__table()
+        if objects.undo is not None:
+            yield self
+            return
+        objects.undo = {}
+        try:
+            yield self
+        except BaseException:
+            objects.rollback()
+            raise
+        objects.undo = None
+        self.save()
 
     def save(self):
-        """Serialize __objects to the JSON file"""
-        json_dict = {}
-        for key, obj in self.__objects.items():
-            json_dict[key] = obj.to_dict()
-        with open(self.__file_path, 'w') as f:
-            json.dump(json_dict, f)
-
-    def reload(self):
-        """Deserialize the JSON file to __objects"""
+        """Persist the objects changed since the last save"""
+        objects = self.__table()
+        if objects.undo is not None:
+            return
+        with self.__flushing(objects):
+            if self.mode == "wal" and not objects.rewrite:
+                records = []
+                for key in objects.dirty:
+                    if key in objects:
+                        records.append(("put", key,
+                                        self.__log_record(objects, key)))
+                    else:
+                        records.append(("del", key, None))
+                self.__log.append(records)
+                objects.dirty.clear()
+                if self.__log.count < self.compact_every:
+                    return
+            self.compact()
+
+    def save_later(self):
+        """Save in two steps; return a function finishing the save
+
+        The records of the objects are gathered now and the function only
+        writes them to the file, so it can run on another thread while the
+        objects keep changing, as long as no other save starts before it
+        returns. Only the single file of a snapshot store that is not
+        shared is written this way; other saves are done at once and the
+        function does nothing.
+        """
+        objects = self.__table()
+        if objects.undo is not None or self.mode != "snapshot" or \
+                self.layout != "single" or self.shared or \
+                self.__previous is not None:
+            self.save()
+            return lambda: None
+        self.__read(objects)
+        items = [(key, objects.record(key, self.codec.encode_object))
+                 for key in objects]
+        items.extend(objects.stashed().items())
+        objects.dirty.clear()
+        objects.rewrite = False
+
+        def write():
+            """Write the records gathered by save_later()"""
+            self.durability.atomic_write(
+                self.file_path, lambda f: self.codec.write(f, items),
+                self.codec.mode)
+            self.__log.truncate()
+        return write
+
+    def compact(self):
+        """Serialize __objects to the JSON file and empty the log"""
+        objects = self.__table()
+        with self.__flushing(objects):
+            if self.layout == "sharded":
+                self.__write_shards(objects)
+            else:
+                self.__read(objects)
+                items = chain(((key, objects.record(
+                    key, self.codec.encode_object)) for key in objects),
+                    objects.stashed().items())
+                self.durability.atomic_write(
+                    self.file_path, lambda f: self.codec.write(f, items),
+                    self.codec.mode)
+            self.__log.truncate()
+            objects.dirty.clear()
+            objects.rewrite = False
+            if self.__previous == "single":
+                os.remove(self.file_path)
+            elif self.__previous == "sharded":
+                shutil.rmtree(self.shard_dir)
+            self.__previous = None
+
+    def reload(self, classes=None):
+        """Deserialize the JSON file and replay the log into __objects
+
+        The file is read incrementally, one record at a time. In the
+        sharded layout, classes may name the only classes to read now;
+        the shard of any other class is read the first time that class
+        is needed. Shared storage always reads every shard.
+
+        A snapshot found only in the other layout is read and migrated
+        to this one by the next save.
+        """
+        self.__deferred = False
+        objects = self.__table()
+        with self.__lock.shared() if self.shared else nullcontext():
+            signature = self.__signature()
+            self.__previous = self.__other_layout()
+            objects.unread.clear()
+            if self.__previous is not None:
+                objects.rewrite = True
+                for key, value, record in self.__snapshot(
+                        layout=self.__previous):
+                    self.__load(objects, key, value, record)
+            elif self.layout == "sharded" and classes is not None and \
+                    not self.shared:
+                classes = [self.__class_name(cls) for cls in classes]
+                objects.unread.update(set(self.__shards()) - set(classes))
+                for key, value, record in self.__snapshot(classes):
+                    self.__load(objects, key, value, record)
+            elif self.lazy and self.layout == "sharded" and self.workers > 1:
+                self.__stash_shards(objects)
+            else:
+                for key, value, record in self.__snapshot():
+                    self.__load(objects, key, value, record)
+            for op, key, value in self.__log.replay():
+                if key.partition(".")[0] in objects.unread:
+                    continue
+                if op == "put":
+                    self.__load(objects, key, value)
+                else:
+                    objects.unload(key)
+            objects.seen = signature
+
+    def defer_reload(self):
+        """Postpone reload() until the first access to storage
+
+        Starting a program that never touches storage (the console reading
+        "quit", --help...) then costs nothing however large the file is.
+        """
+        self.__deferred = True
+
+    def refresh(self):
+        """Merge the changes saved by other processes since the last look
+
+        Checking costs two stat() calls. When the snapshot was replaced,
+        it is read again but only the records that changed are rebuilt;
+        when only the log grew, just the new records are read. Changes
+        not saved yet by this process win over the ones on disk. Returns
+        True if anything changed on disk.
+        """
+        objects = self.__table()
+        if objects.seen == self.__signature():
+            return False
+        with self.__lock.shared():
+            self.__merge(objects)
+        return True
+
+    @staticmethod
+    def __class_name(cls):
+        """Return the name of cls, which may already be a string"""
+        return cls if isinstance(cls, str) else cls.__name__
+
+    @staticmethod
+    def __select(objects, class_name, conditions):
+        """Return the keys of the objects of class_name meeting conditions"""
+        keys = None
+        rest = []
+        covered = []
+        numbers = objects.numbers.get(class_name, ())
+        for field, op, value in conditions:
+            if op not in OPERATORS:
+                raise ValueError(f"unknown operator {op}")
+            index = objects.index(class_name, field)
+            if field in numbers and type(value) in (int, float) and \
+                    value == value:
+                covered.append((field, op, value))
+            elif op in ("=", "==") and index is not None and \
+                    not index.multi:
+                found = index.get(value)
+                keys = found if keys is None else keys & found
+            else:
+                rest.append((field, op, value))
+        if covered:
+            found = objects.snapshot(class_name).select(covered)
+            keys = found if keys is None else \
+                [key for key in found if key in keys]
+        if keys is None:
+            keys = objects.partition(class_name)
+        if not rest:
+            return list(keys)
+        return [key for key in keys
+                if all(matches(getattr(objects[key], field, None), op, value)
+                       for field, op, value in rest)]
+
+    @contextmanager
+    def __flushing(self, objects):
+        """Hold the exclusive lock around a flush in shared mode
+
+        What other processes saved is merged first, so that the flush
+        does not overwrite it.
+        """
+        if not self.shared or self.__lock.held:
+            yield
+            return
+        with self.__lock.exclusive():
+            if objects.seen != self.__signature():
+                self.__merge(objects)
+            yield
+            self.__log.close()
+            objects.seen = self.__signature()
+
+    def __signature(self):
+        """Return what identifies the snapshot and the log on disk
+
+        Replacing a shard changes the modification time of the directory.
+        """
+        snapshot = self.shard_dir if self.layout == "sharded" else \
+            self.file_path
+        return (self.__stat(snapshot), self.__stat(self.__log.path))
+
+    @staticmethod
+    def __stat(path):
+        """Return the inode, modification time and size of path, or None"""
         try:
-            with open(self.__file_path, 'r') as f:
-                json_dict = json.load(f)
-            for key, value in json_dict.items():
-                class_name = value['__class__']
-                if class_name in self.__classes:
-                    self.__objects[key] = self.__classes[class_name](**value)
+            st = os.stat(path)
         except FileNotFoundError:
-            pass
\ No newline at end of file
+            return None
+        return (st.st_ino, st.st_mtime_ns, st.st_size)
+
+    def __merge(self, objects):
+        """Bring objects up to date with the files, keeping local changes
+
+        Must be called with the lock held.
+        """
+        signature = self.__signature()
+        snapshot, log = signature
+        seen = objects.seen
+        start = 0
+        if seen is None or snapshot != seen[0]:
+            self.__merge_snapshot(objects)
+        elif log is not None and seen[1] is not None and \
+                log[0] == seen[1][0] and log[2] >= seen[1][2]:
+            start = seen[1][2]
+        for op, key, value in self.__log.replay(start):
+            if key in objects.dirty:
+                continue
+            if op == "put":
+                self.__load(objects, key, value)
+            else:
+                objects.unload(key)
+        objects.seen = signature
+
+    def __merge_snapshot(self, objects):
+        """Merge the snapshot, rebuilding only the records that changed"""
+        found = set()
+        for key, value, record in self.__snapshot():
+            found.add(key)
+            if key in objects.dirty:
+                continue
+            if record == objects.records.get(key) or record == \
+                    objects.stashed(key.partition(".")[0]).get(key):
+                continue
+            self.__load(objects, key, value, record)
+        for key in list(objects) + list(objects.stashed()):
+            if key not in found and key not in objects.dirty:
+                objects.unload(key)
+
+    def __snapshot(self, names=None, layout=None):
+        """Yield (key, record, fragment) for every record of the snapshot
+
+        In the sharded layout, only the shards of the classes in names are
+        read if it is given. layout overrides the layout of the storage.
+        """
+        if (layout or self.layout) == "sharded":
+            if names is None:
+                names = [name for name in self.__shards()
+                         if name not in self.__table().unread]
+            paths = [self.__shard(name) for name in names]
+        else:
+            paths = [self.file_path]
+        for path in paths:
+            try:
+                with open(path, 'r' + self.codec.mode) as f:
+                    yield from self.codec.read(f)
+            except FileNotFoundError:
+                pass
+
+    def __shard(self, class_name):
+        """Return the path of the shard file of class_name"""
+        return os.path.join(self.shard_dir, class_name + self.codec.extension)
+
+    def __shards(self):
+        """Return the names of the classes that have a shard file"""
+        try:
+            names = os.listdir(self.shard_dir)
+        except FileNotFoundError:
+            return []
+        extension = self.codec.extension
+        return sorted(name[:-len(extension)] for name in names
+                      if name.endswith(extension))
+
+    def __write_shards(self, objects):
+        """Write the shards of the classes changed since the last flush
+
+        In wal mode, the classes named in the log changed too. Every
+        shard is written when the whole store must be, and the shards of
+        the classes left without objects are removed. The shards are
+        written by the workers, the largest first, when they hold at
+        least parallel_min objects together.
+        """
+        if objects.rewrite:
+            self.__read(objects)
+            changed = set(objects.classes) | set(objects.raw) | \
+                set(self.__shards())
+        else:
+            changed = {key.partition(".")[0] for key in objects.dirty}
+            if self.mode == "wal":
+                changed.update(key.partition(".")[0]
+                               for _, key, _ in self.__log.replay())
+            for name in changed:
+                self.__read(objects, name)
+        names = sorted((name for name in changed
+                        if objects.partition(name) or objects.stashed(name)),
+                       key=lambda name: -len(objects.partition(name)) -
+                       len(objects.stashed(name)))
+        encode = self.codec.encode_object
+        records = objects.records
+
+        def write(class_name):
+            """Write one shard; return the records encoded for it"""
+            encoded = {}
+            items = []
+            for key, obj in objects.partition(class_name).items():
+                if key in objects.dirty or key not in records:
+                    record = encoded[key] = encode(obj)
+                else:
+                    record = records[key]
+                items.append((key, record))
+            items.extend(objects.stashed(class_name).items())
+            self.durability.atomic_write(
+                self.__shard(class_name),
+                lambda f: self.codec.write(f, items), self.codec.mode)
+            return encoded
+
+        os.makedirs(self.shard_dir, exist_ok=True)
+        total = sum(len(objects.partition(name)) + len(objects.stashed(name))
+                    for name in names)
+        workers = self.workers if total >= self.parallel_min else 1
+        for encoded in parallel_map(write, names, workers):
+            records.update(encoded)
+        for name in changed.difference(names).intersection(self.__shards()):
+            os.remove(self.__shard(name))
+
+    def __read(self, objects, class_name=None):
+        """Read the shards left unread by reload(), of class_name if given
+
+        The records of the keys changed or stored in the meantime are
+        skipped, so objects already in use are never replaced.
+        """
+        if not objects.unread:
+            return
+        if class_name is None:
+            names = set(objects.unread)
+        elif class_name in objects.unread:
+            names = {class_name}
+        else:
+            return
+        objects.unread.difference_update(names)
+        kept = set(objects.dirty)
+        for name in names:
+            kept.update(objects.partition(name))
+        for key, value, record in self.__snapshot(sorted(names)):
+            if key not in kept:
+                self.__load(objects, key, value, record)
+        for op, key, value in self.__log.replay():
+            if key.partition(".")[0] not in names or key in kept:
+                continue
+            if op == "put":
+                self.__load(objects, key, value)
+            else:
+                objects.unload(key)
+
+    def __other_layout(self):
+        """Return the other layout if only it has a snapshot on disk"""
+        if self.layout == "sharded":
+            if os.path.exists(self.file_path) and \
+                    not os.path.isdir(self.shard_dir):
+                return "single"
+        elif os.path.isdir(self.shard_dir) and \
+                not os.path.exists(self.file_path):
+            return "sharded"
+        return None
+
+    def __stash_shards(self, objects):
+        """Keep the records of every shard as text, split by the workers"""
+        codec = self.codec
+        classes = self.__classes
+
+        def split(path):
+            """Return the (key, fragment) pairs of one shard"""
+            with open(path, 'r' + codec.mode) as f:
+                return [(key, record) for key, value, record in codec.read(f)
+                        if value['__class__'] in classes]
+
+        paths = sorted((self.__shard(name) for name in self.__shards()),
+                       key=lambda path: -os.path.getsize(path))
+        for records in parallel_map(split, paths, self.workers):
+            for key, record in records:
+                objects.stash(key, record)
+
+    def __log_record(self, objects, key):
+        """Return the JSON text of the object under key for the log"""
+        if self.codec.text:
+            return objects.record(key, self.codec.encode_object)
+        return json.dumps(objects[key].to_dict())
+
+    def __recode(self, objects):
+        """Adopt objects written with another codec
+
+        Cached fragments are dropped and records kept as text are
+        converted to this storage's codec.
+        """
+        if objects.codec is not None:
+            previous = get_codec(objects.codec)
+            objects.records.clear()
+            for key, record in objects.stashed().items():
+                objects.stash(key, self.codec.encode(previous.decode(record)))
+        objects.codec = self.codec.name
+
+    def __load(self, objects, key, value, record=None):
+        """Store the record value read from disk under key
+
+        In lazy mode only its JSON text is kept; otherwise the object is
+        built right away.
+        """
+        if value['__class__'] not in self.__classes:
+            return
+        if self.lazy:
+            objects.stash(key, record or self.codec.encode(value))
+        else:
+            self.__build(objects, key, value, record)
+
+    def __build(self, objects, key, value, record=None):
+        """Build the object described by value and store it under key"""
+        cls = self.__classes[value['__class__']]
+        if self.compact_models:
+            cls = compact(cls)
+        obj = cls(**value)
+        objects.load(key, obj, record)
+
+    def __hydrate(self, objects, class_name=None):
+        """Build every record still kept as text, of class_name if given"""
+        for key, record in list(objects.stashed(class_name).items()):
+            self.__build(objects, key, self.codec.decode(record), record)
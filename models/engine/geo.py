@@ -0,0 +1,265 @@
+#!/usr/bin/python3
+"""Geospatial index module for AirBnB clone project
+
+Grid indexes points given by a latitude and a longitude in degrees. Each
+point is turned into the unit vector pointing at it from the centre of
+the Earth, and the vectors are filed in cubic cells of a fixed size. The
+straight-line (chord) distance between two vectors grows with the
+great-circle distance between the points, so a search only looks at the
+cells around the query and there is nothing special to do at the poles
+or across the antimeridian.
+
+Distances of the candidates found are computed with NumPy when it is
+installed and there are enough of them, in plain Python otherwise.
+"""
+import heapq
+from math import asin, cos, isfinite, pi, radians, sin, sqrt
+
+EARTH_KM = 6371.0088
+numpy = None
+_VECTORIZE_MIN = 1024
+
+
+def distance(latitude, longitude, other_latitude, other_longitude):
+    """Return the great-circle distance in km between two points
+
+    Raises ValueError when a coordinate is not a number.
+    """
+    point = _point(latitude, longitude)
+    other = _point(other_latitude, other_longitude)
+    if point is None or other is None:
+        raise ValueError("latitude and longitude must be numbers")
+    return _km(_chord(point, other))
+
+
+def scan(objects, latitude, longitude, km=None, k=None,
+         fields=("latitude", "longitude")):
+    """Return [(distance in km, key)] like Grid.near() by a full scan
+
+    objects is an iterable of (key, object) pairs; the coordinates of an
+    object are its attributes named in fields.
+    """
+    center = _point(latitude, longitude)
+    if center is None:
+        raise ValueError("latitude and longitude must be numbers")
+    limit = 4.0 if km is None else _chord_of(min(km, EARTH_KM * pi)) ** 2
+    a, b, c = center
+    found = []
+    for key, obj in objects:
+        point = _point(getattr(obj, fields[0], None),
+                       getattr(obj, fields[1], None))
+        if point is not None:
+            chord = (point[0] - a) ** 2 + (point[1] - b) ** 2 + \
+                (point[2] - c) ** 2
+            if chord <= limit:
+                found.append((chord, key))
+    found = sorted(found) if k is None else heapq.nsmallest(k, found)
+    return [(_km(sqrt(chord)), key) for chord, key in found]
+
+
+class Grid:
+    """Spatial index of the keys of objects with a latitude and a longitude
+
+    Keys whose coordinates are not finite numbers are remembered but not
+    filed, like unhashable values in an Index, so they are never found.
+    """
+
+    def __init__(self, latitude="latitude", longitude="longitude",
+                 cell_km=50):
+        """Initialize an empty grid
+
+        Args:
+            latitude: name of the attribute holding the latitude
+            longitude: name of the attribute holding the longitude
+            cell_km: edge of a cell, in km along the surface
+        """
+        self.latitude = latitude
+        self.longitude = longitude
+        self.size = 2 * sin(cell_km / (2 * EARTH_KM))
+        self.cells = {}
+        self.coordinates = {}
+        self.__located = {}
+
+    def __len__(self):
+        """Return the number of keys filed in the grid"""
+        return len(self.__located)
+
+    def add(self, key, latitude, longitude):
+        """File key at the given coordinates, replacing its previous ones"""
+        self.remove(key)
+        self.coordinates[key] = (latitude, longitude)
+        point = _point(latitude, longitude)
+        if point is None:
+            return
+        cell = self.__cell(point)
+        self.cells.setdefault(cell, {})[key] = point
+        self.__located[key] = cell
+
+    def update(self, key, field, value):
+        """Move key once its attribute field became value"""
+        if key not in self.coordinates:
+            return
+        latitude, longitude = self.coordinates[key]
+        if field == self.latitude:
+            self.add(key, value, longitude)
+        elif field == self.longitude:
+            self.add(key, latitude, value)
+
+    def remove(self, key):
+        """Drop key from the grid"""
+        self.coordinates.pop(key, None)
+        cell = self.__located.pop(key, None)
+        if cell is None:
+            return
+        bucket = self.cells[cell]
+        del bucket[key]
+        if not bucket:
+            del self.cells[cell]
+
+    def clear(self):
+        """Drop every key from the grid"""
+        self.cells.clear()
+        self.coordinates.clear()
+        self.__located.clear()
+
+    def near(self, latitude, longitude, km=None, k=None):
+        """Return [(distance in km, key)] of the keys near a point
+
+        Only the keys within km of the point are returned if km is given,
+        and only the k nearest if k is given; the nearest come first.
+        Raises ValueError when the coordinates are not numbers.
+        """
+        center = _point(latitude, longitude)
+        if center is None:
+            raise ValueError("latitude and longitude must be numbers")
+        limit = 4.0 if km is None else \
+            _chord_of(min(km, EARTH_KM * pi)) ** 2
+        origin = self.__cell(center)
+        if k is None:
+            rings = int(sqrt(limit) / self.size) + 1
+            found = [(chord, key) for chord, key in
+                     self.__measure(center, self.__around(origin, rings))
+                     if chord <= limit]
+            found.sort()
+        else:
+            found = self.__nearest(center, origin, limit, k)
+        return [(_km(sqrt(chord)), key) for chord, key in found]
+
+    def __nearest(self, center, origin, limit, k):
+        """Return the k best (squared chord, key) within limit, by shells
+
+        Keys in cells beyond the shells looked at so far are at least
+        (shell * size) away, so the search stops once the k-th best is
+        closer than that.
+        """
+        best = []
+        shell = 0
+        last = int(2 / self.size) + 2
+        while shell <= last:
+            if (2 * shell + 1) ** 3 > len(self.cells):
+                found = self.__measure(center, self.cells.values())
+                return heapq.nsmallest(k, (item for item in found
+                                           if item[0] <= limit))
+            for chord, key in self.__measure(center,
+                                             self.__shell(origin, shell)):
+                if chord > limit:
+                    continue
+                if len(best) < k:
+                    heapq.heappush(best, (-chord, key))
+                elif chord < -best[0][0]:
+                    heapq.heapreplace(best, (-chord, key))
+            reach = (shell * self.size) ** 2
+            if len(best) == k and -best[0][0] <= reach or reach > limit:
+                break
+            shell += 1
+        return sorted((-chord, key) for chord, key in best)
+
+    def __around(self, origin, rings):
+        """Yield the buckets of the cells within rings cells of origin"""
+        cells = self.cells
+        i, j, k = origin
+        if (2 * rings + 1) ** 3 > len(cells):
+            for (x, y, z), bucket in cells.items():
+                if abs(x - i) <= rings and abs(y - j) <= rings and \
+                        abs(z - k) <= rings:
+                    yield bucket
+            return
+        for x in range(i - rings, i + rings + 1):
+            for y in range(j - rings, j + rings + 1):
+                for z in range(k - rings, k + rings + 1):
+                    bucket = cells.get((x, y, z))
+                    if bucket is not None:
+                        yield bucket
+
+    def __shell(self, origin, shell):
+        """Yield the buckets of the cells exactly shell cells from origin"""
+        cells = self.cells
+        i, j, k = origin
+        for x in range(i - shell, i + shell + 1):
+            edge_x = abs(x - i) == shell
+            for y in range(j - shell, j + shell + 1):
+                if edge_x or abs(y - j) == shell:
+                    zs = range(k - shell, k + shell + 1)
+                else:
+                    zs = (k - shell, k + shell) if shell else (k,)
+                for z in zs:
+                    bucket = cells.get((x, y, z))
+                    if bucket is not None:
+                        yield bucket
+
+    @staticmethod
+    def __measure(center, buckets):
+        """Return [(squared chord to center, key)] for the buckets' keys"""
+        keys, points = [], []
+        for bucket in buckets:
+            keys.extend(bucket)
+            points.extend(bucket.values())
+        if len(points) >= _VECTORIZE_MIN and _numpy() is not None:
+            chords = ((numpy.asarray(points) - center) ** 2).sum(axis=1)
+            return list(zip(chords.tolist(), keys))
+        a, b, c = center
+        return [((x - a) ** 2 + (y - b) ** 2 + (z - c) ** 2, key)
+                for (x, y, z), key in zip(points, keys)]
+
+    def __cell(self, point):
+        """Return the cell holding point"""
+        size = self.size
+        return (int(point[0] // size), int(point[1] // size),
+                int(point[2] // size))
+
+
+def _numpy():
+    """Return numpy, imported on first use, or None if it is missing"""
+    global numpy
+    if numpy is None:
+        try:
+            import numpy
+        except ImportError:
+            numpy = False
+    return numpy or None
+
+
+def _point(latitude, longitude):
+    """Return the unit vector of the coordinates, or None if invalid"""
+    if isinstance(latitude, bool) or isinstance(longitude, bool) or \
+            not isinstance(latitude, (int, float)) or \
+            not isinstance(longitude, (int, float)) or \
+            not isfinite(latitude) or not isfinite(longitude):
+        return None
+    lat, lon = radians(latitude), radians(longitude)
+    return (cos(lat) * cos(lon), cos(lat) * sin(lon), sin(lat))
+
+
+def _chord(point, other):
+    """Return the straight-line distance between two unit vectors"""
+    return sqrt(sum((a - b) ** 2 for a, b in zip(point, other)))
+
+
+def _chord_of(km):
+    """Return the chord of the great-circle distance km"""
+    return 2 * sin(km / (2 * EARTH_KM))
+
+
+def _km(chord):
+    """Return the great-circle distance in km of a chord"""
+    return 2 * EARTH_KM * asin(min(1.0, chord / 2))
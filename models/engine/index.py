@@ -0,0 +1,83 @@
+#!/usr/bin/python3
+"""Index module for AirBnB clone project"""
+
+
+class Index:
+    """Secondary index mapping the value of one attribute to object keys
+
+    Objects whose value cannot be hashed are left out of the index; such
+    a value can never be equal to a hashable one being looked up.
+
+    With multi=True the attribute holds a list, such as the amenity_ids
+    of a Place, and every key is indexed under each element of its list:
+    get(value) then returns the keys whose list holds value.
+    """
+
+    def __init__(self, field, multi=False):
+        """Initialize an empty index on the attribute field"""
+        self.field = field
+        self.multi = multi
+        self.values = {}
+        self.keys = {}
+
+    def add(self, key, value):
+        """Index key under value, replacing its previous value"""
+        self.remove(key)
+        if not self.multi:
+            try:
+                self.values.setdefault(value, set()).add(key)
+            except TypeError:
+                return
+            self.keys[key] = value
+            return
+        elements = set()
+        if isinstance(value, (list, tuple, set, frozenset)):
+            for element in value:
+                try:
+                    self.values.setdefault(element, set()).add(key)
+                except TypeError:
+                    continue
+                elements.add(element)
+        self.keys[key] = elements
+
+    def remove(self, key):
+        """Drop key from the index"""
+        if key not in self.keys:
+            return
+        value = self.keys.pop(key)
+        for element in value if self.multi else (value,):
+            bucket = self.values[element]
+            bucket.discard(key)
+            if not bucket:
+                del self.values[element]
+
+    def get(self, value):
+        """Return the set of keys whose attribute equals value
+
+        For a multi-valued index, the keys whose list holds value.
+        """
+        try:
+            return self.values.get(value, set())
+        except TypeError:
+            return set()
+
+    def get_all(self, values):
+        """Return the set of keys found under every one of values
+
+        The sets are intersected from the smallest up, so the cost is
+        about the size of the smallest one whatever the others hold.
+        """
+        found = sorted((self.get(value) for value in values), key=len)
+        if not found:
+            return set()
+        keys = set(found[0])
+        for bucket in found[1:]:
+            if not keys:
+                break
+            keys &= bucket
+        return keys
+
+    def clear(self):
+        """Drop every key from the index"""
+        self.values.clear()
+        self.keys.clear()
@@ -0,0 +1,53 @@
+#!/usr/bin/python3
+"""File lock module for AirBnB clone project"""
+import os
+from contextlib import contextmanager
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+
+
+class FileLock:
+    """Advisory lock shared by the processes using the same storage
+
+    The lock is taken with flock() on a separate file so that snapshots
+    can be replaced while it is held. Taking the lock again while it is
+    already held by this object does nothing, so a shared lock requested
+    under the exclusive one keeps it exclusive. Without fcntl (on Windows)
+    the lock does nothing.
+    """
+
+    def __init__(self, path):
+        """Initialize a lock on the file at path"""
+        self.path = path
+        self.__fd = None
+
+    @property
+    def held(self):
+        """True while this object holds the lock"""
+        return self.__fd is not None
+
+    def shared(self):
+        """Return a context manager holding the lock for reading"""
+        return self.__hold(fcntl.LOCK_SH if fcntl else None)
+
+    def exclusive(self):
+        """Return a context manager holding the lock for writing"""
+        return self.__hold(fcntl.LOCK_EX if fcntl else None)
+
+    @contextmanager
+    def __hold(self, operation):
+        """Hold the lock with operation until the block ends"""
+        if self.__fd is not None or operation is None:
+            yield self
+            return
+        fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o644)
+        try:
+            fcntl.flock(fd, operation)
+            self.__fd = fd
+            yield self
+        finally:
+            self.__fd = None
+            os.close(fd)
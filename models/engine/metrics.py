@@ -0,0 +1,178 @@
+#!/usr/bin/python3
+"""Instrumentation module for AirBnB clone project
+
+Setting HBNB_PROFILE=1 turns the shared Metrics object on: models/__init__
+then wraps the storage engine, its codec and BaseModel with timers, and
+the console times every command. With HBNB_PROFILE_DIR set as well, every
+console command runs under cProfile and its statistics are dumped there.
+Nothing is wrapped while profiling is off, so it costs nothing then.
+"""
+import functools
+import os
+import time
+from os import getenv
+
+
+class Metrics:
+    """Timers and counters collected while profiling is on"""
+
+    def __init__(self, enabled=False, profile_dir=None):
+        """Initialize empty metrics
+
+        Args:
+            enabled: whether timers and counters are collected
+            profile_dir: directory receiving one cProfile dump per command
+        """
+        self.enabled = enabled
+        self.profile_dir = profile_dir
+        self.timers = {}
+        self.counters = {}
+        self.__profiles = 0
+
+    def add(self, name, value=1):
+        """Add value to the counter name"""
+        self.counters[name] = self.counters.get(name, 0) + value
+
+    def record(self, name, seconds):
+        """Add one call of seconds to the timer name"""
+        timer = self.timers.get(name)
+        if timer is None:
+            self.timers[name] = [1, seconds, seconds]
+        else:
+            timer[0] += 1
+            timer[1] += seconds
+            if seconds > timer[2]:
+                timer[2] = seconds
+
+    def reset(self):
+        """Forget every timer and counter"""
+        self.timers.clear()
+        self.counters.clear()
+
+    def wrap(self, owner, name, label=None, after=None):
+        """Replace the method name of owner with a timed version
+
+        owner may be a class or an instance. after(result, *args) is
+        called once the method returned, to update counters.
+        """
+        raw = owner.__dict__.get(name) if isinstance(owner, type) else None
+        function = raw.__func__ if isinstance(raw, staticmethod) else \
+            getattr(owner, name)
+        label = label or name
+        clock = time.perf_counter
+        record = self.record
+
+        @functools.wraps(function)
+        def timed(*args, **kwargs):
+            """Call the wrapped method and record how long it took"""
+            start = clock()
+            try:
+                result = function(*args, **kwargs)
+            finally:
+                record(label, clock() - start)
+            if after is not None:
+                after(result, *args, **kwargs)
+            return result
+
+        if isinstance(raw, staticmethod):
+            timed = staticmethod(timed)
+        setattr(owner, name, timed)
+
+    def call(self, label, function, *args):
+        """Return function(*args), timed as label and profiled if asked"""
+        start = time.perf_counter()
+        if not self.profile_dir:
+            try:
+                return function(*args)
+            finally:
+                self.record(label, time.perf_counter() - start)
+        import cProfile
+        profile = cProfile.Profile()
+        try:
+            return profile.runcall(function, *args)
+        finally:
+            self.record(label, time.perf_counter() - start)
+            self.__profiles += 1
+            os.makedirs(self.profile_dir, exist_ok=True)
+            profile.dump_stats(os.path.join(
+                self.profile_dir, f"{self.__profiles:05d}-{label}.prof"))
+
+    def instrument(self, storage):
+        """Time the storage engine, its codec and the model hot paths
+
+        Counts flushes, objects serialized and bytes written as well.
+        """
+        from models.base_model import BaseModel
+        for name in ("__init__", "to_dict", "__str__"):
+            self.wrap(BaseModel, name, f"model.{name.strip('_')}")
+        for name in ("all", "get", "count", "find", "new", "delete",
+                     "save", "reload", "compact"):
+            if hasattr(storage, name):
+                self.wrap(storage, name, f"storage.{name}")
+        codec = getattr(storage, "codec", None)
+        if codec is not None:
+            self.wrap(codec, "encode_object", "codec.encode",
+                      lambda result, obj: self.add(
+                          "storage.objects_serialized"))
+            self.wrap(codec, "write", "codec.write")
+        durability = getattr(storage, "durability", None)
+        if durability is not None:
+            self.wrap(durability, "atomic_write", "disk.snapshot",
+                      lambda result, path, *args: self.__flushed(
+                          os.path.getsize(path)))
+        log = getattr(storage, "_FileStorage__log", None)
+        if log is not None:
+            self.__wrap_log(log)
+
+    def __wrap_log(self, log):
+        """Time the log appends and count the bytes they write"""
+        append = log.append
+
+        def timed_append(records):
+            """Append records, measuring the growth of the log"""
+            before = self.__size(log.path)
+            start = time.perf_counter()
+            try:
+                return append(records)
+            finally:
+                self.record("disk.log", time.perf_counter() - start)
+                self.__flushed(self.__size(log.path) - before)
+
+        log.append = timed_append
+
+    def __flushed(self, size):
+        """Count one write of size bytes to disk"""
+        self.add("storage.flushes")
+        self.add("storage.bytes_written", size)
+
+    @staticmethod
+    def __size(path):
+        """Return the size of the file at path, 0 if it does not exist"""
+        try:
+            return os.path.getsize(path)
+        except FileNotFoundError:
+            return 0
+
+    def report(self):
+        """Return the timers and counters as a printable table"""
+        lines = [f"{'timer':<26} {'calls':>8} {'total ms':>10} "
+                 f"{'mean us':>10} {'max us':>10}"]
+        for name, (calls, total, longest) in sorted(
+                self.timers.items(), key=lambda item: -item[1][1]):
+            lines.append(f"{name:<26} {calls:>8} {total * 1e3:>10.2f} "
+                         f"{total / calls * 1e6:>10.1f} "
+                         f"{longest * 1e6:>10.1f}")
+        if self.counters:
+            lines.append(f"{'counter':<26} {'value':>8}")
+            for name, value in sorted(self.counters.items()):
+                lines.append(f"{name:<26} {value:>8}")
+            flushes = self.counters.get("storage.flushes")
+            if flushes:
+                serialized = self.counters.get("storage.objects_serialized",
+                                               0)
+                lines.append(f"{'objects per flush':<26} "
+                             f"{serialized / flushes:>8.1f}")
+        return "\n".join(lines)
+
+
+metrics = Metrics(getenv("HBNB_PROFILE") == "1", getenv("HBNB_PROFILE_DIR"))
@@ -0,0 +1,39 @@
+#!/usr/bin/python3
+"""Layout migration module for AirBnB clone project
+
+Run this module to move the store to another layout:
+
+    python3 -m models.engine.migrate sharded
+
+FileStorage also migrates by itself: a storage finding a snapshot only
+in the other layout reads it, and its next save writes it in its own
+layout and removes the old one.
+"""
+import sys
+from models.engine.file_storage import FileStorage
+
+
+def migrate(layout, codec="json"):
+    """Move the store to layout; return the number of objects"""
+    storage = FileStorage(layout=layout, lazy=True, codec=codec)
+    storage.reload()
+    storage.compact()
+    return storage.count()
+
+
+def main(argv):
+    """Command line entry point: single|sharded [--codec=CODEC]"""
+    args = [arg for arg in argv if not arg.startswith("--")]
+    options = dict(arg[2:].split("=", 1) for arg in argv
+                   if arg.startswith("--") and "=" in arg)
+    if len(args) != 1 or args[0] not in FileStorage.layouts:
+        print("usage: python3 -m models.engine.migrate single|sharded "
+              "[--codec=CODEC]", file=sys.stderr)
+        return 2
+    count = migrate(args[0], options.get("codec", "json"))
+    print(f"{count} objects in the {args[0]} layout")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main(sys.argv[1:]))
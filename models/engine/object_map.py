@@ -0,0 +1,327 @@
+#!/usr/bin/python3
+"""ObjectMap module for AirBnB clone project"""
+from itertools import count
+from models.engine.columns import Columns
+from models.engine.geo import Grid
+from models.engine.index import Index
+
+_clock = count(1)
+
+
+class ObjectMap(dict):
+    """Dictionary of stored objects that remembers which keys changed
+
+    Every key that is added, replaced or removed through the normal
+    dictionary interface is recorded in ``dirty`` until the next flush,
+    so the storage engine only has to persist what actually changed.
+    ``records`` caches the serialized form of each clean object so that
+    a flush only re-encodes the dirty ones.
+
+    The map also keeps one partition per class name (the part of the key
+    before the dot) in ``classes`` and the secondary indexes declared in
+    ``indexes``, a mapping of class name to attribute names. Attributes
+    declared in ``lists`` the same way hold lists, and each of their
+    elements is indexed (see Index). ``points`` maps a class name to the
+    names of its latitude and longitude attributes, which are indexed in
+    a Grid (see models.engine.geo) built by the first call to grid() and
+    kept up to date from then on, so that it costs nothing until used.
+    ``numbers`` names numeric attributes the same way; snapshot() builds
+    a columnar snapshot of them (see Columns) on first use.
+
+    Records read from disk but not turned into objects yet are kept as
+    JSON text in ``raw``, partitioned by class name like ``classes``.
+
+    ``codec`` names the storage codec that produced ``records`` and ``raw``,
+    and ``seen`` identifies the files on disk the map was last synchronized
+    with. ``unread`` names the classes whose records on disk have not
+    been read yet.
+
+    ``versions`` maps every class name to a number taken from a clock
+    shared by all maps each time one of its objects is added, changed or
+    removed, so that a cache built from the objects can tell it is stale.
+
+    While ``undo`` is a dictionary, the state of every key is saved there
+    before its first change so that rollback() can restore it.
+    """
+
+    def __init__(self, objects=(), indexes=None, lists=None, points=None,
+                 numbers=None):
+        """Initialize the map; nothing is dirty until it is modified"""
+        super().__init__()
+        self.dirty = set()
+        self.records = {}
+        self.rewrite = False
+        self.classes = {}
+        self.raw = {}
+        self.undo = None
+        self.codec = None
+        self.seen = None
+        self.unread = set()
+        self.versions = {}
+        self.indexes = {}
+        for class_name, fields in (indexes or {}).items():
+            self.indexes[class_name] = {field: Index(field)
+                                        for field in fields}
+        for class_name, fields in (lists or {}).items():
+            self.indexes.setdefault(class_name, {}).update(
+                {field: Index(field, multi=True) for field in fields})
+        self.points = dict(points or {})
+        self.grids = {}
+        self.numbers = dict(numbers or {})
+        self.snapshots = {}
+        for key, value in dict(objects).items():
+            self.load(key, value)
+
+    def __setitem__(self, key, value):
+        """Store an object and flag its key as changed"""
+        self.__remember(key)
+        if self.raw:
+            self.unstash(key)
+        self.__link(key, value)
+        super().__setitem__(key, value)
+        self.dirty.add(key)
+        self.__changed(key)
+
+    def __delitem__(self, key):
+        """Remove an object and flag its key as changed"""
+        self.__remember(key)
+        super().__delitem__(key)
+        self.__unlink(key)
+        self.dirty.add(key)
+        self.records.pop(key, None)
+        self.__changed(key)
+
+    def pop(self, key, *default):
+        """Remove and return an object, flagging its key as changed"""
+        if key in self:
+            self.__remember(key)
+            self.__unlink(key)
+            self.dirty.add(key)
+            self.records.pop(key, None)
+            self.__changed(key)
+        return super().pop(key, *default)
+
+    def popitem(self):
+        """Remove and return the last (key, object) pair"""
+        key = next(reversed(self))
+        self.__remember(key)
+        key, value = super().popitem()
+        self.__unlink(key)
+        self.dirty.add(key)
+        self.records.pop(key, None)
+        self.__changed(key)
+        return key, value
+
+    def setdefault(self, key, default=None):
+        """Return the object for key, storing default if it is missing"""
+        if key not in self:
+            self[key] = default
+        return self[key]
+
+    def update(self, *args, **kwargs):
+        """Store every object of the given mapping"""
+        for key, value in dict(*args, **kwargs).items():
+            self[key] = value
+
+    def clear(self):
+        """Remove every object, flagging all keys as changed"""
+        for key in self:
+            self.__remember(key)
+        for key in self.stashed():
+            self.__remember(key)
+        self.dirty.update(self)
+        for stashed in self.raw.values():
+            self.dirty.update(stashed)
+        for class_name in set(self.classes) | set(self.raw):
+            self.__changed(class_name)
+        self.records.clear()
+        self.classes.clear()
+        self.raw.clear()
+        for fields in self.indexes.values():
+            for index in fields.values():
+                index.clear()
+        for grid in self.grids.values():
+            grid.clear()
+        for snapshot in self.snapshots.values():
+            snapshot.clear()
+        super().clear()
+
+    def touch(self, key, name=None, value=None):
+        """Flag the object stored under key as changed
+
+        If name is given, the attribute name of that object is about to
+        become value and its index, if any, is updated.
+        """
+        if key in self:
+            self.__remember(key)
+            self.dirty.add(key)
+            self.__changed(key)
+            if name is not None:
+                index = self.index(key.partition(".")[0], name)
+                if index is not None:
+                    index.add(key, value)
+                if self.grids:
+                    grid = self.grids.get(key.partition(".")[0])
+                    if grid is not None:
+                        grid.update(key, name, value)
+                if self.snapshots:
+                    snapshot = self.snapshots.get(key.partition(".")[0])
+                    if snapshot is not None:
+                        snapshot.update(key, name, value)
+
+    def record(self, key, encode):
+        """Return the serialized form of the object under key
+
+        Clean objects are served from the cache; dirty ones are encoded
+        again with encode(obj) and the result is cached.
+        """
+        if key in self.dirty or key not in self.records:
+            self.records[key] = encode(self[key])
+        return self.records[key]
+
+    def load(self, key, value, record=None):
+        """Store an object read from disk without flagging it"""
+        if self.raw:
+            self.unstash(key)
+        self.__link(key, value)
+        super().__setitem__(key, value)
+        self.dirty.discard(key)
+        if record is None:
+            self.records.pop(key, None)
+        else:
+            self.records[key] = record
+        self.__changed(key)
+
+    def unload(self, key):
+        """Remove an object deleted on disk without flagging it"""
+        self.unstash(key)
+        if key in self:
+            self.__unlink(key)
+        super().pop(key, None)
+        self.dirty.discard(key)
+        self.records.pop(key, None)
+        self.__changed(key)
+
+    def stash(self, key, record):
+        """Keep the JSON text of a record read from disk for later"""
+        if key in self:
+            self.unload(key)
+        self.raw.setdefault(key.partition(".")[0], {})[key] = record
+        self.__changed(key)
+
+    def unstash(self, key):
+        """Forget and return the JSON text kept for key, or None"""
+        class_name = key.partition(".")[0]
+        stashed = self.raw.get(class_name)
+        if not stashed or key not in stashed:
+            return None
+        record = stashed.pop(key)
+        if not stashed:
+            del self.raw[class_name]
+        return record
+
+    def stashed(self, class_name=None):
+        """Return the {key: text} records kept for class_name, or for all"""
+        if class_name is not None:
+            return self.raw.get(class_name, {})
+        return {key: record for stashed in self.raw.values()
+                for key, record in stashed.items()}
+
+    def rollback(self):
+        """Restore every key saved in undo to its saved state"""
+        undo, self.undo = self.undo or {}, None
+        for key, (value, state, record, was_dirty) in undo.items():
+            if value is not None:
+                value.__dict__.clear()
+                value.__dict__.update(state)
+                self.load(key, value)
+            elif record is not None:
+                self.stash(key, record)
+            else:
+                self.unload(key)
+            self.dirty.discard(key)
+            if was_dirty:
+                self.dirty.add(key)
+
+    def partition(self, class_name):
+        """Return the {key: object} partition of class_name"""
+        return self.classes.get(class_name, {})
+
+    def index(self, class_name, field):
+        """Return the index on class_name.field, or None if undeclared"""
+        return self.indexes.get(class_name, {}).get(field)
+
+    def grid(self, class_name):
+        """Return the Grid of the points of class_name, or None if undeclared
+
+        The grid is built from the objects of class_name on the first call.
+        """
+        grid = self.grids.get(class_name)
+        if grid is None and class_name in self.points:
+            grid = self.grids[class_name] = Grid(*self.points[class_name])
+            for key, value in self.partition(class_name).items():
+                grid.add(key, getattr(value, grid.latitude, None),
+                         getattr(value, grid.longitude, None))
+        return grid
+
+    def snapshot(self, class_name):
+        """Return the Columns of the numbers of class_name, or None
+
+        The snapshot is built from the objects of class_name on the first
+        call.
+        """
+        snapshot = self.snapshots.get(class_name)
+        if snapshot is None and class_name in self.numbers:
+            snapshot = self.snapshots[class_name] = Columns.of(
+                self.partition(class_name).items(), self.numbers[class_name])
+        return snapshot
+
+    def version(self, class_name=None):
+        """Return the version of class_name, or the latest of all classes"""
+        if class_name is None:
+            return max(self.versions.values(), default=0)
+        return self.versions.get(class_name, 0)
+
+    def __changed(self, key):
+        """Give the class of key, or the class name key, a new version"""
+        self.versions[key.partition(".")[0]] = next(_clock)
+
+    def __remember(self, key):
+        """Save the state of key in undo before its first change"""
+        if self.undo is None or key in self.undo:
+            return
+        value = self.get(key)
+        state = dict(getattr(value, "__dict__", {}))
+        record = None
+        if value is None:
+            record = self.stashed(key.partition(".")[0]).get(key)
+        self.undo[key] = (value, state, record, key in self.dirty)
+
+    def __link(self, key, value):
+        """Add value to the partition and indexes of its class"""
+        class_name = key.partition(".")[0]
+        self.classes.setdefault(class_name, {})[key] = value
+        for field, index in self.indexes.get(class_name, {}).items():
+            index.add(key, getattr(value, field, None))
+        grid = self.grids.get(class_name) if self.grids else None
+        if grid is not None:
+            grid.add(key, getattr(value, grid.latitude, None),
+                     getattr(value, grid.longitude, None))
+        snapshot = self.snapshots.get(class_name) if self.snapshots else None
+        if snapshot is not None:
+            snapshot.add(key, *(getattr(value, field, None)
+                                for field in snapshot.fields))
+
+    def __unlink(self, key):
+        """Remove key from the partition and indexes of its class"""
+        class_name = key.partition(".")[0]
+        partition = self.classes.get(class_name, {})
+        partition.pop(key, None)
+        if not partition:
+            self.classes.pop(class_name, None)
+        for index in self.indexes.get(class_name, {}).values():
+            index.remove(key)
+        if class_name in self.grids:
+            self.grids[class_name].remove(key)
+        if class_name in self.snapshots:
+            self.snapshots[class_name].remove(key)
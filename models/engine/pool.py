@@ -0,0 +1,35 @@
+#!/usr/bin/python3
+"""Worker pool module for AirBnB clone project"""
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+
+_task = None
+
+
+def _run(job):
+    """Run the task of the pool that forked this worker on job"""
+    return _task(job)
+
+
+def parallel_map(task, jobs, workers):
+    """Return [task(job) for job in jobs], computed by up to workers processes
+
+    The workers are forked, so task may be any callable, closures
+    included, and sees the memory of the caller as it was at the call;
+    only the jobs and the results are pickled. Runs in this process
+    when workers is 1, when there is a single job or when the platform
+    cannot fork.
+    """
+    global _task
+    jobs = list(jobs)
+    workers = min(workers, len(jobs))
+    if workers <= 1 or "fork" not in multiprocessing.get_all_start_methods():
+        return [task(job) for job in jobs]
+    _task = task
+    try:
+        with ProcessPoolExecutor(
+                workers, mp_context=multiprocessing.get_context("fork")) \
+                as pool:
+            return list(pool.map(_run, jobs))
+    finally:
+        _task = None
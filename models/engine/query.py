@@ -0,0 +1,243 @@
+#!/usr/bin/python3
+"""Query module for AirBnB clone project
+
+A query selects objects of one class:
+
+    Place where price_by_night<100 and max_guest>=4
+          order by price_by_night desc limit 20 fields name,price_by_night
+
+Conditions are handed to storage.select(), which answers them from its
+columnar snapshots and indexes where it has them. Without conditions
+the objects are scanned lazily and the first "limit" ones end the scan.
+With "order by" and "limit" only the best "limit" objects are kept.
+
+Aggregates summarize the matching objects instead, per group with
+"group by", through storage.aggregate():
+
+    Place where max_guest>=4 group by city_id
+          fields city_id,count,avg(price_by_night) order by count desc
+
+count counts the objects of a group; count(field), min(field),
+max(field), avg(field) and sum(field) only consider values that are
+numbers, and are None when there is none.
+"""
+import heapq
+import re
+from itertools import islice
+from models.engine.columns import OPERATORS
+
+_TOKEN = re.compile(r'"(?:[^"\\]|\\.)*"|\'[^\']*\'|<=|>=|!=|==|=|<|>|,|'
+                    r'[^\s<>=!,]+')
+_AGGREGATE = re.compile(r"(?:(count|min|max|avg|sum)\((\w+)\)|count)$")
+
+
+class QueryError(ValueError):
+    """Raised for a query that cannot be parsed"""
+
+
+class Query:
+    """Parsed query over the objects of one class"""
+
+    def __init__(self, class_name, where=(), order_by=None, descending=False,
+                 limit=None, fields=None, group_by=None):
+        """Initialize a query
+
+        Args:
+            class_name: name of the class to select
+            where: (field, operator, value) conditions that must all hold
+            order_by: field to sort on, or None to keep storage order
+            descending: sort in decreasing order
+            limit: maximum number of results, or None
+            fields: names of the attributes or aggregates to return, or
+                None for objects
+            group_by: field whose values group the aggregates, or None
+        """
+        self.class_name = class_name
+        self.where = list(where)
+        self.order_by = order_by
+        self.descending = descending
+        self.limit = limit
+        self.fields = fields
+        self.group_by = group_by
+
+    @classmethod
+    def parse(cls, text, classes=None):
+        """Return the Query written in text
+
+        classes maps class names to classes; the values of conditions on
+        attributes a class declares are converted to the declared type.
+        """
+        tokens = _TOKEN.findall(text)
+        if not tokens:
+            raise QueryError("class name missing")
+        query = cls(tokens[0])
+        model = (classes or {}).get(query.class_name)
+        i = 1
+
+        def take(expected=None):
+            """Return the next token, checking it if expected is given"""
+            nonlocal i
+            if i >= len(tokens):
+                raise QueryError("unexpected end of query")
+            token = tokens[i]
+            if expected is not None and token.lower() != expected:
+                raise QueryError(f"expected {expected}, found {token}")
+            i += 1
+            return token
+
+        while i < len(tokens):
+            keyword = take().lower()
+            if keyword == "where":
+                while True:
+                    field, operator = take(), take()
+                    if operator not in OPERATORS:
+                        raise QueryError(f"unknown operator {operator}")
+                    value = _value(take(), model, field)
+                    query.where.append((field, operator, value))
+                    if i < len(tokens) and tokens[i].lower() == "and":
+                        i += 1
+                    else:
+                        break
+            elif keyword == "order":
+                take("by")
+                query.order_by = take()
+                if i < len(tokens) and tokens[i].lower() in ("asc", "desc"):
+                    query.descending = take().lower() == "desc"
+            elif keyword == "limit":
+                try:
+                    query.limit = int(take())
+                except ValueError:
+                    raise QueryError("limit must be an integer")
+                if query.limit < 0:
+                    raise QueryError("limit must be an integer")
+            elif keyword == "group":
+                take("by")
+                query.group_by = take()
+            elif keyword == "fields":
+                query.fields = [take()]
+                while i < len(tokens) and tokens[i] == ",":
+                    i += 1
+                    query.fields.append(take())
+            else:
+                raise QueryError(f"unexpected {keyword}")
+        for name in query.fields or ():
+            if "(" in name and not _AGGREGATE.match(name):
+                raise QueryError(f"unknown aggregate {name}")
+        if query.aggregating():
+            for name in query.columns():
+                if name != query.group_by and not _AGGREGATE.match(name):
+                    raise QueryError(f"{name} is neither grouped nor an "
+                                     f"aggregate")
+            if query.order_by not in (None, *query.columns()):
+                raise QueryError(f"cannot order groups by {query.order_by}")
+        return query
+
+    def aggregating(self):
+        """Return whether the query returns aggregates instead of objects"""
+        return self.group_by is not None or \
+            any(_AGGREGATE.match(name) for name in self.fields or ())
+
+    def columns(self):
+        """Return the names of the values of a row of aggregates
+
+        They are the fields, after the group field if it is not one of
+        them, or the group field and count without fields.
+        """
+        if not self.fields:
+            return [name for name in (self.group_by, "count") if name]
+        if self.group_by is None or self.group_by in self.fields:
+            return list(self.fields)
+        return [self.group_by] + self.fields
+
+    def run(self, storage):
+        """Yield the matching objects, their projections or the groups"""
+        if self.aggregating():
+            return iter(self.groups(storage))
+        objects = self.objects(storage)
+        if self.fields is not None:
+            objects = (self.project(obj) for obj in objects)
+        return objects
+
+    def objects(self, storage):
+        """Yield the matching objects in order, up to limit"""
+        if self.where:
+            matches = storage.select(self.class_name, self.where).values()
+        else:
+            matches = storage.all(self.class_name).values()
+        if self.order_by is None:
+            return islice(matches, self.limit)
+        key = self.__sort_key
+        if self.limit is not None:
+            select = heapq.nlargest if self.descending else heapq.nsmallest
+            return iter(select(self.limit, matches, key=key))
+        return iter(sorted(matches, key=key, reverse=self.descending))
+
+    def groups(self, storage):
+        """Return the rows of aggregates of the matching objects, in order
+
+        Each row maps the names in columns() to the group or aggregate.
+        """
+        names = self.columns()
+        functions = {name: _AGGREGATE.match(name) for name in names}
+        fields = []
+        for match in functions.values():
+            if match is not None and match.group(2) not in (None, *fields):
+                fields.append(match.group(2))
+        rows = []
+        for group, summaries in storage.aggregate(
+                self.class_name, fields, self.group_by, self.where).items():
+            row = {}
+            for name, match in functions.items():
+                if match is None:
+                    row[name] = group
+                else:
+                    row[name] = summaries[match.group(2)][
+                        match.group(1) or "count"]
+            rows.append(row)
+        if self.order_by is not None:
+            rows.sort(key=lambda row: _rank(row[self.order_by]),
+                      reverse=self.descending)
+        return rows[:self.limit]
+
+    def count(self, storage):
+        """Return the number of matching objects without formatting them"""
+        if self.aggregating():
+            return len(self.groups(storage))
+        if not self.where and self.limit is None:
+            return storage.count(self.class_name)
+        return sum(1 for _ in self.objects(storage))
+
+    def project(self, obj):
+        """Return the dictionary of the selected fields of obj"""
+        return {field: getattr(obj, field, None) for field in self.fields}
+
+    def __sort_key(self, obj):
+        """Return the rank of the attribute obj is ordered by"""
+        return _rank(getattr(obj, self.order_by, None))
+
+
+def _rank(value):
+    """Return a key ordering numbers, then strings, then the rest"""
+    if isinstance(value, (int, float)):
+        return (0, value, "")
+    if isinstance(value, str):
+        return (1, 0, value)
+    return (2, 0, repr(value))
+
+
+def _value(token, model, field):
+    """Return the value written as token for the attribute field of model
+
+    Quoted values are strings. Others take the type of the default the
+    class declares for field, or look like an int, a float or a string.
+    """
+    if token[0] in "\"'" and len(token) > 1 and token[-1] == token[0]:
+        return re.sub(r'\\(.)', r'\1', token[1:-1])
+    default = getattr(model, field, None)
+    for kind in (int, float):
+        if default is None or type(default) is kind:
+            try:
+                return kind(token)
+            except ValueError:
+                pass
+    return token
@@ -0,0 +1,51 @@
+#!/usr/bin/python3
+"""Place search module for AirBnB clone project
+
+places_search() answers the filters of the HBNB page: the Places in the
+given States or Cities that have every given Amenity. Nothing is scanned:
+the Places with an Amenity come from the index of the elements of
+Place.amenity_ids, intersected from the rarest Amenity, and only those
+are then checked against the States and Cities. Without Amenities, the
+Cities of a State come from the state_id index and the Places of a City
+from the city_id index.
+"""
+from models.city import City
+from models.place import Place
+
+
+def places_search(storage, states=(), cities=(), amenities=()):
+    """Return the matching Places as a dictionary of key to Place
+
+    Args:
+        storage: the storage engine to search
+        states: ids of States; their Cities are added to cities
+        cities: ids of Cities a Place must be in, any of them
+        amenities: ids of Amenities a Place must have, all of them
+
+    Without states nor cities, Places in every City match; without any
+    ids at all, every Place does. Unknown ids simply match nothing.
+    """
+    states, cities = set(states), set(cities)
+    amenities = list(amenities)
+    if amenities:
+        places = storage.having(Place, "amenity_ids", amenities)
+        if not states and not cities:
+            return places
+        located = {}
+        for place in places.values():
+            city_id = place.city_id
+            if city_id not in located:
+                city = storage.get(City, city_id) if states else None
+                located[city_id] = city_id in cities or (
+                    city is not None and city.state_id in states)
+        return {key: place for key, place in places.items()
+                if located[place.city_id]}
+    if not states and not cities:
+        return dict(storage.all(Place))
+    for state_id in states:
+        cities.update(key.partition(".")[2] for key in
+                      storage.find(City, state_id=state_id))
+    found = {}
+    for city_id in cities:
+        found.update(storage.find(Place, city_id=city_id))
+    return found
@@ -0,0 +1,105 @@
+#!/usr/bin/python3
+"""Streaming JSON reader module for AirBnB clone project"""
+import json
+import re
+from json.decoder import scanstring
+
+_SPACE = re.compile(r'[ \t\n\r]*')
+_MEMBER = re.compile(r'[ \t\n\r]*"([^"\\]*)"[ \t\n\r]*:[ \t\n\r]*')
+_DECODER = json.JSONDecoder()
+
+
+class _Buffer:
+    """Text read from a file in chunks, grown on demand"""
+
+    def __init__(self, f, chunk_size):
+        """Initialize an empty buffer over the file f"""
+        self.f = f
+        self.chunk_size = chunk_size
+        self.text = ""
+
+    def more(self):
+        """Append more of the file; return False at end of file
+
+        The amount read grows with the buffer so that a value larger
+        than chunk_size is not decoded again once per chunk.
+        """
+        chunk = self.f.read(max(self.chunk_size, len(self.text)))
+        self.text += chunk
+        return bool(chunk)
+
+    def char(self, pos):
+        """Return the first non-blank character from pos, and its index"""
+        while True:
+            pos = _SPACE.match(self.text, pos).end()
+            if pos < len(self.text):
+                return self.text[pos], pos
+            if not self.more():
+                raise ValueError("unexpected end of JSON data")
+
+    def string(self, pos):
+        """Decode the JSON string whose opening quote is at pos"""
+        while True:
+            try:
+                return scanstring(self.text, pos + 1)
+            except ValueError:
+                if not self.more():
+                    raise
+
+    def value(self, pos):
+        """Decode the JSON value starting at pos
+
+        A value that runs to the end of the buffer may be cut short (a
+        number split across two chunks), so it is only accepted once
+        something follows it.
+        """
+        while True:
+            try:
+                value, end = _DECODER.raw_decode(self.text, pos)
+                if end < len(self.text):
+                    return value, end
+            except ValueError:
+                pass
+            if not self.more():
+                return _DECODER.raw_decode(self.text, pos)
+
+
+def iter_items(f, chunk_size=1 << 16):
+    """Yield (key, value, text) for every member of the JSON object in f
+
+    The file is read chunk_size characters at a time. Each member value is
+    returned decoded along with its JSON text, and the text already
+    consumed is dropped as reading goes on, so neither the whole document
+    nor the whole parsed tree is ever held in memory.
+    """
+    buf = _Buffer(f, chunk_size)
+    char, pos = buf.char(0)
+    if char != "{":
+        raise ValueError("expected a JSON object")
+    char, pos = buf.char(pos + 1)
+    if char == "}":
+        return
+    while True:
+        if pos > chunk_size:
+            buf.text = buf.text[pos:]
+            pos = 0
+        match = _MEMBER.match(buf.text, pos)
+        if match and match.end() < len(buf.text):
+            key, start = match.group(1), match.end()
+        else:
+            char, pos = buf.char(pos)
+            if char != '"':
+                raise ValueError("expected a member name")
+            key, pos = buf.string(pos)
+            char, pos = buf.char(pos)
+            if char != ":":
+                raise ValueError("expected ':' after a member name")
+            start = buf.char(pos + 1)[1]
+        value, end = buf.value(start)
+        yield key, value, buf.text[start:end]
+        char, pos = buf.char(end)
+        if char == "}":
+            return
+        if char != ",":
+            raise ValueError("expected ',' or '}' after a member")
+        pos += 1
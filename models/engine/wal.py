@@ -0,0 +1,93 @@
+#!/usr/bin/python3
+"""Write-ahead log module for AirBnB clone project"""
+import atexit
+import json
+import os
+from models.engine.durability import Durability
+
+
+class WriteAheadLog:
+    """Append-only log of storage mutations
+
+    Each line is one JSON record: ``{"op": "put", "key": ..., "obj": ...}``
+    for a created or updated object and ``{"op": "del", "key": ...}`` for
+    a deleted one. Replaying the log over the last snapshot rebuilds the
+    current state of the store.
+
+    The file stays open between appends and durability decides when the
+    appended lines reach the disk.
+    """
+
+    def __init__(self, path, durability=None):
+        """Initialize a log stored at path"""
+        self.path = path
+        self.count = 0
+        self.offset = 0
+        self.durability = durability or Durability()
+        self.__file = None
+
+    def append(self, records):
+        """Append (op, key, record) entries and return how many were written
+
+        record is the object already serialized to JSON text, or None
+        for a "del" entry.
+        """
+        lines = []
+        for op, key, record in records:
+            if op == "put":
+                lines.append(f'{{"op": "put", "key": {json.dumps(key)}, '
+                             f'"obj": {record}}}\n')
+            else:
+                lines.append(f'{{"op": "del", "key": {json.dumps(key)}}}\n')
+        if lines:
+            if self.__file is None:
+                self.__file = open(self.path, 'a')
+                atexit.register(self.close)
+            self.__file.write("".join(lines))
+            self.durability.sync(self.__file)
+            self.count += len(lines)
+        return len(lines)
+
+    def close(self):
+        """Flush and close the log file if it is open"""
+        if self.__file is not None:
+            self.__file.close()
+            atexit.unregister(self.close)
+            self.__file = None
+
+    def replay(self, start=0):
+        """Yield the (op, key, obj) records in the order they were written
+
+        Reading starts at the byte offset start, and offset is left after
+        the last record read. A truncated last line, left by a crash in the
+        middle of an append, is ignored.
+        """
+        if self.__file is not None:
+            self.__file.flush()
+        if not start:
+            self.count = 0
+        self.offset = start
+        try:
+            f = open(self.path, 'rb')
+        except FileNotFoundError:
+            return
+        with f:
+            f.seek(start)
+            for line in f:
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    break
+                self.count += 1
+                self.offset += len(line)
+                yield record["op"], record["key"], record.get("obj")
+
+    def truncate(self):
+        """Discard every record once they are part of a snapshot"""
+        self.close()
+        try:
+            os.remove(self.path)
+        except FileNotFoundError:
+            pass
+        self.count = 0
+        self.offset = 0
@@ -0,0 +1,137 @@
+#!/usr/bin/python3
+"""Unit tests for the REST API server"""
+import unittest
+import asyncio
+import json
+import os
+import threading
+from unittest.mock import patch
+from models import storage
+from models.state import State
+from api.v1.app import Server, Writer, respond
+
+class TestApp(unittest.TestCase):
+    """Test cases for respond and Server"""
+
+    def setUp(self):
+        """Set up test environment"""
+        storage.all().clear()
+
+    def tearDown(self):
+        """Clean up test environment"""
+        storage.all().clear()
+        try:
+            os.remove("file.json")
+        except FileNotFoundError:
+            pass
+
+    def test_conditional_get(self):
+        """Test GET returns an ETag and 304 when it still matches"""
+        state = State()
+        path = f"/api/v1/states/{state.id}"
+        status, headers, body = respond("GET", path, {}, b"")
+        self.assertEqual(status, 200)
+        self.assertEqual(json.loads(body), state.to_dict())
+        tag = headers["ETag"]
+        self.assertEqual(respond("GET", path, {"if-none-match": tag}, b""),
+                         (304, {"ETag": tag}, b""))
+        state.name = "Changed"
+        self.assertEqual(respond("GET", path, {"if-none-match": tag},
+                                 b"")[0], 200)
+
+    def test_error_body(self):
+        """Test errors are answered with a JSON body"""
+        status, headers, body = respond("GET", "/api/v1/states/x", {}, b"")
+        self.assertEqual(status, 404)
+        self.assertEqual(json.loads(body), {"error": "Not found"})
+
+    def test_unexpected_error(self):
+        """Test an unexpected error is answered with 500"""
+        with patch("api.v1.app.dispatch", side_effect=KeyError("x")):
+            with self.assertLogs("api.v1.app", "ERROR"):
+                status, headers, body = respond("GET", "/api/v1/states",
+                                                {}, b"")
+        self.assertEqual(status, 500)
+        self.assertEqual(json.loads(body), {"error": "Internal server error"})
+
+    def test_failed_save(self):
+        """Test the writer survives a failed write and saves on close"""
+        async def scenario(writer):
+            writer.start()
+            writer.schedule()
+            await asyncio.sleep(0.05)
+            failed = writer.saves
+            writer.schedule()
+            await asyncio.sleep(0.05)
+            saved = writer.saves
+            await writer.close()
+            return failed, saved
+
+        def fail():
+            """Stand for a write of the file that fails"""
+            raise OSError("disk full")
+
+        State()
+        writer = Writer(0.01)
+        with patch.object(storage, "save_later",
+                          side_effect=[fail, lambda: None]) as save_later:
+            with self.assertLogs("api.v1.app", "ERROR"):
+                self.assertEqual(asyncio.run(scenario(writer)), (0, 1))
+        self.assertEqual(save_later.call_count, 2)
+        self.assertEqual(writer.saves, 2)
+        with open("file.json", 'r') as f:
+            self.assertIn("State.", f.read())
+
+    def test_server(self):
+        """Test requests over HTTP and the background save"""
+        async def exchange(server, request):
+            reader, writer = await asyncio.open_connection("127.0.0.1",
+                                                           server.port)
+            writer.write(request.encode())
+            await writer.drain()
+            data = await reader.read()
+            writer.close()
+            return data.decode()
+
+        def save_later():
+            """Gather the records; note the thread writing them"""
+            write = real_save_later()
+
+            def traced():
+                """Write the records"""
+                threads.append(threading.get_ident())
+                write()
+            return traced
+
+        async def scenario():
+            server = Server("127.0.0.1", 0, flush_ms=10)
+            await server.start()
+            with patch.object(storage, "save_later",
+                              side_effect=save_later) as save:
+                body = json.dumps({"name": "Texas"})
+                created = await exchange(server, (
+                    "POST /api/v1/states HTTP/1.1\r\nConnection: close\r\n"
+                    f"Content-Length: {len(body)}\r\n\r\n{body}"))
+                self.assertEqual(save.call_count, 0)
+                await asyncio.sleep(0.1)
+                saves = save.call_count
+                listed = await exchange(server, "GET /api/v1/states HTTP/1.0"
+                                        "\r\n\r\n")
+            await server.close()
+            return created, saves, listed
+
+        threads = []
+        real_save_later = storage.save_later
+        created, saves, listed = asyncio.run(scenario())
+        self.assertEqual(len(threads), 1)
+        self.assertNotEqual(threads[0], threading.get_ident())
+        self.assertTrue(created.startswith("HTTP/1.1 201 Created\r\n"))
+        self.assertEqual(saves, 1)
+        self.assertTrue(listed.startswith("HTTP/1.1 200 OK\r\n"))
+        self.assertIn('"name": "Texas"', listed)
+        self.assertIn("ETag: ", listed)
+        with open("file.json", 'r') as f:
+            self.assertIn("Texas", f.read())
+
+if __name__ == '__main__':
+    unittest.main()
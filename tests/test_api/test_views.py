@@ -0,0 +1,153 @@
+#!/usr/bin/python3
+"""Unit tests for the REST API views"""
+import unittest
+import json
+import os
+from models import storage
+from models.place import Place
+from models.state import State
+from api.v1.views import HTTPError, dispatch, encode, etag
+
+class TestViews(unittest.TestCase):
+    """Test cases for dispatch and the views"""
+
+    def setUp(self):
+        """Set up test environment"""
+        storage.all().clear()
+
+    def tearDown(self):
+        """Clean up test environment"""
+        storage.all().clear()
+        try:
+            os.remove("file.json")
+        except FileNotFoundError:
+            pass
+
+    def request(self, method, path, body=None, query=None, headers=None):
+        """Dispatch a request and return (status, payload, headers)"""
+        data = json.dumps(body).encode() if body is not None else b""
+        return dispatch(method, "/api/v1" + path, query or {}, data,
+                        headers or {})
+
+    def test_status(self):
+        """Test the status route"""
+        self.assertEqual(self.request("GET", "/status")[1], {"status": "OK"})
+
+    def test_crud(self):
+        """Test objects are created, read, updated and deleted"""
+        status, payload, headers = self.request("POST", "/states",
+                                                {"name": "Texas",
+                                                 "id": "forced"})
+        self.assertEqual(status, 201)
+        self.assertNotEqual(payload["id"], "forced")
+        self.assertEqual(headers["Location"],
+                         f"/api/v1/states/{payload['id']}")
+        state = storage.get(State, payload["id"])
+        self.assertEqual(state.name, "Texas")
+        self.assertEqual(self.request("GET", f"/states/{state.id}")[1],
+                         state.to_dict())
+        self.request("PUT", f"/states/{state.id}", {"name": "Utah"})
+        self.assertEqual(state.name, "Utah")
+        self.assertEqual(self.request("DELETE", f"/states/{state.id}")[1], {})
+        self.assertIsNone(storage.get(State, state.id))
+        self.assertEqual(self.request("GET", "/stats")[1]["states"], 0)
+
+    def test_errors(self):
+        """Test unknown routes, objects, methods and bodies"""
+        cases = [("GET", "/nothing", None, 404),
+                 ("GET", "/states/1234", None, 404),
+                 ("PATCH", "/states", None, 405),
+                 ("POST", "/states", [1], 400),
+                 ("GET", "/states", None, 400)]
+        for method, path, body, status in cases:
+            query = {"page": ["0"]} if status == 400 and body is None else {}
+            with self.assertRaises(HTTPError) as error:
+                self.request(method, path, body, query)
+            self.assertEqual(error.exception.status, status)
+
+    def test_unsafe_attributes(self):
+        """Test methods and private names cannot be set"""
+        state = State()
+        for name in ("to_dict", "save", "__dict__", "_State__x"):
+            for method, path in (("POST", "/states"),
+                                 ("PUT", f"/states/{state.id}")):
+                with self.assertRaises(HTTPError) as error:
+                    self.request(method, path, {"name": "A", name: 1})
+                self.assertEqual(error.exception.status, 400)
+        self.assertEqual(storage.count(State), 1)
+        self.assertNotIn("name", state.__dict__)
+        self.assertEqual(state.to_dict()["__class__"], "State")
+
+    def test_pagination(self):
+        """Test pages of objects and the total count"""
+        states = [State() for _ in range(5)]
+        status, payload, headers = self.request(
+            "GET", "/states", query={"page": ["2"], "per_page": ["2"]})
+        self.assertEqual([state["id"] for state in payload],
+                         [state.id for state in states[2:4]])
+        self.assertEqual(headers["X-Total-Count"], "5")
+        self.assertIn("page=3", headers["Link"])
+        headers = self.request("GET", "/states",
+                               query={"page": ["3"], "per_page": ["2"]})[2]
+        self.assertNotIn("Link", headers)
+
+    def test_query(self):
+        """Test objects are filtered, sorted, projected and aggregated"""
+        places = [Place() for _ in range(4)]
+        for i, place in enumerate(places):
+            place.city_id = "c1" if i < 3 else "c2"
+            place.price_by_night = 40 * i
+            place.max_guest = i
+        payload = self.request("GET", "/places", query={
+            "where": ["max_guest>=1 and price_by_night<100"],
+            "order_by": ["price_by_night desc"]})[1]
+        self.assertEqual([place["id"] for place in payload],
+                         [places[2].id, places[1].id])
+        payload = self.request("GET", "/places", query={
+            "group_by": ["city_id"], "order_by": ["city_id"],
+            "fields": ["count,avg(price_by_night)"]})[1]
+        self.assertEqual(payload, [
+            {"city_id": "c1", "count": 3, "avg(price_by_night)": 40.0},
+            {"city_id": "c2", "count": 1, "avg(price_by_night)": 120.0}])
+        payload = self.request("GET", "/places", query={
+            "where": ["max_guest=3"], "fields": ["created_at"]})[1]
+        self.assertEqual(payload,
+                         [{"created_at": places[3].created_at.isoformat()}])
+        with self.assertRaises(HTTPError) as error:
+            self.request("GET", "/places", query={"where": ["max_guest ~ 1"]})
+        self.assertEqual(error.exception.status, 400)
+
+    def test_if_match(self):
+        """Test PUT is refused when If-Match names another version"""
+        state = State()
+        tag = etag(encode(state.to_dict()))
+        with self.assertRaises(HTTPError) as error:
+            self.request("PUT", f"/states/{state.id}", {"name": "A"},
+                         headers={"if-match": '"stale"'})
+        self.assertEqual(error.exception.status, 412)
+        self.request("PUT", f"/states/{state.id}", {"name": "A"},
+                     headers={"if-match": tag})
+        self.assertEqual(state.name, "A")
+
+    def test_places_search(self):
+        """Test places are searched by city and amenities"""
+        places = [Place() for _ in range(3)]
+        for place in places:
+            place.city_id = "c1"
+            place.amenity_ids = ["wifi"]
+        places[2].city_id = "c2"
+        status, payload, headers = self.request(
+            "POST", "/places_search", {"cities": ["c1"],
+                                       "amenities": ["wifi"]})
+        self.assertEqual(status, 200)
+        self.assertEqual({place["id"] for place in payload},
+                         {place.id for place in places[:2]})
+        self.assertEqual(headers["X-Total-Count"], "2")
+        self.assertEqual(len(self.request("POST", "/places_search", {})[1]),
+                         3)
+        with self.assertRaises(HTTPError) as error:
+            self.request("POST", "/places_search", {"states": "s1"})
+        self.assertEqual(error.exception.status, 400)
+
+if __name__ == '__main__':
+    unittest.main()
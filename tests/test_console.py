@@ -0,0 +1,265 @@
+#!/usr/bin/python3
+"""Unit tests for the HBNBCommand console"""
+import unittest
+import json
+from io import StringIO
+from unittest.mock import patch
+from console import HBNBCommand, main
+from models import storage
+from models.engine.metrics import metrics
+import os
+
+class TestHBNBCommand(unittest.TestCase):
+    """Test cases for HBNBCommand"""
+
+    def setUp(self):
+        """Set up test environment"""
+        self.file_path = "file.json"
+        try:
+            os.remove(self.file_path)
+        except FileNotFoundError:
+            pass
+        storage.all().clear()
+
+    def tearDown(self):
+        """Clean up test environment"""
+        try:
+            os.remove(self.file_path)
+        except FileNotFoundError:
+            pass
+        storage.all().clear()
+
+    def run_command(self, line):
+        """Run one console command and return what it printed"""
+        with patch('sys.stdout', new=StringIO()) as output:
+            HBNBCommand().onecmd(line)
+        return output.getvalue().strip()
+
+    def test_create(self):
+        """Test create prints the id of a new stored instance"""
+        obj_id = self.run_command("create User")
+        self.assertIsNotNone(storage.get("User", obj_id))
+
+    def test_create_errors(self):
+        """Test create error messages"""
+        self.assertEqual(self.run_command("create"),
+                         "** class name missing **")
+        self.assertEqual(self.run_command("create Foo"),
+                         "** class doesn't exist **")
+
+    def test_show(self):
+        """Test show prints the string representation"""
+        obj_id = self.run_command("create City")
+        obj = storage.get("City", obj_id)
+        self.assertEqual(self.run_command(f"show City {obj_id}"), str(obj))
+        self.assertEqual(self.run_command("show City"),
+                         "** instance id missing **")
+        self.assertEqual(self.run_command("show City 1234"),
+                         "** no instance found **")
+
+    def test_destroy(self):
+        """Test destroy removes the instance"""
+        obj_id = self.run_command("create State")
+        self.assertEqual(self.run_command(f"destroy State {obj_id}"), "")
+        self.assertIsNone(storage.get("State", obj_id))
+        self.assertEqual(self.run_command(f"destroy State {obj_id}"),
+                         "** no instance found **")
+
+    def test_all(self):
+        """Test all prints every instance, or those of one class"""
+        user_id = self.run_command("create User")
+        city_id = self.run_command("create City")
+        output = self.run_command("all")
+        self.assertIn(user_id, output)
+        self.assertIn(city_id, output)
+        output = self.run_command("all City")
+        self.assertNotIn(user_id, output)
+        self.assertIn(city_id, output)
+        self.assertEqual(self.run_command("all Foo"),
+                         "** class doesn't exist **")
+
+    def test_update(self):
+        """Test update casts the value to the attribute type"""
+        obj_id = self.run_command("create Place")
+        self.run_command(f'update Place {obj_id} name "My house"')
+        self.run_command(f"update Place {obj_id} max_guest 4")
+        place = storage.get("Place", obj_id)
+        self.assertEqual(place.name, "My house")
+        self.assertEqual(place.max_guest, 4)
+        self.assertEqual(self.run_command(f"update Place {obj_id}"),
+                         "** attribute name missing **")
+        self.assertEqual(self.run_command(f"update Place {obj_id} name"),
+                         "** value missing **")
+
+    def test_transaction(self):
+        """Test commands run inside a transaction save once at the end"""
+        with storage.transaction():
+            obj_id = self.run_command("create User")
+            self.run_command(f"update User {obj_id} email a@example.com")
+            self.assertFalse(os.path.exists(self.file_path))
+        self.assertTrue(os.path.exists(self.file_path))
+
+    def test_quit(self):
+        """Test quit and EOF stop the command loop"""
+        self.assertTrue(HBNBCommand().onecmd("quit"))
+        with patch('sys.stdout', new=StringIO()):
+            self.assertTrue(HBNBCommand().onecmd("EOF"))
+
+    def test_quoted_arguments(self):
+        """Test quoted values are still parsed like shlex"""
+        obj_id = self.run_command("create Place")
+        self.run_command(f'update Place {obj_id} name "My little house"')
+        self.assertEqual(storage.get("Place", obj_id).name, "My little house")
+
+    def test_batch(self):
+        """Test batch runs every command and saves once per chunk"""
+        lines = ["create State\n" for _ in range(10)] + ["\n", "all Foo\n"]
+        with patch.object(storage, "compact", wraps=storage.compact) as spy:
+            with patch('sys.stdout', new=StringIO()) as output:
+                count = HBNBCommand().batch(lines, flush_every=4)
+        self.assertEqual(count, 11)
+        self.assertEqual(spy.call_count, 3)
+        printed = output.getvalue().splitlines()
+        self.assertEqual(len(printed), 11)
+        self.assertEqual(printed[-1], "** class doesn't exist **")
+        self.assertNotIn("(hbnb)", output.getvalue())
+        self.assertEqual(storage.count("State"), 10)
+        with open(self.file_path, 'r') as f:
+            self.assertEqual(f.read().count('"State.'), 10)
+
+    def test_batch_quit(self):
+        """Test batch stops at quit and saves what ran before it"""
+        with patch('sys.stdout', new=StringIO()):
+            count = HBNBCommand().batch(["create User", "quit",
+                                         "create User"], flush_every=0)
+        self.assertEqual(count, 2)
+        self.assertEqual(storage.count("User"), 1)
+        self.assertTrue(os.path.exists(self.file_path))
+
+    def test_batch_bad_line(self):
+        """Test a command that raises keeps the commands around it"""
+        with patch('sys.stdout', new=StringIO()) as output:
+            count = HBNBCommand().batch(["create User", "create User",
+                                         'update User "abc', "create User"])
+        self.assertEqual(count, 4)
+        self.assertEqual(output.getvalue().splitlines()[2],
+                         "** No closing quotation **")
+        self.assertEqual(storage.count("User"), 3)
+        with open(self.file_path, 'r') as f:
+            self.assertEqual(f.read().count('"User.'), 3)
+
+    def test_main_usage(self):
+        """Test an invalid --flush-every prints the usage"""
+        for value in ("many", "-1"):
+            with patch('sys.stderr', new=StringIO()) as err:
+                self.assertEqual(main(["--batch", "-",
+                                       f"--flush-every={value}"]), 2)
+            self.assertTrue(err.getvalue().startswith("usage: "))
+
+    def test_all_query(self):
+        """Test all with a query prints one result per line"""
+        for price in (50, 150, 80):
+            obj_id = self.run_command("create Place")
+            self.run_command(f"update Place {obj_id} price_by_night {price}")
+        output = self.run_command("all Place where price_by_night<100 "
+                                  "order by price_by_night "
+                                  "fields price_by_night")
+        self.assertEqual(output.splitlines(), ["{'price_by_night': 50}",
+                                               "{'price_by_night': 80}"])
+        self.assertEqual(self.run_command("all Place where"),
+                         "** unexpected end of query **")
+
+    def test_all_groups(self):
+        """Test all with aggregates prints one line per group"""
+        for name, price in (("a", 50), ("b", 150), ("a", 80)):
+            obj_id = self.run_command("create Place")
+            self.run_command(f"update Place {obj_id} name {name}")
+            self.run_command(f"update Place {obj_id} price_by_night {price}")
+        output = self.run_command("all Place group by name fields count,"
+                                  "avg(price_by_night) order by name")
+        self.assertEqual(output.splitlines(),
+                         ["{'name': 'a', 'count': 2, "
+                          "'avg(price_by_night)': 65.0}",
+                          "{'name': 'b', 'count': 1, "
+                          "'avg(price_by_night)': 150.0}"])
+        output = self.run_command("all --json Place where price_by_night<100 "
+                                  "fields max(price_by_night)")
+        self.assertEqual(json.loads(output), {"max(price_by_night)": 80})
+        self.assertEqual(self.run_command("all Place fields name,count"),
+                         "** name is neither grouped nor an aggregate **")
+
+    def test_count(self):
+        """Test count prints the number of instances"""
+        self.run_command("create User")
+        self.run_command("create User")
+        self.assertEqual(self.run_command("count User"), "2")
+        self.assertEqual(self.run_command("count State"), "0")
+        self.assertEqual(self.run_command("count User where email=x"), "0")
+        self.assertEqual(self.run_command("count"), "** class name missing **")
+        self.assertEqual(self.run_command("count Foo"),
+                         "** class doesn't exist **")
+
+    def test_near(self):
+        """Test near prints the nearest instances with their distance"""
+        for name, latitude in (("near", 10.0), ("far", 20.0)):
+            obj_id = self.run_command("create Place")
+            self.run_command(f"update Place {obj_id} name {name}")
+            self.run_command(f"update Place {obj_id} latitude {latitude}")
+        lines = self.run_command("near Place 10 0 limit 1").splitlines()
+        self.assertEqual(len(lines), 1)
+        self.assertTrue(lines[0].startswith("0.000 km [Place]"))
+        self.assertIn("'near'", lines[0])
+        self.assertEqual(len(self.run_command(
+            "near Place 10 0 within 2000").splitlines()), 2)
+        self.assertEqual(self.run_command("near Place 10"),
+                         "** longitude missing **")
+        self.assertEqual(self.run_command("near Place 10 x"),
+                         "** longitude must be a number **")
+        self.assertEqual(self.run_command("near Place 10 0 within"),
+                         "** within value missing **")
+
+    def test_stats(self):
+        """Test stats reports the commands timed while profiling is on"""
+        self.assertEqual(self.run_command("stats"),
+                         "** profiling is off, set HBNB_PROFILE=1 **")
+        with patch.object(metrics, "enabled", True):
+            self.run_command("stats reset")
+            self.run_command("create User")
+            self.run_command("create User")
+            report = self.run_command("stats")
+            self.run_command("stats reset")
+        self.assertRegex(report, r"console\.create\s+2\s")
+
+    def test_all_output(self):
+        """Test all prints exactly what print() of the list would"""
+        for _ in range(3):
+            self.run_command("create User")
+        self.run_command("create State")
+        with patch('sys.stdout', new=StringIO()) as expected:
+            print([str(obj) for obj in storage.all().values()])
+        self.assertEqual(self.run_command("all"),
+                         expected.getvalue().strip())
+        self.assertEqual(self.run_command("all Amenity"), "[]")
+
+    def test_all_json(self):
+        """Test all --json prints one record per line"""
+        ids = {self.run_command("create Place") for _ in range(3)}
+        self.run_command("create User")
+        lines = self.run_command("all --json Place").splitlines()
+        records = [json.loads(line) for line in lines]
+        self.assertEqual({record["id"] for record in records}, ids)
+        self.assertEqual(records[0],
+                         storage.get("Place", records[0]["id"]).to_dict())
+        self.assertEqual(len(self.run_command("all --json").splitlines()), 4)
+        output = self.run_command("all Place --json limit 1 fields id")
+        self.assertIn(json.loads(output)["id"], ids)
+
+    def test_show_json(self):
+        """Test show --json prints the dictionary of the instance"""
+        obj_id = self.run_command("create City")
+        self.assertEqual(json.loads(self.run_command(f"show --json City "
+                                                     f"{obj_id}")),
+                         storage.get("City", obj_id).to_dict())
+
+if __name__ == '__main__':
+    unittest.main()
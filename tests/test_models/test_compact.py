@@ -0,0 +1,111 @@
+#!/usr/bin/python3
+"""Unit tests for compact models"""
+import unittest
+from datetime import datetime
+from models.compact import compact, CompactModel
+from models.engine.file_storage import FileStorage
+from models.place import Place
+from models.user import User
+from models import storage
+import json
+import os
+
+class TestCompact(unittest.TestCase):
+    """Test cases for compact()"""
+
+    def setUp(self):
+        """Set up test environment"""
+        self.cls = compact(Place)
+        self.file_path = "file.json"
+        try:
+            os.remove(self.file_path)
+        except FileNotFoundError:
+            pass
+        storage.all().clear()
+
+    def tearDown(self):
+        """Clean up test environment"""
+        try:
+            os.remove(self.file_path)
+        except FileNotFoundError:
+            pass
+        storage.all().clear()
+
+    def test_class(self):
+        """Test the compact class keeps the name and has no __dict__ slot"""
+        self.assertEqual(self.cls.__name__, "Place")
+        self.assertTrue(issubclass(self.cls, CompactModel))
+        self.assertIs(compact(Place), self.cls)
+        self.assertIn("price_by_night", self.cls.__slots__)
+        self.assertEqual(self.cls.__dictoffset__, 0)
+
+    def test_defaults(self):
+        """Test declared attributes default to the class values"""
+        place = self.cls()
+        self.assertEqual(place.name, "")
+        self.assertEqual(place.max_guest, 0)
+        self.assertEqual(place.amenity_ids, [])
+        self.assertIsInstance(place.created_at, datetime)
+        self.assertEqual(place.created_at, place.updated_at)
+        self.assertIn(f"Place.{place.id}", storage.all())
+
+    def test_str_and_to_dict(self):
+        """Test __str__ and to_dict match the BaseModel contract"""
+        place = self.cls()
+        place.name = "Cozy"
+        place.rating = 5
+        self.assertEqual(str(place), f"[Place] ({place.id}) "
+                         f"{dict(place.__dict__)}")
+        data = place.to_dict()
+        self.assertEqual(data["__class__"], "Place")
+        self.assertEqual(data["name"], "Cozy")
+        self.assertEqual(data["rating"], 5)
+        self.assertEqual(data["created_at"], place.created_at.isoformat())
+        self.assertNotIn("max_guest", data)
+
+    def test_kwargs_round_trip(self):
+        """Test a compact object rebuilt from to_dict is identical"""
+        place = Place()
+        place.name = "Cozy"
+        place.latitude = 37.7749
+        clone = self.cls(**place.to_dict())
+        self.assertEqual(clone.to_dict(), place.to_dict())
+        self.assertEqual(clone.created_at, place.created_at)
+        self.assertEqual(str(clone), str(place))
+
+    def test_missing_attribute(self):
+        """Test unknown attributes raise AttributeError"""
+        place = self.cls()
+        with self.assertRaises(AttributeError):
+            place.unknown
+        place.extra = 1
+        del place.extra
+        with self.assertRaises(AttributeError):
+            del place.extra
+
+    def test_tracking(self):
+        """Test attribute writes flag the stored object as changed"""
+        place = self.cls()
+        storage.save()
+        place.max_guest = 4
+        self.assertEqual(storage.all().dirty, {f"Place.{place.id}"})
+        self.assertEqual(storage.find("Place", max_guest=4), {
+            f"Place.{place.id}": place})
+
+    def test_storage_reload(self):
+        """Test storage builds compact objects when asked to"""
+        user = User()
+        user.email = "compact@example.com"
+        storage.save()
+        FileStorage._FileStorage__objects = {}
+        FileStorage(compact_models=True).reload()
+        loaded = storage.all()[f"User.{user.id}"]
+        self.assertIsInstance(loaded, compact(User))
+        self.assertEqual(loaded.email, "compact@example.com")
+        storage.save()
+        with open(self.file_path, 'r') as f:
+            self.assertEqual(json.load(f)[f"User.{user.id}"],
+                             user.to_dict())
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,127 @@
+#!/usr/bin/python3
+"""Unit tests for bulk imports and exports"""
+import unittest
+import json
+import os
+from datetime import datetime
+from io import StringIO
+from unittest.mock import patch
+from models import storage
+from models.place import Place
+from models.user import User
+from models.engine.bulk import (BulkError, build, export_rows, import_rows,
+                                main, read_csv, read_ndjson)
+
+class TestBulk(unittest.TestCase):
+    """Test cases for the bulk module"""
+
+    def setUp(self):
+        """Set up test environment"""
+        storage.all().clear()
+
+    def tearDown(self):
+        """Clean up test environment"""
+        storage.all().clear()
+        for path in ("file.json", "places.csv"):
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+
+    def test_build(self):
+        """Test declared attributes are converted to their type"""
+        place = build(Place, [(1, {"number_rooms": "3", "latitude": 2,
+                                   "amenity_ids": '["a"]', "note": "x",
+                                   "created_at": "2020-01-02T03:04:05",
+                                   "__class__": "Place"})])[0]
+        self.assertEqual(place.number_rooms, 3)
+        self.assertIs(type(place.latitude), float)
+        self.assertEqual(place.amenity_ids, ["a"])
+        self.assertEqual(place.note, "x")
+        self.assertEqual(place.created_at, datetime(2020, 1, 2, 3, 4, 5))
+        self.assertEqual(place.updated_at, place.created_at)
+        self.assertNotIn("__class__", place.__dict__)
+        self.assertEqual(build(Place, [(1, {"max_guest": 4.0})])[0]
+                         .max_guest, 4)
+
+    def test_build_errors(self):
+        """Test rows that do not fit the class are refused"""
+        rows = [{"max_guest": "many"}, {"max_guest": 1.5},
+                {"name": 3}, {"amenity_ids": "a"}, {"__class__": "User"},
+                {"created_at": "yesterday"}, {"id": None}]
+        for row in rows:
+            with self.assertRaises(BulkError) as error:
+                build(Place, [(7, row)])
+            self.assertTrue(str(error.exception).startswith("line 7: "))
+
+    def test_import(self):
+        """Test every row is stored and storage is saved once"""
+        lines = StringIO('{"id": "p1", "price_by_night": "80"}\n\n'
+                         '{"name": "Loft"}\n')
+        with patch.object(storage, "save", wraps=storage.save) as spy:
+            count = import_rows(storage, Place, lines, chunk_size=1)
+        self.assertEqual(count, 2)
+        self.assertEqual(spy.call_count, 1)
+        self.assertEqual(storage.get(Place, "p1").price_by_night, 80)
+        self.assertEqual(len(storage.find(Place, name="Loft")), 1)
+        with open("file.json") as f:
+            self.assertEqual(json.load(f).keys(),
+                             storage.all(Place).keys())
+
+    def test_import_refused(self):
+        """Test a bad row leaves storage as it was"""
+        User()
+        lines = StringIO('{"name": "A"}\n{"max_guest": "x"}\n')
+        with self.assertRaises(BulkError) as error:
+            import_rows(storage, Place, lines, chunk_size=1)
+        self.assertIn("line 2: max_guest", str(error.exception))
+        self.assertEqual(storage.count(), 1)
+        self.assertFalse(os.path.exists("file.json"))
+        with self.assertRaises(BulkError):
+            list(read_ndjson(["[1, 2]"]))
+
+    def test_import_chunks(self):
+        """Test bounded engines are saved after every chunk"""
+        text = "".join(f'{{"name": "{i}"}}\n' for i in range(5))
+        f = StringIO(text)
+        f.seekable = lambda: False
+        with patch.object(storage, "bounded", True), \
+                patch.object(storage, "save", wraps=storage.save) as spy:
+            self.assertEqual(import_rows(storage, Place, f, chunk_size=2),
+                             5)
+        self.assertEqual(spy.call_count, 3)
+        self.assertEqual(storage.count(Place), 5)
+
+    def test_round_trip(self):
+        """Test exported CSV and NDJSON import back the same objects"""
+        place = Place()
+        place.name = "Loft, large"
+        place.max_guest = 4
+        place.latitude = 1.5
+        place.amenity_ids = ["a", "b"]
+        expected = place.to_dict()
+        for fmt, read in (("csv", read_csv), ("ndjson", read_ndjson)):
+            f = StringIO()
+            self.assertEqual(export_rows(storage, Place, f, fmt), 1)
+            storage.all().clear()
+            f.seek(0)
+            self.assertEqual(import_rows(storage, Place, f, read), 1)
+            self.assertEqual(storage.get(Place, place.id).to_dict(),
+                             expected)
+
+    def test_main(self):
+        """Test the command line reports rows per second"""
+        place = Place()
+        with patch('sys.stderr', new=StringIO()) as err:
+            self.assertEqual(main(["export", "Place", "places.csv"]), 0)
+        self.assertRegex(err.getvalue(), r"1 rows exported in .* rows/s")
+        storage.all().clear()
+        with patch('sys.stderr', new=StringIO()):
+            self.assertEqual(main(["import", "Place", "places.csv"]), 0)
+            self.assertEqual(main(["import", "Foo", "places.csv"]), 2)
+            self.assertEqual(main(["import", "User", "places.csv",
+                                   "--format=xml"]), 1)
+        self.assertIsNotNone(storage.get(Place, place.id))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,246 @@
+#!/usr/bin/python3
+"""Unit tests for CacheStorage class"""
+import unittest
+import os
+from unittest.mock import patch
+import models
+from models.base_model import BaseModel
+from models.city import City
+from models.place import Place
+from models.state import State
+from models.user import User
+from models.engine.cache_storage import CacheStorage
+
+class TestCacheStorage(unittest.TestCase):
+    """Test cases for CacheStorage class"""
+
+    def setUp(self):
+        """Set up a cache engine as the global storage"""
+        self.path = "test_cache_storage.data"
+        self.tearDown()
+        self.storage = self.open()
+
+    def tearDown(self):
+        """Clean up test environment"""
+        if hasattr(self, "storage"):
+            self.storage.close()
+        try:
+            os.remove(self.path)
+        except FileNotFoundError:
+            pass
+
+    def open(self, cache_size=4):
+        """Return a new engine over the data file as the global storage"""
+        storage = CacheStorage(self.path, cache_size)
+        storage.reload()
+        patcher = patch.object(models, "storage", storage)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        return storage
+
+    def reopen(self, cache_size=4):
+        """Close the engine and open a new one over the same file"""
+        self.storage.close()
+        self.storage = self.open(cache_size)
+        return self.storage
+
+    def test_bounded_cache(self):
+        """Test clean objects are evicted beyond cache_size"""
+        states = [State() for _ in range(10)]
+        self.assertEqual(self.storage.stats()["size"], 10)
+        self.storage.save()
+        stats = self.storage.stats()
+        self.assertEqual(stats["size"], 4)
+        self.assertEqual(stats["evictions"], 6)
+        obj = self.storage.get(State, states[0].id)
+        self.assertEqual(obj.to_dict(), states[0].to_dict())
+        self.storage.get(State, states[0].id)
+        stats = self.storage.stats()
+        self.assertEqual((stats["hits"], stats["misses"], stats["size"]),
+                         (1, 1, 4))
+
+    def test_defer_reload(self):
+        """Test defer_reload reads the data file on the first access"""
+        state = State()
+        self.storage.save()
+        self.storage.close()
+        storage = CacheStorage(self.path)
+        storage.defer_reload()
+        self.addCleanup(storage.close)
+        self.assertEqual(storage.stats()["size"], 0)
+        self.assertEqual(storage.count(State), 1)
+        self.assertEqual(storage.get(State, state.id).id, state.id)
+
+    def test_all_is_lazy(self):
+        """Test all() is a mapping built one object at a time"""
+        states = [State() for _ in range(10)]
+        City()
+        self.storage.save()
+        view = self.storage.all(State)
+        self.assertEqual(len(view), 10)
+        self.assertEqual(self.storage.stats()["misses"], 0)
+        self.assertEqual({obj.id for obj in view.values()},
+                         {state.id for state in states})
+        self.assertLessEqual(self.storage.stats()["size"], 4)
+        self.assertEqual(len(self.storage.all()), 11)
+        self.assertIn(f"State.{states[0].id}", view)
+        self.assertNotIn(f"State.{states[0].id}", self.storage.all(City))
+
+    def test_reload(self):
+        """Test objects survive a new engine"""
+        user = User()
+        user.email = "a@b.c"
+        user.save()
+        user_dict = user.to_dict()
+        storage = self.reopen()
+        self.assertEqual(storage.get(User, user.id).to_dict(), user_dict)
+        self.assertEqual(storage.count(), 1)
+
+    def test_change_after_eviction(self):
+        """Test changing an object that was evicted is still saved"""
+        state = State()
+        state.save()
+        for _ in range(10):
+            State()
+        self.storage.save()
+        self.assertIsNot(self.storage.get(State, state.id), state)
+        state.name = "Kept"
+        self.storage.save()
+        self.assertEqual(self.reopen().get(State, state.id).name, "Kept")
+
+    def test_delete_and_count(self):
+        """Test deletes are counted before and after saving"""
+        states = [State() for _ in range(3)]
+        self.storage.save()
+        storage = self.reopen()
+        storage.delete(states[0])
+        self.assertEqual(storage.count(State), 2)
+        self.assertIsNone(storage.get(State, states[0].id))
+        storage.save()
+        self.assertEqual(self.reopen().count(State), 2)
+
+    def test_find(self):
+        """Test find uses saved indexes and sees unsaved changes"""
+        cities = [City() for _ in range(6)]
+        for city in cities[:3]:
+            city.state_id = "s1"
+        self.storage.save()
+        cities[0].state_id = "s2"
+        cities[5].state_id = "s1"
+        self.assertEqual(set(self.storage.find(City, state_id="s1")),
+                         {f"City.{city.id}" for city in cities[1:3] +
+                          cities[5:]})
+        self.storage.save()
+        self.assertEqual(len(self.reopen().find(City, state_id="s1")), 3)
+
+    def test_copy_write_ignored(self):
+        """Test writing to an unregistered copy leaves the stored object"""
+        user = User()
+        user.email = "a@example.com"
+        self.storage.save()
+        copy = User(**user.to_dict())
+        copy.email = "b@example.com"
+        self.assertEqual(self.storage.find(User, email="a@example.com"),
+                         {f"User.{user.id}": user})
+        self.assertEqual(self.storage.find(User, email="b@example.com"), {})
+        self.storage.save()
+        self.assertEqual(self.reopen().get(User, user.id).email,
+                         "a@example.com")
+
+    def test_having(self):
+        """Test having uses saved element indexes and unsaved changes"""
+        places = [Place() for _ in range(3)]
+        for place in places[:2]:
+            place.amenity_ids = ["a1", "a2"]
+        self.storage.save()
+        places[0].amenity_ids = ["a1"]
+        places[2].amenity_ids = ["a2", "a1"]
+        self.assertEqual(set(self.storage.having(Place, "amenity_ids",
+                                                 ["a1", "a2"])),
+                         {f"Place.{place.id}" for place in places[1:]})
+        self.storage.save()
+        self.assertEqual(len(self.reopen().having(Place, "amenity_ids",
+                                                  ["a2"])), 2)
+
+    def test_near(self):
+        """Test near finds saved places and follows unsaved moves"""
+        places = [Place() for _ in range(3)]
+        for i, place in enumerate(places):
+            place.latitude, place.longitude = 10.0 + i, 20.0
+        self.storage.save()
+        places[0].latitude = 50.0
+        found = self.storage.near(Place, 10, 20, k=2)
+        self.assertEqual([obj.id for _, obj in found],
+                         [place.id for place in places[1:]])
+        self.storage.save()
+        found = self.reopen().near(Place, 50, 20, km=10)
+        self.assertEqual([obj.id for _, obj in found], [places[0].id])
+
+    def test_select_and_aggregate(self):
+        """Test saved numbers come from the snapshot, unsaved from objects"""
+        places = [Place() for _ in range(3)]
+        for i, place in enumerate(places):
+            place.price_by_night = 100 * (i + 1)
+            place.city_id = "c1"
+        self.storage.save()
+        places[0].price_by_night = 1000
+        found = self.storage.select(Place, [("price_by_night", ">", 150)])
+        self.assertCountEqual(found, [f"Place.{place.id}"
+                                      for place in places])
+        result = self.storage.aggregate(Place, ["price_by_night"],
+                                        by="city_id")
+        self.assertEqual(result["c1"]["price_by_night"],
+                         {"count": 3, "sum": 1500, "min": 200, "max": 1000,
+                          "avg": 500.0})
+        self.storage.save()
+        storage = self.reopen()
+        self.assertEqual(list(storage.select(
+            Place, [("price_by_night", "<", 250),
+                    ("city_id", "=", "c1")]).values())[0].id, places[1].id)
+
+    def test_transaction_rollback(self):
+        """Test a failed transaction restores objects and writes nothing"""
+        state = State()
+        state.name = "A"
+        state.save()
+        with self.assertRaises(RuntimeError):
+            with self.storage.transaction():
+                state.name = "B"
+                BaseModel().save()
+                raise RuntimeError
+        self.assertEqual(state.name, "A")
+        self.assertEqual(self.storage.count(BaseModel), 0)
+        self.assertEqual(self.reopen().get(State, state.id).name, "A")
+
+    def test_compact(self):
+        """Test compaction keeps only the last record of every key"""
+        state = State()
+        for i in range(20):
+            state.name = f"name {i}"
+            state.save()
+        size = os.path.getsize(self.path)
+        self.storage.compact()
+        self.assertLess(os.path.getsize(self.path), size / 10)
+        self.assertEqual(self.storage.get(State, state.id).name, "name 19")
+        self.assertEqual(self.reopen().get(State, state.id).name, "name 19")
+        others = [State() for _ in range(5)]
+        for i, other in enumerate(others):
+            other.name = f"other {i}"
+        self.storage.save()
+        self.storage.compact()
+        for storage in (self.storage, self.reopen()):
+            for i, other in enumerate(others):
+                self.assertEqual(storage.get(State, other.id).name,
+                                 f"other {i}")
+
+    def test_records(self):
+        """Test records yields the dictionaries of every object"""
+        states = [State() for _ in range(6)]
+        self.storage.save()
+        records = dict(self.storage.records(State))
+        self.assertEqual(len(records), 6)
+        self.assertIn(f'"id": "{states[0].id}"',
+                      records[f"State.{states[0].id}"])
+
+if __name__ == '__main__':
+    unittest.main()
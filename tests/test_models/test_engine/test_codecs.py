@@ -0,0 +1,99 @@
+#!/usr/bin/python3
+"""Unit tests for the storage codecs"""
+import unittest
+import io
+import json
+import os
+from datetime import datetime
+from importlib.util import find_spec
+from models.engine.codecs import get_codec, guess_codec
+from models.engine.file_storage import FileStorage
+from models.user import User
+
+RECORD = {
+    "id": "1234",
+    "created_at": "2024-01-01T12:00:00.000001",
+    "updated_at": "2024-01-02T08:30:00",
+    "email": "a@example.com",
+    "amenity_ids": ["x", "y"],
+    "__class__": "User"
+}
+
+class TestCodecs(unittest.TestCase):
+    """Test cases for the codec classes"""
+
+    def setUp(self):
+        """Set up test environment"""
+        self.paths = ["file.json", "file.bin", "file.bin.log"]
+        self.tearDown()
+
+    def tearDown(self):
+        """Clean up test environment"""
+        for path in self.paths:
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+        FileStorage._FileStorage__objects = {}
+
+    def round_trip(self, codec):
+        """Write RECORD with codec and return what read() yields"""
+        f = io.BytesIO() if codec.mode == "b" else io.StringIO()
+        codec.write(f, [("User.1234", codec.encode(RECORD))])
+        f.seek(0)
+        return list(codec.read(f))
+
+    def test_json(self):
+        """Test the JSON codec writes the historical file format"""
+        codec = get_codec("json")
+        (key, record, fragment), = self.round_trip(codec)
+        self.assertEqual((key, record), ("User.1234", RECORD))
+        self.assertEqual(json.loads(fragment), RECORD)
+
+    @unittest.skipIf(find_spec("orjson") is None, "orjson is not installed")
+    def test_orjson(self):
+        """Test the orjson codec reads and writes plain JSON"""
+        codec = get_codec("orjson")
+        (key, record, fragment), = self.round_trip(codec)
+        self.assertEqual(record, RECORD)
+        self.assertEqual(get_codec("json").decode(fragment), RECORD)
+
+    def test_binary(self):
+        """Test the binary codec decodes timestamps to datetimes"""
+        codec = get_codec("binary")
+        (key, record, fragment), = self.round_trip(codec)
+        self.assertEqual(key, "User.1234")
+        self.assertIsInstance(fragment, bytes)
+        self.assertEqual(record["created_at"],
+                         datetime(2024, 1, 1, 12, 0, 0, 1))
+        self.assertEqual(record["email"], "a@example.com")
+        self.assertEqual(record["amenity_ids"], ["x", "y"])
+        self.assertEqual(User(**record).to_dict(), RECORD)
+
+    def test_binary_rejects_other_files(self):
+        """Test reading a file that is not a binary snapshot fails"""
+        with self.assertRaises(ValueError):
+            list(get_codec("binary").read(io.BytesIO(b"{}")))
+
+    def test_unknown_codec(self):
+        """Test unknown codec names are rejected"""
+        with self.assertRaises(ValueError):
+            get_codec("yaml")
+        self.assertEqual(guess_codec("dump.bin"), "binary")
+        self.assertEqual(guess_codec("dump.txt"), "json")
+
+    def test_binary_storage(self):
+        """Test FileStorage saves and reloads with the binary codec"""
+        storage = FileStorage(codec="binary")
+        self.assertEqual(storage.file_path, "file.bin")
+        user = User()
+        user.email = "binary@example.com"
+        storage.new(user)
+        storage.save()
+        FileStorage._FileStorage__objects = {}
+        storage.reload()
+        loaded = storage.get(User, user.id)
+        self.assertEqual(loaded.to_dict(), user.to_dict())
+
+if __name__ == '__main__':
+    unittest.main()
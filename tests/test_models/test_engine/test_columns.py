@@ -0,0 +1,95 @@
+#!/usr/bin/python3
+"""Unit tests for the columnar snapshot"""
+import unittest
+import random
+from models.engine.columns import Columns, matches
+
+class Row:
+    """Object with a price and a number of guests"""
+
+    def __init__(self, price, guests):
+        """Initialize the row"""
+        self.price = price
+        self.guests = guests
+
+class TestColumns(unittest.TestCase):
+    """Test cases for Columns"""
+
+    def test_matches(self):
+        """Test conditions compare like Python, never raising"""
+        self.assertTrue(matches(1, "=", 1.0))
+        self.assertTrue(matches("a", "!=", 1))
+        self.assertFalse(matches("a", "<", 1))
+        self.assertFalse(matches(None, ">=", 0))
+
+    def test_select_matches_loop(self):
+        """Test selections find what a loop over the objects finds"""
+        rng = random.Random(3)
+        odd = ["x", None, True, float("nan"), 2.5]
+        rows = {f"Row.{i}": Row(rng.choice(odd) if i % 40 == 0 else
+                                rng.randint(0, 300), rng.randint(0, 8))
+                for i in range(3000)}
+        columns = Columns.of(rows.items(), ("price", "guests"))
+        operators = ("=", "==", "!=", "<", "<=", ">", ">=")
+        for _ in range(500):
+            conditions = [(rng.choice(("price", "guests")),
+                           rng.choice(operators),
+                           rng.choice((rng.randint(-1, 301), 4, 1,
+                                       rng.random() * 300)))
+                          for _ in range(rng.randint(1, 3))]
+            self.assertTrue(all(columns.covers(*condition)
+                                for condition in conditions))
+            expected = [key for key, row in rows.items()
+                        if all(matches(getattr(row, field), op, value)
+                               for field, op, value in conditions)]
+            self.assertCountEqual(columns.select(conditions), expected)
+            for _ in range(20):
+                key = f"Row.{rng.randrange(3200)}"
+                if key in rows and rng.random() < 0.2:
+                    del rows[key]
+                    columns.remove(key)
+                elif key in rows:
+                    rows[key].price = rng.randint(0, 300)
+                    columns.update(key, "price", rows[key].price)
+                else:
+                    rows[key] = Row(rng.randint(0, 300), rng.randint(0, 8))
+                    columns.add(key, rows[key].price, rows[key].guests)
+        self.assertEqual(len(columns), len(rows))
+
+    def test_covers(self):
+        """Test only comparisons of snapshot fields with numbers are covered"""
+        columns = Columns(("price",))
+        self.assertTrue(columns.covers("price", "<", 1.5))
+        self.assertFalse(columns.covers("price", "<", "1"))
+        self.assertFalse(columns.covers("price", "<", True))
+        self.assertFalse(columns.covers("price", "<", float("nan")))
+        self.assertFalse(columns.covers("name", "=", 1))
+        self.assertFalse(columns.covers("price", "~", 1))
+
+    def test_aggregate(self):
+        """Test summaries per group, merged into previous ones"""
+        columns = Columns(("price",))
+        for key, price in (("a", 10), ("b", 30), ("c", "free"), ("d", 2.5)):
+            columns.add(key, price)
+        groups = {"a": "x", "b": "x", "c": "x", "d": "y"}
+        result = columns.aggregate(("price",), label=groups.get)
+        self.assertEqual(result["x"], {None: {"count": 3},
+                                       "price": {"count": 2, "sum": 40,
+                                                 "min": 10, "max": 30,
+                                                 "avg": 20.0}})
+        self.assertEqual(result["y"]["price"]["max"], 2.5)
+        other = Columns(("price",))
+        other.add("e", 50)
+        other.aggregate(("price",), ["e"], lambda key: "x", result)
+        self.assertEqual(result["x"][None], {"count": 4})
+        self.assertEqual(result["x"]["price"]["avg"], 30.0)
+        self.assertEqual(columns.aggregate((), ["a", "b"]),
+                         {None: {None: {"count": 2}}})
+        self.assertEqual(columns.aggregate(("price",), groups={
+            "x": {"a", "b"}, "y": {"d"}})["x"]["price"]["sum"], 40)
+        self.assertEqual(columns.aggregate(("price",), ["c"])[None]["price"],
+                         {"count": 0, "sum": 0, "min": None, "max": None,
+                          "avg": None})
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,64 @@
+#!/usr/bin/python3
+"""Unit tests for the snapshot conversion module"""
+import unittest
+import json
+import os
+import subprocess
+import sys
+from io import StringIO
+from unittest.mock import patch
+from models.engine.codecs import get_codec
+from models.engine.convert import convert, main
+
+RECORD = {
+    "id": "1234",
+    "created_at": "2024-01-01T12:00:00.000001",
+    "updated_at": "2024-01-02T08:30:00",
+    "email": "a@example.com",
+    "amenity_ids": ["x", "y"],
+    "__class__": "User"
+}
+
+class TestConvert(unittest.TestCase):
+    """Test cases for the snapshot conversion"""
+
+    def setUp(self):
+        """Set up test environment"""
+        self.tearDown()
+
+    def tearDown(self):
+        """Clean up test environment"""
+        for path in ("test.json", "test.bin"):
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+
+    def test_convert(self):
+        """Test converting JSON to binary and back keeps every record"""
+        with open("test.json", 'w') as f:
+            json.dump({"User.1234": RECORD}, f)
+        count, _, _ = convert("test.json", "test.bin", get_codec("json"),
+                              get_codec("binary"))
+        self.assertEqual(count, 1)
+        os.remove("test.json")
+        with patch('sys.stdout', new=StringIO()) as output:
+            self.assertEqual(main(["test.bin", "test.json"]), 0)
+        self.assertTrue(output.getvalue().startswith("1 records: "))
+        with open("test.json", 'r') as f:
+            self.assertEqual(json.load(f), {"User.1234": RECORD})
+        with patch('sys.stderr', new=StringIO()):
+            self.assertEqual(main(["test.json"]), 2)
+
+    def test_run_module(self):
+        """Test running the module prints no warning"""
+        with open("test.json", 'w') as f:
+            json.dump({"User.1234": RECORD}, f)
+        result = subprocess.run([sys.executable, "-m",
+                                 "models.engine.convert", "test.json",
+                                 "test.bin"], capture_output=True, text=True)
+        self.assertEqual(result.returncode, 0)
+        self.assertEqual(result.stderr, "")
+
+if __name__ == '__main__':
+    unittest.main()
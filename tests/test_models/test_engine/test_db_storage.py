@@ -0,0 +1,250 @@
+#!/usr/bin/python3
+"""Unit tests for DBStorage class"""
+import unittest
+import os
+import sqlite3
+from unittest.mock import patch
+import models
+from models.base_model import BaseModel
+from models.city import City
+from models.place import Place
+from models.state import State
+from models.user import User
+from models.engine.db_storage import DBStorage
+from models.engine.object_map import ObjectMap
+
+class TestDBStorage(unittest.TestCase):
+    """Test cases for DBStorage class"""
+
+    def setUp(self):
+        """Set up a database engine as the global storage"""
+        self.path = "test_db_storage.db"
+        self.remove()
+        self.storage = DBStorage(self.path)
+        self.storage.reload()
+        patcher = patch.object(models, "storage", self.storage)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def tearDown(self):
+        """Clean up test environment"""
+        self.storage.close()
+        self.remove()
+
+    def remove(self):
+        """Remove the database files"""
+        for suffix in ("", "-wal", "-shm"):
+            try:
+                os.remove(self.path + suffix)
+            except FileNotFoundError:
+                pass
+
+    def reopen(self):
+        """Return a new engine over the same database"""
+        self.storage.close()
+        self.storage = DBStorage(self.path)
+        self.storage.reload()
+        return self.storage
+
+    def test_schema(self):
+        """Test every class has a table and foreign keys are indexed"""
+        with sqlite3.connect(self.path) as connection:
+            tables = {row[0] for row in connection.execute(
+                "SELECT name FROM sqlite_master WHERE type = 'table'")}
+            indexes = {row[0] for row in connection.execute(
+                "SELECT name FROM sqlite_master WHERE type = 'index' "
+                "AND sql IS NOT NULL")}
+            mode = connection.execute("PRAGMA journal_mode").fetchone()[0]
+        self.assertTrue({"BaseModel", "User", "Place", "Review"} <= tables)
+        self.assertTrue({"City_state_id", "Place_city_id",
+                         "User_email"} <= indexes)
+        self.assertEqual(mode, "wal")
+
+    def test_save_reload(self):
+        """Test objects survive a new engine with the same attributes"""
+        place = Place()
+        place.name = "Loft"
+        place.number_rooms = 3
+        place.amenity_ids = ["a", "b"]
+        place.extra = {"pets": True}
+        place.save()
+        place_dict = place.to_dict()
+        obj = self.reopen().get(Place, place.id)
+        self.assertIsNot(obj, place)
+        self.assertEqual(obj.to_dict(), place_dict)
+        self.assertEqual(str(obj), str(place))
+
+    def test_unset_attributes(self):
+        """Test declared attributes that were never set stay unset"""
+        user = User()
+        user.save()
+        obj = self.reopen().get("User", user.id)
+        self.assertNotIn("email", obj.__dict__)
+        self.assertEqual(obj.email, "")
+
+    def test_all(self):
+        """Test all returns every object or the objects of one class"""
+        user = User()
+        state = State()
+        self.storage.save()
+        storage = self.reopen()
+        self.assertEqual(set(storage.all(User)), {f"User.{user.id}"})
+        self.assertEqual(set(storage.all()),
+                         {f"User.{user.id}", f"State.{state.id}"})
+        self.assertIs(storage.all()[f"User.{user.id}"],
+                      storage.get(User, user.id))
+
+    def test_update(self):
+        """Test attribute changes are written by the next save"""
+        user = User()
+        user.save()
+        user.first_name = "Betty"
+        self.storage.save()
+        self.assertEqual(self.reopen().get(User, user.id).first_name, "Betty")
+
+    def test_delete(self):
+        """Test deleted objects are removed on save"""
+        user = User()
+        user.save()
+        storage = self.reopen()
+        storage.delete(storage.get(User, user.id))
+        self.assertIsNone(storage.get(User, user.id))
+        self.assertEqual(storage.count(User), 0)
+        storage.save()
+        self.assertIsNone(self.reopen().get(User, user.id))
+
+    def test_count(self):
+        """Test count includes unsaved objects"""
+        State().save()
+        State()
+        self.assertEqual(self.storage.count(State), 2)
+        self.storage.save()
+        self.assertEqual(self.reopen().count(State), 2)
+        self.assertEqual(self.storage.count(), 2)
+
+    def test_find(self):
+        """Test find matches saved rows and unsaved changes"""
+        cities = [City() for _ in range(3)]
+        cities[0].state_id = "s1"
+        cities[1].state_id = "s1"
+        self.storage.save()
+        cities[1].state_id = "s2"
+        cities[2].state_id = "s1"
+        self.assertEqual(set(self.storage.find(City, state_id="s1")),
+                         {f"City.{cities[0].id}", f"City.{cities[2].id}"})
+        self.storage.save()
+        storage = self.reopen()
+        self.assertEqual(set(storage.find(City, state_id="s1")),
+                         {f"City.{cities[0].id}", f"City.{cities[2].id}"})
+        self.assertEqual(storage.find(City, state_id="s1", name="x"), {})
+
+    def test_copy_write_ignored(self):
+        """Test writing to an unregistered copy leaves the stored object"""
+        user = User()
+        user.email = "a@example.com"
+        self.storage.save()
+        user = self.storage.get(User, user.id)
+        with patch.object(ObjectMap, "touch") as touch:
+            copy = User(**user.to_dict())
+            copy.email = "b@example.com"
+        touch.assert_not_called()
+        self.assertEqual(self.storage.find(User, email="a@example.com"),
+                         {f"User.{user.id}": user})
+        self.assertEqual(self.storage.find(User, email="b@example.com"), {})
+        self.storage.save()
+        self.assertEqual(self.reopen().get(User, user.id).email,
+                         "a@example.com")
+
+    def test_having(self):
+        """Test having looks elements up in SQL and sees unsaved changes"""
+        places = [Place() for _ in range(3)]
+        for place in places[:2]:
+            place.amenity_ids = ["a1", "a2"]
+        self.storage.save()
+        places[0].amenity_ids = ["a1"]
+        places[2].amenity_ids = ["a2", "a1"]
+        self.assertEqual(set(self.storage.having(Place, "amenity_ids",
+                                                 ["a1", "a2"])),
+                         {f"Place.{place.id}" for place in places[1:]})
+        self.storage.save()
+        storage = self.reopen()
+        self.assertEqual(set(storage.having(Place, "amenity_ids",
+                                            ["a1", "a2"])),
+                         {f"Place.{place.id}" for place in places[1:]})
+        storage.delete(storage.get(Place, places[1].id))
+        storage.save()
+        self.assertEqual(len(self.reopen().having(Place, "amenity_ids",
+                                                  ["a1"])), 2)
+
+    def test_having_fills_new_table(self):
+        """Test the element table is filled from rows saved before it"""
+        place = Place()
+        place.amenity_ids = ["a1"]
+        self.storage.save()
+        self.storage.close()
+        with sqlite3.connect(self.path) as connection:
+            connection.execute('DROP TABLE "Place_amenity_ids"')
+        storage = self.reopen()
+        self.assertEqual(list(storage.having(Place, "amenity_ids", ["a1"])),
+                         [f"Place.{place.id}"])
+
+    def test_near(self):
+        """Test near reads bands of latitudes and sees unsaved moves"""
+        places = [Place() for _ in range(3)]
+        for i, place in enumerate(places):
+            place.latitude, place.longitude = 10.0 + i, 20.0
+        self.storage.save()
+        storage = self.reopen()
+        found = storage.near(Place, 10, 20, k=2)
+        self.assertEqual([obj.id for _, obj in found],
+                         [place.id for place in places[:2]])
+        storage.get(Place, places[0].id).latitude = -60.0
+        found = storage.near(Place, -60, 20, k=1)
+        self.assertEqual([obj.id for _, obj in found], [places[0].id])
+        self.assertEqual(len(storage.near(Place, 11, 20, km=120)), 2)
+
+    def test_select_and_aggregate(self):
+        """Test comparisons are narrowed in SQL and see unsaved changes"""
+        places = [Place() for _ in range(3)]
+        for i, place in enumerate(places):
+            place.price_by_night = 100 * (i + 1)
+        places[2].price_by_night = True
+        self.storage.save()
+        storage = self.reopen()
+        found = storage.select(Place, [("price_by_night", "<", 250)])
+        self.assertCountEqual(found, [f"Place.{place.id}"
+                                      for place in places])
+        storage.get(Place, places[0].id).price_by_night = 300
+        self.assertEqual(list(storage.select(
+            Place, [("price_by_night", ">=", 300)]).values())[0].id,
+            places[0].id)
+        result = storage.aggregate(Place, ["price_by_night"])
+        self.assertEqual(result[None]["price_by_night"],
+                         {"count": 2, "sum": 500, "min": 200, "max": 300,
+                          "avg": 250.0})
+
+    def test_transaction_rollback(self):
+        """Test a failed transaction restores objects and writes nothing"""
+        user = User()
+        user.email = "a@b.c"
+        user.save()
+        with self.assertRaises(RuntimeError):
+            with self.storage.transaction():
+                user.email = "x@y.z"
+                user.save()
+                BaseModel().save()
+                raise RuntimeError
+        self.assertEqual(user.email, "a@b.c")
+        self.assertEqual(self.storage.count(BaseModel), 0)
+        self.assertEqual(self.reopen().get(User, user.id).email, "a@b.c")
+
+    def test_transaction_commit(self):
+        """Test a transaction writes its objects once at the end"""
+        with self.storage.transaction():
+            states = [State() for _ in range(100)]
+            for state in states:
+                state.save()
+        self.assertEqual(self.reopen().count(State), 100)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,87 @@
+#!/usr/bin/python3
+"""Unit tests for Durability class"""
+import unittest
+import os
+import time
+from unittest.mock import patch
+from models.engine.durability import Durability
+from models.engine.wal import WriteAheadLog
+
+class TestDurability(unittest.TestCase):
+    """Test cases for Durability class"""
+
+    def setUp(self):
+        """Set up test environment"""
+        self.path = "test_durability.json"
+        self.tearDown()
+
+    def tearDown(self):
+        """Clean up test environment"""
+        for path in (self.path, self.path + ".log"):
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+
+    def test_invalid_level(self):
+        """Test unknown levels are rejected"""
+        with self.assertRaises(ValueError):
+            Durability("paranoid")
+
+    def test_atomic_write(self):
+        """Test atomic_write replaces the file and leaves no temporary"""
+        with open(self.path, 'w') as f:
+            f.write("old")
+        Durability("fsync").atomic_write(self.path, lambda f: f.write("new"))
+        with open(self.path, 'r') as f:
+            self.assertEqual(f.read(), "new")
+        self.assertEqual([name for name in os.listdir(".")
+                          if name.startswith(self.path + ".")], [])
+
+    def test_atomic_write_failure(self):
+        """Test a failing write keeps the previous file intact"""
+        with open(self.path, 'w') as f:
+            f.write("old")
+
+        def write(f):
+            f.write("partial")
+            raise RuntimeError
+
+        with self.assertRaises(RuntimeError):
+            Durability().atomic_write(self.path, write)
+        with open(self.path, 'r') as f:
+            self.assertEqual(f.read(), "old")
+        self.assertEqual([name for name in os.listdir(".")
+                          if name.startswith(self.path + ".")], [])
+
+    def test_fsync_level(self):
+        """Test the fsync level syncs every write"""
+        log = WriteAheadLog(self.path + ".log", Durability("fsync"))
+        with patch("os.fsync") as fsync:
+            log.append([("del", "User.1", None)])
+            log.append([("del", "User.2", None)])
+        self.assertEqual(fsync.call_count, 2)
+        log.close()
+
+    def test_group_level(self):
+        """Test the group level folds several writes into one fsync"""
+        durability = Durability("group", interval=0.05)
+        log = WriteAheadLog(self.path + ".log", durability)
+        with patch("os.fsync") as fsync:
+            for i in range(5):
+                log.append([("del", f"User.{i}", None)])
+            self.assertEqual(fsync.call_count, 0)
+            time.sleep(0.2)
+            self.assertEqual(fsync.call_count, 1)
+        log.close()
+
+    def test_none_level(self):
+        """Test the none level leaves appends buffered until close"""
+        log = WriteAheadLog(self.path + ".log", Durability("none"))
+        log.append([("del", "User.1", None)])
+        self.assertEqual(os.path.getsize(self.path + ".log"), 0)
+        self.assertEqual(len(list(log.replay())), 1)
+        log.close()
+
+if __name__ == '__main__':
+    unittest.main()
@@ -3,11 +3,22 @@
 import unittest
 import os
 import json
+import shutil
+import subprocess
+import sys
+from unittest.mock import patch
 from models.engine.file_storage import FileStorage
+from models.engine.object_map import ObjectMap
 from models.base_model import BaseModel
 from models.user import User
+from models.city import City
+from models.place import Place
+from models.state import State
 from models import storage
 
+ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(
+    os.path.abspath(__file__)))))
+
 class TestFileStorage(unittest.TestCase):
     """Test cases for FileStorage class"""
 
@@ -15,18 +26,24 @@ class TestFileStorage(unittest.TestCase):
         """Set up test environment"""
         self.storage = FileStorage()
         self.file_path = "file.json"
-        try:
-            os.remove(self.file_path)
-        except FileNotFoundError:
-            pass
+        for path in (self.file_path, self.file_path + ".log",
+                     self.file_path + ".lock"):
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+        shutil.rmtree("file.shards", ignore_errors=True)
         FileStorage._FileStorage__objects = {}
 
     def tearDown(self):
         """Clean up test environment"""
-        try:
-            os.remove(self.file_path)
-        except FileNotFoundError:
-            pass
+        for path in (self.file_path, self.file_path + ".log",
+                     self.file_path + ".lock"):
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+        shutil.rmtree("file.shards", ignore_errors=True)
         FileStorage._FileStorage__objects = {}
 
     def test_all(self):
@@ -89,5 +106,588 @@ class TestFileStorage(unittest.TestCase):
         self.assertEqual(self.storage.all()[key].email, "test@example.com")
         self.assertIsInstance(self.storage.all()[key], User)
 
+    def test_defer_reload(self):
+        """Test defer_reload reads the file on the first access only"""
+        user = User()
+        self.storage.new(user)
+        self.storage.save()
+        FileStorage._FileStorage__objects = {}
+        self.storage.defer_reload()
+        self.assertEqual(FileStorage._FileStorage__objects, {})
+        self.assertIs(type(self.storage.get(User, user.id)), User)
+        self.storage.defer_reload()
+        self.storage.reload()
+        self.assertEqual(self.storage.count(), 1)
+
+    def test_delete(self):
+        """Test delete removes the object from storage"""
+        model = BaseModel()
+        self.storage.new(model)
+        self.storage.delete(model)
+        self.assertNotIn(f"BaseModel.{model.id}", self.storage.all())
+
+    def test_attribute_write_marks_dirty(self):
+        """Test writing an attribute flags the stored object"""
+        user = User()
+        self.storage.save()
+        self.assertEqual(self.storage.all().dirty, set())
+        user.email = "dirty@example.com"
+        self.assertEqual(self.storage.all().dirty, {f"User.{user.id}"})
+
+    def test_copy_write_ignored(self):
+        """Test writing to an unregistered copy leaves the stored object"""
+        user = User()
+        user.email = "a@example.com"
+        self.storage.save()
+        copy = User(**user.to_dict())
+        copy.email = "b@example.com"
+        self.assertEqual(self.storage.find(User, email="a@example.com"),
+                         {f"User.{user.id}": user})
+        self.assertEqual(self.storage.find(User, email="b@example.com"), {})
+        self.assertEqual(self.storage.all().dirty, set())
+
+    def test_save_reuses_clean_records(self):
+        """Test save only re-encodes objects changed since the last save"""
+        user = User()
+        other = User()
+        self.storage.save()
+        records = self.storage.all().records
+        cached = records[f"User.{other.id}"]
+        user.email = "dirty@example.com"
+        self.storage.save()
+        self.assertIs(records[f"User.{other.id}"], cached)
+        self.assertIn("dirty@example.com", records[f"User.{user.id}"])
+        with open(self.file_path, 'r') as f:
+            data = json.load(f)
+        self.assertEqual(data[f"User.{user.id}"]["email"],
+                         "dirty@example.com")
+
+    def test_all_cls(self):
+        """Test all filters by class or class name"""
+        user = User()
+        city = City()
+        self.assertEqual(self.storage.all(User), {f"User.{user.id}": user})
+        self.assertEqual(self.storage.all("City"), {f"City.{city.id}": city})
+        self.assertEqual(self.storage.all("Review"), {})
+
+    def test_find(self):
+        """Test find returns the objects matching every given value"""
+        city = City()
+        city.state_id = "s1"
+        city.name = "San Francisco"
+        other = City()
+        other.state_id = "s1"
+        City().state_id = "s2"
+        found = self.storage.find(City, state_id="s1")
+        self.assertEqual(set(found), {f"City.{city.id}", f"City.{other.id}"})
+        found = self.storage.find("City", state_id="s1", name="San Francisco")
+        self.assertEqual(list(found), [f"City.{city.id}"])
+        self.assertEqual(self.storage.find(City, name="San Francisco"),
+                         {f"City.{city.id}": city})
+
+    def test_find_follows_updates(self):
+        """Test the index follows attribute updates and deletes"""
+        user = User()
+        user.email = "old@example.com"
+        user.email = "new@example.com"
+        self.assertEqual(self.storage.find(User, email="old@example.com"), {})
+        self.assertEqual(self.storage.find(User, email="new@example.com"),
+                         {f"User.{user.id}": user})
+        del user.email
+        self.assertEqual(self.storage.find(User, email=""),
+                         {f"User.{user.id}": user})
+        self.storage.delete(user)
+        self.assertEqual(self.storage.find(User, email=""), {})
+
+    def test_having(self):
+        """Test having finds the places holding every amenity"""
+        places = [Place() for _ in range(3)]
+        places[0].amenity_ids = ["a1", "a2"]
+        places[1].amenity_ids = ["a1"]
+        places[2].amenity_ids = ["a2", "a1"]
+        found = self.storage.having(Place, "amenity_ids", ["a1", "a2"])
+        self.assertEqual(set(found), {f"Place.{places[0].id}",
+                                      f"Place.{places[2].id}"})
+        places[0].amenity_ids = ["a2"]
+        self.assertEqual(list(self.storage.having("Place", "amenity_ids",
+                                                  ["a1", "a2"])),
+                         [f"Place.{places[2].id}"])
+        self.assertEqual(len(self.storage.having(Place, "amenity_ids", [])),
+                         3)
+        self.assertEqual(self.storage.find(Place, amenity_ids=["a1"]),
+                         {f"Place.{places[1].id}": places[1]})
+
+    def test_near(self):
+        """Test near follows coordinate updates and deletes"""
+        paris, london = Place(), Place()
+        paris.latitude, paris.longitude = 48.8566, 2.3522
+        london.latitude, london.longitude = 51.5074, -0.1278
+        found = self.storage.near(Place, 48.85, 2.35, k=2)
+        self.assertEqual([obj for _, obj in found], [paris, london])
+        self.assertLess(found[0][0], 1)
+        self.assertEqual(self.storage.near("Place", 48.85, 2.35, km=100),
+                         found[:1])
+        paris.latitude = 40.0
+        self.assertEqual(self.storage.near(Place, 48.85, 2.35, km=100), [])
+        self.storage.delete(london)
+        self.assertEqual([obj for _, obj in self.storage.near(
+            Place, 48.85, 2.35, k=2)], [paris])
+        self.assertEqual(self.storage.near(User, 0, 0, k=1), [])
+
+    def test_select(self):
+        """Test select answers numbers from the snapshot and follows writes"""
+        places = [Place() for _ in range(4)]
+        for i, place in enumerate(places):
+            place.price_by_night = 50 * i
+            place.city_id = "c1" if i % 2 else "c2"
+        places[3].price_by_night = "unknown"
+        found = self.storage.select(Place, [("price_by_night", "<", 120),
+                                            ("price_by_night", "!=", 0)])
+        self.assertEqual(list(found.values()), [places[1], places[2]])
+        places[0].price_by_night = 60
+        found = self.storage.select("Place", [("price_by_night", ">=", 60),
+                                              ("city_id", "=", "c2")])
+        self.assertCountEqual(found.values(), [places[0], places[2]])
+        self.storage.delete(places[2])
+        self.assertEqual(list(self.storage.select(
+            Place, [("price_by_night", ">", 55), ("name", "=", "")])),
+            [f"Place.{places[0].id}"])
+        with self.assertRaises(ValueError):
+            self.storage.select(Place, [("price_by_night", "~", 1)])
+
+    def test_aggregate(self):
+        """Test counts, sums, extremes and averages per group"""
+        places = [Place() for _ in range(3)]
+        for i, place in enumerate(places):
+            place.price_by_night = 100 + 50 * i
+            place.city_id = "c1" if i else "c2"
+        places[2].max_guest = None
+        result = self.storage.aggregate(Place, ["price_by_night",
+                                                "max_guest"], by="city_id")
+        self.assertEqual(result["c1"][None], {"count": 2})
+        self.assertEqual(result["c1"]["price_by_night"],
+                         {"count": 2, "sum": 350, "min": 150, "max": 200,
+                          "avg": 175.0})
+        self.assertEqual(result["c1"]["max_guest"]["count"], 1)
+        self.assertEqual(result["c2"]["price_by_night"]["avg"], 100.0)
+        result = self.storage.aggregate(
+            Place, conditions=[("price_by_night", ">", 120)])
+        self.assertEqual(result, {None: {None: {"count": 2}}})
+        self.assertEqual(self.storage.aggregate(City, ["name"]),
+                         {None: {None: {"count": 0},
+                                 "name": {"count": 0, "sum": 0, "min": None,
+                                          "max": None, "avg": None}}})
+
+    def test_get(self):
+        """Test get returns the object with the given class and id"""
+        user = User()
+        self.assertIs(self.storage.get(User, user.id), user)
+        self.assertIs(self.storage.get("User", user.id), user)
+        self.assertIsNone(self.storage.get("City", user.id))
+
+    def test_count(self):
+        """Test count by class and in total"""
+        User()
+        User()
+        City()
+        self.assertEqual(self.storage.count(), 3)
+        self.assertEqual(self.storage.count(User), 2)
+        self.assertEqual(self.storage.count("Review"), 0)
+
+    def test_lazy_reload(self):
+        """Test lazy reload builds objects only when they are accessed"""
+        user = User()
+        user.email = "lazy@example.com"
+        city = City()
+        self.storage.save()
+        FileStorage._FileStorage__objects = {}
+        lazy = FileStorage(lazy=True)
+        lazy.reload()
+        objects = FileStorage._FileStorage__objects
+        self.assertEqual(len(objects), 0)
+        self.assertEqual(lazy.count(), 2)
+        found = lazy.get(User, user.id)
+        self.assertEqual(found.email, "lazy@example.com")
+        self.assertEqual(len(objects), 1)
+        self.assertIn(f"City.{city.id}", lazy.all(City))
+        self.assertEqual(len(objects), 2)
+
+    def test_lazy_save_keeps_unread_records(self):
+        """Test saving a lazy store writes back records never accessed"""
+        user = User()
+        city = City()
+        self.storage.save()
+        FileStorage._FileStorage__objects = {}
+        lazy = FileStorage(lazy=True)
+        lazy.reload()
+        lazy.get(User, user.id).email = "lazy@example.com"
+        lazy.save()
+        with open(self.file_path, 'r') as f:
+            data = json.load(f)
+        self.assertIn(f"City.{city.id}", data)
+        self.assertEqual(data[f"User.{user.id}"]["email"],
+                         "lazy@example.com")
+
+    def test_transaction_commit(self):
+        """Test saves inside a transaction are written once at the end"""
+        with self.storage.transaction():
+            user = User()
+            user.save()
+            City().save()
+            self.assertFalse(os.path.exists(self.file_path))
+        with open(self.file_path, 'r') as f:
+            data = json.load(f)
+        self.assertIn(f"User.{user.id}", data)
+        self.assertEqual(self.storage.all().dirty, set())
+
+    def test_transaction_rollback(self):
+        """Test an exception undoes every change made in the transaction"""
+        user = User()
+        user.email = "before@example.com"
+        gone = City()
+        self.storage.save()
+        with self.assertRaises(RuntimeError):
+            with self.storage.transaction():
+                user.email = "after@example.com"
+                user.first_name = "Betty"
+                self.storage.delete(gone)
+                created = User()
+                created.save()
+                raise RuntimeError
+        self.assertEqual(user.email, "before@example.com")
+        self.assertNotIn("first_name", user.__dict__)
+        self.assertIn(f"City.{gone.id}", self.storage.all())
+        self.assertNotIn(f"User.{created.id}", self.storage.all())
+        self.assertEqual(self.storage.find(User, email="before@example.com"),
+                         {f"User.{user.id}": user})
+        self.assertEqual(self.storage.all().dirty, set())
+
+    def test_nested_transaction(self):
+        """Test a nested transaction only saves with the outer one"""
+        with self.storage.transaction():
+            with self.storage.transaction():
+                User().save()
+            self.assertFalse(os.path.exists(self.file_path))
+        self.assertTrue(os.path.exists(self.file_path))
+
+    def test_invalid_mode(self):
+        """Test an unknown storage mode is rejected"""
+        with self.assertRaises(ValueError):
+            FileStorage(mode="bogus")
+
+    def test_save_later(self):
+        """Test save_later writes the objects as they were when called"""
+        user = User()
+        user.email = "before@example.com"
+        write = self.storage.save_later()
+        user.email = "after@example.com"
+        self.assertFalse(os.path.exists(self.file_path))
+        write()
+        with open(self.file_path, 'r') as f:
+            self.assertEqual(json.load(f)[f"User.{user.id}"]["email"],
+                             "before@example.com")
+        self.assertEqual(self.storage.all().dirty, {f"User.{user.id}"})
+        self.storage.save_later()()
+        with open(self.file_path, 'r') as f:
+            self.assertEqual(json.load(f)[f"User.{user.id}"]["email"],
+                             "after@example.com")
+        wal = FileStorage(mode="wal")
+        User()
+        wal.save_later()()
+        self.assertTrue(os.path.exists(self.file_path + ".log"))
+
+    def test_wal_save_appends(self):
+        """Test WAL mode appends changes instead of rewriting the file"""
+        wal = FileStorage(mode="wal")
+        wal.all()
+        wal.compact()
+        user = User()
+        user.email = "wal@example.com"
+        wal.new(user)
+        wal.save()
+        with open(self.file_path, 'r') as f:
+            self.assertEqual(json.load(f), {})
+        with open(self.file_path + ".log", 'r') as f:
+            lines = f.readlines()
+        self.assertEqual(len(lines), 1)
+        self.assertEqual(json.loads(lines[0])["key"], f"User.{user.id}")
+
+    def test_wal_reload_replays_log(self):
+        """Test reload applies the log on top of the snapshot"""
+        wal = FileStorage(mode="wal")
+        user = User()
+        kept = User()
+        wal.compact()
+        user.email = "wal@example.com"
+        wal.new(user)
+        del wal.all()[f"User.{kept.id}"]
+        wal.save()
+        FileStorage._FileStorage__objects = {}
+        wal.reload()
+        self.assertEqual(wal.all()[f"User.{user.id}"].email,
+                         "wal@example.com")
+        self.assertNotIn(f"User.{kept.id}", wal.all())
+
+    def test_wal_compaction(self):
+        """Test the log is folded into the snapshot past the threshold"""
+        wal = FileStorage(mode="wal", compact_every=3)
+        wal.compact()
+        users = []
+        for _ in range(3):
+            users.append(User())
+            wal.save()
+        self.assertFalse(os.path.exists(self.file_path + ".log"))
+        with open(self.file_path, 'r') as f:
+            data = json.load(f)
+        for user in users:
+            self.assertIn(f"User.{user.id}", data)
+
+    def test_records(self):
+        """Test records serves stored and unread records without building"""
+        users = [User() for _ in range(3)]
+        city = City()
+        self.storage.save()
+        FileStorage._FileStorage__objects = {}
+        lazy = FileStorage(lazy=True)
+        lazy.reload()
+        records = dict(lazy.records(User))
+        self.assertEqual(
+            FileStorage._FileStorage__objects.partition("User"), {})
+        self.assertEqual(lazy.count(User), 3)
+        self.assertEqual(len(lazy.all(City)), 1)
+        self.assertEqual({key: json.loads(record)
+                          for key, record in records.items()},
+                         {f"User.{user.id}": user.to_dict()
+                          for user in users})
+        self.assertEqual(json.loads(dict(lazy.records())[f"City.{city.id}"]),
+                         city.to_dict())
+
+    def read_shards(self):
+        """Return the contents of the shard files by file name"""
+        result = {}
+        for name in os.listdir("file.shards"):
+            with open(os.path.join("file.shards", name), 'r') as f:
+                result[name] = f.read()
+        return result
+
+    def test_sharded_save(self):
+        """Test the sharded layout writes one file per class"""
+        sharded = FileStorage(layout="sharded")
+        user, state = User(), State()
+        sharded.save()
+        self.assertFalse(os.path.exists(self.file_path))
+        shards = self.read_shards()
+        self.assertEqual(set(shards), {"User.json", "State.json"})
+        self.assertEqual(list(json.loads(shards["User.json"])),
+                         [f"User.{user.id}"])
+        sharded.delete(state)
+        sharded.save()
+        self.assertEqual(set(self.read_shards()), {"User.json"})
+        FileStorage._FileStorage__objects = {}
+        sharded.reload()
+        self.assertEqual(list(sharded.all()), [f"User.{user.id}"])
+
+    def test_sharded_parallel_save(self):
+        """Test workers write the same shards as a single process"""
+        for i in range(20):
+            (User() if i % 2 else City()).name = f"object {i}"
+        FileStorage(layout="sharded").save()
+        expected = self.read_shards()
+        shutil.rmtree("file.shards")
+        parallel = FileStorage(layout="sharded", workers=2)
+        objects = FileStorage._FileStorage__objects
+        objects.dirty.update(objects)
+        objects.records.clear()
+        with patch.object(FileStorage, "parallel_min", 0):
+            parallel.compact()
+        self.assertEqual(self.read_shards(), expected)
+        self.assertEqual(len(objects.records), 20)
+
+    def test_sharded_parallel_lazy_reload(self):
+        """Test workers split the shards of a lazy reload"""
+        users = {f"User.{User().id}" for _ in range(3)}
+        cities = {f"City.{City().id}" for _ in range(2)}
+        FileStorage(layout="sharded").save()
+        FileStorage._FileStorage__objects = {}
+        lazy = FileStorage(layout="sharded", lazy=True, workers=2)
+        lazy.reload()
+        objects = FileStorage._FileStorage__objects
+        self.assertEqual(set(objects.stashed("User")), users)
+        self.assertEqual(set(objects.stashed("City")), cities)
+        self.assertEqual(len(objects), 0)
+        self.assertEqual(set(lazy.all(User)), users)
+
+    def test_sharded_save_dirty_shards(self):
+        """Test a save only rewrites the shards of changed classes"""
+        sharded = FileStorage(layout="sharded")
+        user, state = User(), State()
+        sharded.save()
+        inodes = {name: os.stat(os.path.join("file.shards", name)).st_ino
+                  for name in ("User.json", "State.json")}
+        user.first_name = "Betty"
+        sharded.save()
+        self.assertEqual(os.stat("file.shards/State.json").st_ino,
+                         inodes["State.json"])
+        self.assertNotEqual(os.stat("file.shards/User.json").st_ino,
+                            inodes["User.json"])
+        self.assertEqual(json.loads(self.read_shards()["User.json"])
+                         [f"User.{user.id}"]["first_name"], "Betty")
+        self.assertEqual(list(json.loads(self.read_shards()["State.json"])),
+                         [f"State.{state.id}"])
+
+    def test_sharded_wal_compaction(self):
+        """Test a compaction rewrites the shards of the logged classes"""
+        sharded = FileStorage(mode="wal", layout="sharded")
+        user, state = User(), State()
+        sharded.save()
+        inode = os.stat("file.shards/State.json").st_ino
+        user.first_name = "Betty"
+        sharded.save()
+        self.assertEqual(json.loads(self.read_shards()["User.json"])
+                         [f"User.{user.id}"].get("first_name"), None)
+        sharded.compact()
+        self.assertEqual(json.loads(self.read_shards()["User.json"])
+                         [f"User.{user.id}"]["first_name"], "Betty")
+        self.assertEqual(os.stat("file.shards/State.json").st_ino, inode)
+        self.assertEqual(list(json.loads(self.read_shards()["State.json"])),
+                         [f"State.{state.id}"])
+
+    def test_sharded_reload_classes(self):
+        """Test reload reads the other shards only when they are needed"""
+        sharded = FileStorage(layout="sharded")
+        user, state = User(), State()
+        sharded.save()
+        FileStorage._FileStorage__objects = {}
+        sharded.reload(classes=[User])
+        objects = FileStorage._FileStorage__objects
+        self.assertEqual(list(objects), [f"User.{user.id}"])
+        self.assertEqual(objects.unread, {"State"})
+        other = State()
+        sharded.save()
+        self.assertEqual(objects.unread, set())
+        self.assertEqual(set(json.loads(self.read_shards()["State.json"])),
+                         {f"State.{state.id}", f"State.{other.id}"})
+
+    def test_sharded_read_keeps_new_objects(self):
+        """Test reading a shard on demand keeps the objects stored since"""
+        sharded = FileStorage(mode="wal", layout="sharded")
+        older = User()
+        State()
+        sharded.compact()
+        FileStorage._FileStorage__objects = ObjectMap()
+        sharded.reload(classes=[State])
+        user = User()
+        sharded.save()
+        self.assertIs(sharded.get(User, user.id), user)
+        self.assertIsNotNone(sharded.get(User, older.id))
+        user.first_name = "Bob"
+        sharded.save()
+        FileStorage._FileStorage__objects = {}
+        sharded.reload()
+        self.assertEqual(sharded.get(User, user.id).first_name, "Bob")
+
+    def test_sharded_defer_reload(self):
+        """Test a deferred reload reads the shard of each class on demand"""
+        sharded = FileStorage(layout="sharded")
+        user, state = User(), State()
+        sharded.save()
+        FileStorage._FileStorage__objects = {}
+        sharded.defer_reload()
+        self.assertIsNotNone(sharded.get(User, user.id))
+        objects = FileStorage._FileStorage__objects
+        self.assertEqual(objects.unread, {"State"})
+        self.assertNotIn(f"State.{state.id}", objects)
+        self.assertEqual(sharded.count(), 2)
+        self.assertEqual(objects.unread, set())
+        self.assertIsNotNone(sharded.get(State, state.id))
+
+    def test_layout_migration(self):
+        """Test a snapshot in the other layout is read and migrated"""
+        user = User()
+        self.storage.save()
+        FileStorage._FileStorage__objects = {}
+        sharded = FileStorage(layout="sharded")
+        sharded.reload()
+        self.assertIn(f"User.{user.id}", sharded.all())
+        sharded.save()
+        self.assertFalse(os.path.exists(self.file_path))
+        self.assertEqual(set(self.read_shards()), {"User.json"})
+        FileStorage._FileStorage__objects = {}
+        self.storage.reload()
+        self.storage.save()
+        self.assertFalse(os.path.exists("file.shards"))
+        with open(self.file_path, 'r') as f:
+            self.assertEqual(list(json.load(f)), [f"User.{user.id}"])
+
+    def test_invalid_layout(self):
+        """Test an unknown layout is rejected"""
+        with self.assertRaises(ValueError):
+            FileStorage(layout="striped")
+
+    def run_process(self, code, mode="snapshot"):
+        """Run code in another process sharing the storage files"""
+        env = dict(os.environ, HBNB_STORAGE_SHARED="1",
+                   HBNB_STORAGE_MODE=mode,
+                   PYTHONPATH=ROOT + os.pathsep + os.environ.get(
+                       "PYTHONPATH", ""))
+        return subprocess.Popen([sys.executable, "-c",
+                                 "import models\n" + code], env=env)
+
+    def test_shared_refresh_merges_changes(self):
+        """Test changes saved by another process are merged on refresh"""
+        shared = FileStorage(shared=True)
+        kept = State()
+        changed = State()
+        shared.save()
+        self.assertFalse(shared.refresh())
+        self.run_process(
+            f"from models.city import City\n"
+            f"City().save()\n"
+            f"state = models.storage.get('State', '{changed.id}')\n"
+            f"state.name = 'Changed'\n"
+            f"state.save()\n").wait()
+        self.assertTrue(shared.refresh())
+        self.assertEqual(shared.count(City), 1)
+        self.assertIs(shared.get(State, kept.id), kept)
+        self.assertEqual(shared.get(State, changed.id).name, "Changed")
+
+    def test_shared_save_keeps_other_writes(self):
+        """Test a save does not drop what another process saved"""
+        shared = FileStorage(shared=True)
+        shared.save()
+        self.run_process("from models.city import City\n"
+                         "City().save()\n").wait()
+        state = State()
+        shared.new(state)
+        shared.save()
+        with open(self.file_path, 'r') as f:
+            data = json.load(f)
+        self.assertEqual(sorted(key.partition(".")[0] for key in data),
+                         ["City", "State"])
+
+    def test_shared_wal_reads_log_tail(self):
+        """Test only the new log records are read when the log grew"""
+        shared = FileStorage(mode="wal", shared=True)
+        shared.save()
+        shared.compact()
+        self.run_process("from models.city import City\n"
+                         "City().save()\n", "wal").wait()
+        with patch.object(shared.codec, "read") as read:
+            self.assertEqual(shared.count(City), 1)
+        read.assert_not_called()
+
+    def test_shared_concurrent_writers(self):
+        """Test concurrent processes do not lose each other's objects"""
+        FileStorage(shared=True).save()
+        code = ("from models.state import State\n"
+                "for _ in range(20):\n"
+                "    State().save()\n")
+        for mode in ("snapshot", "wal"):
+            processes = [self.run_process(code, mode) for _ in range(3)]
+            for process in processes:
+                self.assertEqual(process.wait(), 0)
+        shared = FileStorage(mode="wal", shared=True)
+        self.assertEqual(shared.count(State), 120)
+
 if __name__ == '__main__':
-    unittest.main()
\ No newline at end of file
+    unittest.main()
@@ -0,0 +1,80 @@
+#!/usr/bin/python3
+"""Unit tests for the geospatial index"""
+import unittest
+import random
+from models.engine.geo import Grid, distance, scan
+
+class Point:
+    """Object with coordinates"""
+
+    def __init__(self, latitude, longitude):
+        """Initialize the point"""
+        self.latitude = latitude
+        self.longitude = longitude
+
+class TestGeo(unittest.TestCase):
+    """Test cases for Grid, distance and scan"""
+
+    def test_distance(self):
+        """Test great-circle distances between known points"""
+        self.assertAlmostEqual(distance(48.8566, 2.3522, 51.5074, -0.1278),
+                               343.6, delta=0.5)
+        self.assertAlmostEqual(distance(0, 179.5, 0, -179.5), 111.2,
+                               delta=0.1)
+        self.assertEqual(distance(10, 20, 10, 20), 0)
+        with self.assertRaises(ValueError):
+            distance("a", 0, 0, 0)
+
+    def test_update_and_remove(self):
+        """Test keys follow their coordinates and invalid ones are skipped"""
+        grid = Grid()
+        grid.add("Place.1", 0.0, 0.0)
+        grid.add("Place.2", None, 10.0)
+        self.assertEqual(len(grid), 1)
+        grid.update("Place.1", "latitude", 45.0)
+        grid.update("Place.2", "latitude", 45.0)
+        self.assertEqual([key for _, key in grid.near(45, 0, k=1)],
+                         ["Place.1"])
+        self.assertEqual(len(grid.near(45, 10, km=1)), 1)
+        grid.remove("Place.1")
+        grid.remove("Place.3")
+        self.assertEqual([key for _, key in grid.near(45, 0, k=5)],
+                         ["Place.2"])
+        grid.clear()
+        self.assertEqual(grid.near(45, 0, k=5), [])
+        with self.assertRaises(ValueError):
+            grid.near(float("nan"), 0, k=1)
+
+    def test_near_matches_scan(self):
+        """Test radius and nearest searches find what a full scan finds"""
+        rng = random.Random(7)
+        points = {f"Place.{i}": Point(rng.uniform(-90, 90),
+                                      rng.uniform(-180, 180))
+                  for i in range(3000)}
+        grid = Grid(cell_km=100)
+        for key, point in points.items():
+            grid.add(key, point.latitude, point.longitude)
+        for _ in range(50):
+            latitude, longitude = rng.uniform(-90, 90), rng.uniform(-180, 180)
+            for km, k in ((300, None), (2000, None), (None, 1), (None, 20),
+                          (500, 5), (1e6, 3)):
+                expected = scan(points.items(), latitude, longitude, km, k)
+                found = grid.near(latitude, longitude, km, k)
+                self.assertEqual([key for _, key in found],
+                                 [key for _, key in expected])
+                for (a, _), (b, _) in zip(found, expected):
+                    self.assertAlmostEqual(a, b)
+
+    def test_poles_and_antimeridian(self):
+        """Test points on both sides of the antimeridian are neighbours"""
+        grid = Grid()
+        grid.add("east", 10.0, 179.99)
+        grid.add("west", 10.0, -179.99)
+        grid.add("pole", 90.0, 0.0)
+        self.assertEqual({key for _, key in grid.near(10, 180, km=5)},
+                         {"east", "west"})
+        self.assertEqual([key for _, key in grid.near(89.9, 123, k=1)],
+                         ["pole"])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,68 @@
+#!/usr/bin/python3
+"""Unit tests for Index class"""
+import unittest
+from models.engine.index import Index
+
+class TestIndex(unittest.TestCase):
+    """Test cases for Index class"""
+
+    def setUp(self):
+        """Set up test environment"""
+        self.index = Index("state_id")
+
+    def test_add_and_get(self):
+        """Test keys are found under the value they were added with"""
+        self.index.add("City.1", "s1")
+        self.index.add("City.2", "s1")
+        self.index.add("City.3", "s2")
+        self.assertEqual(self.index.get("s1"), {"City.1", "City.2"})
+        self.assertEqual(self.index.get("s3"), set())
+
+    def test_add_replaces_value(self):
+        """Test adding a key again moves it to its new value"""
+        self.index.add("City.1", "s1")
+        self.index.add("City.1", "s2")
+        self.assertEqual(self.index.get("s1"), set())
+        self.assertEqual(self.index.get("s2"), {"City.1"})
+        self.assertNotIn("s1", self.index.values)
+
+    def test_remove(self):
+        """Test removed keys are no longer found"""
+        self.index.add("City.1", "s1")
+        self.index.remove("City.1")
+        self.index.remove("City.2")
+        self.assertEqual(self.index.get("s1"), set())
+        self.assertEqual(self.index.keys, {})
+
+    def test_unhashable(self):
+        """Test unhashable values are skipped"""
+        self.index.add("City.1", ["s1"])
+        self.assertEqual(self.index.keys, {})
+        self.assertEqual(self.index.get(["s1"]), set())
+
+    def test_multi(self):
+        """Test a multi-valued index files keys under each element"""
+        index = Index("amenity_ids", multi=True)
+        index.add("Place.1", ["a1", "a2", ["x"]])
+        index.add("Place.2", ["a2"])
+        index.add("Place.3", "a1")
+        self.assertEqual(index.get("a2"), {"Place.1", "Place.2"})
+        self.assertEqual(index.get("a1"), {"Place.1"})
+        index.add("Place.1", ["a3"])
+        self.assertEqual(index.get("a2"), {"Place.2"})
+        index.remove("Place.1")
+        self.assertEqual(index.get("a3"), set())
+
+    def test_get_all(self):
+        """Test get_all intersects the keys of every value"""
+        index = Index("amenity_ids", multi=True)
+        index.add("Place.1", ["a1", "a2"])
+        index.add("Place.2", ["a1"])
+        index.add("Place.3", ["a1", "a2", "a3"])
+        self.assertEqual(index.get_all(["a1", "a2"]), {"Place.1", "Place.3"})
+        self.assertEqual(index.get_all(["a1", "a4"]), set())
+        self.assertEqual(index.get_all([]), set())
+        self.assertEqual(index.get("a1"), {"Place.1", "Place.2", "Place.3"})
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,57 @@
+#!/usr/bin/python3
+"""Unit tests for FileLock class"""
+import unittest
+import fcntl
+import os
+from models.engine.lock import FileLock
+
+class TestFileLock(unittest.TestCase):
+    """Test cases for FileLock class"""
+
+    def setUp(self):
+        """Set up test environment"""
+        self.path = "test_lock.lock"
+        self.lock = FileLock(self.path)
+
+    def tearDown(self):
+        """Clean up test environment"""
+        try:
+            os.remove(self.path)
+        except FileNotFoundError:
+            pass
+
+    def try_lock(self, operation):
+        """Return whether another open file can take the lock now"""
+        fd = os.open(self.path, os.O_RDWR | os.O_CREAT)
+        try:
+            fcntl.flock(fd, operation | fcntl.LOCK_NB)
+            return True
+        except BlockingIOError:
+            return False
+        finally:
+            os.close(fd)
+
+    def test_exclusive(self):
+        """Test the exclusive lock keeps everyone else out"""
+        with self.lock.exclusive():
+            self.assertTrue(self.lock.held)
+            self.assertFalse(self.try_lock(fcntl.LOCK_SH))
+        self.assertFalse(self.lock.held)
+        self.assertTrue(self.try_lock(fcntl.LOCK_EX))
+
+    def test_shared(self):
+        """Test the shared lock only keeps writers out"""
+        with self.lock.shared():
+            self.assertTrue(self.try_lock(fcntl.LOCK_SH))
+            self.assertFalse(self.try_lock(fcntl.LOCK_EX))
+
+    def test_reentrant(self):
+        """Test a shared lock taken under the exclusive one keeps it"""
+        with self.lock.exclusive():
+            with self.lock.shared():
+                pass
+            self.assertTrue(self.lock.held)
+            self.assertFalse(self.try_lock(fcntl.LOCK_SH))
+
+if __name__ == '__main__':
+    unittest.main()
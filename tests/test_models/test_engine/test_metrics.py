@@ -0,0 +1,98 @@
+#!/usr/bin/python3
+"""Unit tests for Metrics class"""
+import unittest
+import os
+import shutil
+from models.base_model import BaseModel
+from models.engine.file_storage import FileStorage
+from models.engine.metrics import Metrics
+
+class TestMetrics(unittest.TestCase):
+    """Test cases for Metrics class"""
+
+    def setUp(self):
+        """Set up test environment"""
+        self.metrics = Metrics(True)
+        self.methods = {name: BaseModel.__dict__[name]
+                        for name in ("__init__", "to_dict", "__str__")}
+        FileStorage._FileStorage__objects = {}
+
+    def tearDown(self):
+        """Clean up test environment"""
+        for name, method in self.methods.items():
+            setattr(BaseModel, name, method)
+        FileStorage._FileStorage__objects = {}
+        shutil.rmtree("test_profiles", ignore_errors=True)
+        for path in ("file.json", "file.json.log", "file.json.lock"):
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+
+    def test_counters(self):
+        """Test add sums values and reset forgets them"""
+        self.metrics.add("saves")
+        self.metrics.add("saves", 2)
+        self.assertEqual(self.metrics.counters, {"saves": 3})
+        self.metrics.reset()
+        self.assertEqual(self.metrics.counters, {})
+
+    def test_record(self):
+        """Test record keeps calls, total and maximum"""
+        self.metrics.record("work", 0.5)
+        self.metrics.record("work", 1.5)
+        self.assertEqual(self.metrics.timers["work"], [2, 2.0, 1.5])
+
+    def test_wrap(self):
+        """Test wrap times instance, static and after callbacks"""
+        class Thing:
+            """Class with methods to wrap"""
+
+            @staticmethod
+            def double(value):
+                """Return twice value"""
+                return value * 2
+
+            def triple(self, value):
+                """Return three times value"""
+                return value * 3
+
+        thing = Thing()
+        results = []
+        self.metrics.wrap(Thing, "double", "thing.double")
+        self.metrics.wrap(thing, "triple", "thing.triple",
+                          lambda result, value: results.append(result))
+        self.assertEqual(thing.double(2), 4)
+        self.assertEqual(Thing.double(3), 6)
+        self.assertEqual(thing.triple(2), 6)
+        self.assertEqual(results, [6])
+        self.assertEqual(self.metrics.timers["thing.double"][0], 2)
+        self.assertEqual(self.metrics.timers["thing.triple"][0], 1)
+
+    def test_call_profile(self):
+        """Test call dumps one cProfile file per call"""
+        self.metrics.profile_dir = "test_profiles"
+        self.assertEqual(self.metrics.call("console.sum", sum, [1, 2]), 3)
+        self.assertEqual(os.listdir("test_profiles"),
+                         ["00001-console.sum.prof"])
+        self.assertEqual(self.metrics.timers["console.sum"][0], 1)
+
+    def test_instrument(self):
+        """Test instrument counts serialized objects and written bytes"""
+        storage = FileStorage()
+        self.metrics.instrument(storage)
+        obj = BaseModel()
+        storage.new(obj)
+        storage.save()
+        for name in ("model.init", "storage.new", "storage.save",
+                     "codec.encode", "disk.snapshot"):
+            self.assertIn(name, self.metrics.timers)
+        self.assertEqual(self.metrics.counters["storage.flushes"], 1)
+        self.assertEqual(
+            self.metrics.counters["storage.objects_serialized"], 1)
+        self.assertEqual(self.metrics.counters["storage.bytes_written"],
+                         os.path.getsize("file.json"))
+        self.assertIn("objects per flush", self.metrics.report())
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,53 @@
+#!/usr/bin/python3
+"""Unit tests for the layout migration module"""
+import unittest
+import os
+import shutil
+from io import StringIO
+from unittest.mock import patch
+from models.engine.file_storage import FileStorage
+from models.engine.migrate import main
+from models.user import User
+
+class TestMigrate(unittest.TestCase):
+    """Test cases for the layout migration"""
+
+    def setUp(self):
+        """Set up test environment"""
+        self.tearDown()
+
+    def tearDown(self):
+        """Clean up test environment"""
+        try:
+            os.remove("file.json")
+        except FileNotFoundError:
+            pass
+        shutil.rmtree("file.shards", ignore_errors=True)
+        FileStorage._FileStorage__objects = {}
+
+    def test_round_trip(self):
+        """Test the store moves to the sharded layout and back"""
+        user = User()
+        FileStorage().save()
+        with patch('sys.stdout', new=StringIO()) as output:
+            self.assertEqual(main(["sharded"]), 0)
+        self.assertEqual(output.getvalue(),
+                         "1 objects in the sharded layout\n")
+        self.assertFalse(os.path.exists("file.json"))
+        self.assertEqual(os.listdir("file.shards"), ["User.json"])
+        with patch('sys.stdout', new=StringIO()):
+            self.assertEqual(main(["single"]), 0)
+        self.assertFalse(os.path.exists("file.shards"))
+        FileStorage._FileStorage__objects = {}
+        storage = FileStorage()
+        storage.reload()
+        self.assertEqual(list(storage.all()), [f"User.{user.id}"])
+
+    def test_usage(self):
+        """Test an unknown layout prints the usage"""
+        with patch('sys.stderr', new=StringIO()) as output:
+            self.assertEqual(main(["striped"]), 2)
+        self.assertIn("usage", output.getvalue())
+
+if __name__ == '__main__':
+    unittest.main()
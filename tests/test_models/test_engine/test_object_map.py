@@ -0,0 +1,172 @@
+#!/usr/bin/python3
+"""Unit tests for ObjectMap class"""
+import unittest
+from models.engine.object_map import ObjectMap
+
+class TestObjectMap(unittest.TestCase):
+    """Test cases for ObjectMap class"""
+
+    def setUp(self):
+        """Set up test environment"""
+        self.objects = ObjectMap()
+
+    def test_setitem_marks_dirty(self):
+        """Test storing an object flags its key"""
+        self.objects["User.1"] = object()
+        self.assertEqual(self.objects.dirty, {"User.1"})
+
+    def test_delete_marks_dirty(self):
+        """Test removing an object flags its key and drops its record"""
+        self.objects.load("User.1", object(), '{"id": "1"}')
+        del self.objects["User.1"]
+        self.assertEqual(self.objects.dirty, {"User.1"})
+        self.assertNotIn("User.1", self.objects.records)
+
+    def test_clear_marks_dirty(self):
+        """Test clear flags every key"""
+        self.objects.load("User.1", object())
+        self.objects.load("User.2", object())
+        self.objects.clear()
+        self.assertEqual(self.objects.dirty, {"User.1", "User.2"})
+
+    def test_load_is_clean(self):
+        """Test objects loaded from disk are not flagged"""
+        self.objects.load("User.1", object())
+        self.assertEqual(self.objects.dirty, set())
+
+    def test_touch(self):
+        """Test touch only flags stored keys"""
+        self.objects.load("User.1", object())
+        self.objects.touch("User.1")
+        self.objects.touch("User.2")
+        self.assertEqual(self.objects.dirty, {"User.1"})
+
+    def test_record_cache(self):
+        """Test record only encodes dirty objects"""
+        calls = []
+
+        def encode(obj):
+            calls.append(obj)
+            return "{}"
+
+        self.objects.load("User.1", object(), '{"id": "1"}')
+        self.assertEqual(self.objects.record("User.1", encode), '{"id": "1"}')
+        self.objects.touch("User.1")
+        self.assertEqual(self.objects.record("User.1", encode), "{}")
+        self.assertEqual(len(calls), 1)
+
+    def test_partitions(self):
+        """Test objects are partitioned by the class part of their key"""
+        user, city = object(), object()
+        self.objects["User.1"] = user
+        self.objects.load("City.1", city)
+        self.assertEqual(self.objects.partition("User"), {"User.1": user})
+        self.assertEqual(self.objects.partition("City"), {"City.1": city})
+        del self.objects["User.1"]
+        self.assertEqual(self.objects.partition("User"), {})
+
+    def test_indexes(self):
+        """Test declared indexes follow stores, touches and deletes"""
+        objects = ObjectMap(indexes={"City": ("state_id",)})
+        objects["City.1"] = type("City", (), {"state_id": "s1"})()
+        index = objects.index("City", "state_id")
+        self.assertEqual(index.get("s1"), {"City.1"})
+        objects.touch("City.1", "state_id", "s2")
+        self.assertEqual(index.get("s2"), {"City.1"})
+        objects.pop("City.1")
+        self.assertEqual(index.get("s2"), set())
+        self.assertIsNone(objects.index("City", "name"))
+
+    def test_lists(self):
+        """Test the elements of declared list attributes are indexed"""
+        objects = ObjectMap(indexes={"Place": ("city_id",)},
+                            lists={"Place": ("amenity_ids",)})
+        objects["Place.1"] = type("Place", (), {"city_id": "c1",
+                                                "amenity_ids": ["a1"]})()
+        index = objects.index("Place", "amenity_ids")
+        self.assertTrue(index.multi)
+        self.assertEqual(index.get("a1"), {"Place.1"})
+        objects.touch("Place.1", "amenity_ids", ["a1", "a2"])
+        self.assertEqual(index.get_all(["a1", "a2"]), {"Place.1"})
+        self.assertEqual(objects.index("Place", "city_id").get("c1"),
+                         {"Place.1"})
+
+    def test_points(self):
+        """Test declared coordinates are kept in a grid"""
+        objects = ObjectMap(points={"Place": ("latitude", "longitude")})
+        objects["Place.1"] = type("Place", (), {"latitude": 10.0,
+                                                "longitude": 20.0})()
+        grid = objects.grid("Place")
+        self.assertEqual([key for _, key in grid.near(10, 20, km=1)],
+                         ["Place.1"])
+        objects.touch("Place.1", "longitude", 25.0)
+        self.assertEqual(grid.near(10, 20, km=1), [])
+        objects.pop("Place.1")
+        self.assertEqual(len(grid), 0)
+        self.assertIsNone(objects.grid("City"))
+
+    def test_numbers(self):
+        """Test declared numbers are kept in a columnar snapshot"""
+        objects = ObjectMap(numbers={"Place": ("price_by_night",)})
+        objects["Place.1"] = type("Place", (), {"price_by_night": 10})()
+        snapshot = objects.snapshot("Place")
+        self.assertEqual(snapshot.select([("price_by_night", "<", 20)]),
+                         ["Place.1"])
+        objects.touch("Place.1", "price_by_night", 30)
+        self.assertEqual(snapshot.select([("price_by_night", "<", 20)]), [])
+        objects.pop("Place.1")
+        self.assertEqual(len(snapshot), 0)
+        self.assertIsNone(objects.snapshot("City"))
+
+    def test_stash(self):
+        """Test records kept as text until an object replaces them"""
+        self.objects.stash("User.1", '{"id": "1"}')
+        self.assertEqual(self.objects.stashed("User"),
+                         {"User.1": '{"id": "1"}'})
+        self.assertEqual(self.objects.stashed(), {"User.1": '{"id": "1"}'})
+        self.assertNotIn("User.1", self.objects)
+        self.objects.load("User.1", object())
+        self.assertEqual(self.objects.stashed(), {})
+
+    def test_clear_drops_stash(self):
+        """Test clear also forgets records kept as text"""
+        self.objects.stash("User.1", '{"id": "1"}')
+        self.objects.clear()
+        self.assertEqual(self.objects.stashed(), {})
+        self.assertEqual(self.objects.dirty, {"User.1"})
+
+    def test_versions(self):
+        """Test every change gives its class a new, higher version"""
+        self.assertEqual(self.objects.version("User"), 0)
+        self.objects.load("User.1", object())
+        loaded = self.objects.version("User")
+        self.objects["State.1"] = object()
+        self.assertEqual(self.objects.version("User"), loaded)
+        self.assertGreater(self.objects.version(), loaded)
+        self.objects.touch("User.1")
+        touched = self.objects.version("User")
+        self.assertGreater(touched, loaded)
+        self.objects.unload("User.1")
+        self.assertGreater(self.objects.version("User"), touched)
+
+    def test_rollback(self):
+        """Test rollback restores the keys changed since undo was set"""
+        kept = type("User", (), {})()
+        kept.email = "a@example.com"
+        self.objects.load("User.1", kept)
+        self.objects.stash("User.2", '{"id": "2"}')
+        self.objects.undo = {}
+        self.objects.touch("User.1")
+        kept.email = "b@example.com"
+        self.objects["User.3"] = object()
+        self.objects.clear()
+        self.objects.rollback()
+        self.assertIs(self.objects["User.1"], kept)
+        self.assertEqual(kept.email, "a@example.com")
+        self.assertEqual(self.objects.stashed(), {"User.2": '{"id": "2"}'})
+        self.assertNotIn("User.3", self.objects)
+        self.assertEqual(self.objects.dirty, set())
+        self.assertIsNone(self.objects.undo)
+
+if __name__ == '__main__':
+    unittest.main()
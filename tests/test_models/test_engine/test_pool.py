@@ -0,0 +1,29 @@
+#!/usr/bin/python3
+"""Unit tests for parallel_map function"""
+import unittest
+import os
+from models.engine.pool import parallel_map
+
+class TestParallelMap(unittest.TestCase):
+    """Test cases for parallel_map function"""
+
+    def test_order(self):
+        """Test results come back in the order of the jobs"""
+        offset = 10
+        self.assertEqual(parallel_map(lambda job: job + offset, range(8), 3),
+                         list(range(10, 18)))
+
+    def test_workers(self):
+        """Test jobs run in other processes only with several workers"""
+        pids = parallel_map(lambda job: os.getpid(), range(4), 2)
+        self.assertNotIn(os.getpid(), pids)
+        self.assertEqual(parallel_map(lambda job: os.getpid(), range(4), 1),
+                         [os.getpid()] * 4)
+
+    def test_single_job(self):
+        """Test a single job runs in this process"""
+        self.assertEqual(parallel_map(lambda job: os.getpid(), [0], 4),
+                         [os.getpid()])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,128 @@
+#!/usr/bin/python3
+"""Unit tests for the query engine"""
+import unittest
+import os
+from unittest.mock import patch
+from models import storage
+from models.place import Place
+from models.engine.query import Query, QueryError
+
+class TestQuery(unittest.TestCase):
+    """Test cases for Query"""
+
+    def setUp(self):
+        """Create a few places"""
+        storage.all().clear()
+        self.places = []
+        for i in range(10):
+            place = Place()
+            place.name = f"place {i}"
+            place.city_id = "c1" if i % 2 else "c2"
+            place.price_by_night = 10 * i
+            place.max_guest = i % 5
+            self.places.append(place)
+
+    def tearDown(self):
+        """Clean up test environment"""
+        storage.all().clear()
+        try:
+            os.remove("file.json")
+        except FileNotFoundError:
+            pass
+
+    def run_query(self, text):
+        """Return the list of results of the query text"""
+        return list(Query.parse(text, {"Place": Place}).run(storage))
+
+    def test_parse(self):
+        """Test every clause is parsed"""
+        query = Query.parse("Place where price_by_night<100 and "
+                            "name = 'a b' order by name desc limit 3 "
+                            "fields name,max_guest", {"Place": Place})
+        self.assertEqual(query.class_name, "Place")
+        self.assertEqual(query.where, [("price_by_night", "<", 100),
+                                       ("name", "=", "a b")])
+        self.assertEqual((query.order_by, query.descending, query.limit),
+                         ("name", True, 3))
+        self.assertEqual(query.fields, ["name", "max_guest"])
+
+    def test_declared_types(self):
+        """Test values take the type of the declared attribute"""
+        query = Query.parse("Place where name=12 and max_guest=3 and "
+                            "latitude>1 and other=2.5", {"Place": Place})
+        self.assertEqual([value for _, _, value in query.where],
+                         ["12", 3, 1.0, 2.5])
+
+    def test_invalid(self):
+        """Test malformed queries raise QueryError"""
+        for text in ("", "Place where", "Place where a ~ 1",
+                     "Place order name", "Place limit x", "Place limit -1",
+                     "Place sorted"):
+            with self.assertRaises(QueryError):
+                Query.parse(text)
+
+    def test_filter_order_limit(self):
+        """Test conditions, ordering and limit together"""
+        result = self.run_query("Place where price_by_night<70 and "
+                                "max_guest>=2 order by price_by_night desc "
+                                "limit 2")
+        self.assertEqual(result, [self.places[4], self.places[3]])
+
+    def test_order_without_limit(self):
+        """Test ordering every match"""
+        result = self.run_query("Place where city_id=c1 order by max_guest")
+        self.assertEqual([place.max_guest for place in result],
+                         [0, 1, 2, 3, 4])
+
+    def test_limit_stops_scan(self):
+        """Test a limit without order stops at the first matches"""
+        self.assertEqual(self.run_query("Place limit 3"), self.places[:3])
+
+    def test_projection(self):
+        """Test fields returns dictionaries of the selected attributes"""
+        self.assertEqual(self.run_query("Place where name='place 7' "
+                                        "fields name,price_by_night"),
+                         [{"name": "place 7", "price_by_night": 70}])
+
+    def test_conditions_use_select(self):
+        """Test conditions go through storage.select"""
+        with patch.object(storage, "select", wraps=storage.select) as select:
+            result = self.run_query("Place where city_id=c1 and "
+                                    "price_by_night>50")
+        select.assert_called_once_with("Place", [("city_id", "=", "c1"),
+                                                 ("price_by_night", ">", 50)])
+        self.assertCountEqual(result, [self.places[7], self.places[9]])
+
+    def test_groups(self):
+        """Test aggregates per group, ordered and limited like objects"""
+        self.assertEqual(
+            self.run_query("Place where max_guest>0 group by city_id fields "
+                           "count,avg(price_by_night),max(max_guest) "
+                           "order by count desc"),
+            [{"city_id": "c1", "count": 4, "avg(price_by_night)": 50.0,
+              "max(max_guest)": 4},
+             {"city_id": "c2", "count": 4, "avg(price_by_night)": 50.0,
+              "max(max_guest)": 4}])
+        self.assertEqual(self.run_query("Place fields sum(price_by_night),"
+                                        "min(latitude)"),
+                         [{"sum(price_by_night)": 450, "min(latitude)": 0}])
+        self.assertEqual(self.run_query("Place where name=none fields "
+                                        "count,avg(price_by_night)"),
+                         [{"count": 0, "avg(price_by_night)": None}])
+        self.assertEqual(Query.parse("Place group by city_id").count(storage),
+                         2)
+        for text in ("Place fields name,count", "Place fields median(x)",
+                     "Place group by city_id order by name"):
+            with self.assertRaises(QueryError):
+                Query.parse(text)
+
+    def test_count(self):
+        """Test counting does not need objects when there is no condition"""
+        with patch.object(storage, "all") as all_objects:
+            self.assertEqual(Query("Place").count(storage), 10)
+        all_objects.assert_not_called()
+        self.assertEqual(Query.parse("Place where max_guest=0").count(
+            storage), 2)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,67 @@
+#!/usr/bin/python3
+"""Unit tests for the place search"""
+import unittest
+import os
+from models import storage
+from models.city import City
+from models.place import Place
+from models.state import State
+from models.engine.search import places_search
+
+class TestSearch(unittest.TestCase):
+    """Test cases for places_search"""
+
+    def setUp(self):
+        """Create two states with a city each and a place per city"""
+        storage.all().clear()
+        self.states = [State(), State()]
+        self.cities = []
+        self.places = []
+        for state in self.states:
+            city = City()
+            city.state_id = state.id
+            self.cities.append(city)
+            place = Place()
+            place.city_id = city.id
+            self.places.append(place)
+        self.places[0].amenity_ids = ["wifi", "pool"]
+        self.places[1].amenity_ids = ["wifi"]
+
+    def tearDown(self):
+        """Clean up test environment"""
+        storage.all().clear()
+        try:
+            os.remove("file.json")
+        except FileNotFoundError:
+            pass
+
+    def search(self, **ids):
+        """Return the set of ids of the places found"""
+        return {place.id for place in places_search(storage, **ids).values()}
+
+    def test_everything(self):
+        """Test every place matches an empty search"""
+        self.assertEqual(self.search(), {place.id for place in self.places})
+
+    def test_locations(self):
+        """Test states and cities add up"""
+        self.assertEqual(self.search(states=[self.states[0].id]),
+                         {self.places[0].id})
+        self.assertEqual(self.search(states=[self.states[0].id],
+                                     cities=[self.cities[1].id]),
+                         {place.id for place in self.places})
+        self.assertEqual(self.search(cities=["nowhere"]), set())
+
+    def test_amenities(self):
+        """Test places must have every amenity, in the locations if given"""
+        self.assertEqual(self.search(amenities=["wifi"]),
+                         {place.id for place in self.places})
+        self.assertEqual(self.search(amenities=["wifi", "pool"]),
+                         {self.places[0].id})
+        self.assertEqual(self.search(cities=[self.cities[1].id],
+                                     amenities=["wifi"]),
+                         {self.places[1].id})
+        self.assertEqual(self.search(amenities=["spa"]), set())
+
+if __name__ == '__main__':
+    unittest.main()
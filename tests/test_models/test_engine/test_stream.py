@@ -0,0 +1,52 @@
+#!/usr/bin/python3
+"""Unit tests for the streaming JSON reader"""
+import unittest
+import io
+import json
+from models.engine.stream import iter_items
+
+class TestIterItems(unittest.TestCase):
+    """Test cases for iter_items"""
+
+    def items(self, text, chunk_size=1 << 16):
+        """Return the members read from text as a list"""
+        return list(iter_items(io.StringIO(text), chunk_size))
+
+    def test_empty_object(self):
+        """Test an empty object yields nothing"""
+        self.assertEqual(self.items(" { } "), [])
+
+    def test_members(self):
+        """Test every member is yielded with its value and JSON text"""
+        items = self.items('{"User.1": {"id": "1"}, "n": 12, "s": "x"}')
+        self.assertEqual(items, [
+            ("User.1", {"id": "1"}, '{"id": "1"}'),
+            ("n", 12, "12"),
+            ("s", "x", '"x"')
+        ])
+
+    def test_small_chunks(self):
+        """Test values split across chunks are read whole"""
+        data = {f"User.{i}": {"id": str(i), "text": '}]"\\{' * i,
+                              "n": 12345, "l": [1, {"a": None}]}
+                for i in range(50)}
+        text = json.dumps(data, indent=2)
+        for chunk_size in (1, 3, 64):
+            items = self.items(text, chunk_size)
+            self.assertEqual({key: value for key, value, _ in items}, data)
+            for _, value, record in items:
+                self.assertEqual(json.loads(record), value)
+
+    def test_escaped_key(self):
+        """Test member names with escapes are decoded"""
+        self.assertEqual(self.items('{"a\\"b": 1}')[0][0], 'a"b')
+
+    def test_invalid(self):
+        """Test malformed documents raise ValueError"""
+        for text in ("", "[1]", '{"a" 1}', '{"a": 1', '{"a": 1,}',
+                     '{"a": 1 "b": 2}'):
+            with self.assertRaises(ValueError):
+                self.items(text, 2)
+
+if __name__ == '__main__':
+    unittest.main()
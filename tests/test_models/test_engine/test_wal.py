@@ -0,0 +1,51 @@
+#!/usr/bin/python3
+"""Unit tests for WriteAheadLog class"""
+import unittest
+import os
+from models.engine.wal import WriteAheadLog
+
+class TestWriteAheadLog(unittest.TestCase):
+    """Test cases for WriteAheadLog class"""
+
+    def setUp(self):
+        """Set up test environment"""
+        self.path = "test_wal.log"
+        self.log = WriteAheadLog(self.path)
+        self.log.truncate()
+
+    def tearDown(self):
+        """Clean up test environment"""
+        self.log.truncate()
+
+    def test_append_and_replay(self):
+        """Test records are replayed in the order they were appended"""
+        self.log.append([("put", "User.1", '{"id": "1"}')])
+        self.log.append([("del", "User.1", None)])
+        self.assertEqual(self.log.count, 2)
+        self.assertEqual(list(self.log.replay()), [
+            ("put", "User.1", {"id": "1"}),
+            ("del", "User.1", None)
+        ])
+
+    def test_replay_no_file(self):
+        """Test replaying a missing log yields nothing"""
+        self.assertEqual(list(self.log.replay()), [])
+        self.assertEqual(self.log.count, 0)
+
+    def test_replay_truncated_line(self):
+        """Test a partially written last record is ignored"""
+        self.log.append([("put", "User.1", '{"id": "1"}')])
+        with open(self.path, 'a') as f:
+            f.write('{"op": "put", "key": "Us')
+        self.assertEqual(len(list(self.log.replay())), 1)
+        self.assertEqual(self.log.count, 1)
+
+    def test_truncate(self):
+        """Test truncate removes the log file"""
+        self.log.append([("put", "User.1", '{"id": "1"}')])
+        self.log.truncate()
+        self.assertFalse(os.path.exists(self.path))
+        self.assertEqual(self.log.count, 0)
+
+if __name__ == '__main__':
+    unittest.main()
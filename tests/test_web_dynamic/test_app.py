@@ -0,0 +1,56 @@
+#!/usr/bin/python3
+"""Unit tests for the dynamic web server"""
+import unittest
+import os
+from models import storage
+from models.place import Place
+from web_dynamic.app import respond
+
+class TestApp(unittest.TestCase):
+    """Test cases for respond"""
+
+    def setUp(self):
+        """Set up test environment"""
+        storage.all().clear()
+
+    def tearDown(self):
+        """Clean up test environment"""
+        storage.all().clear()
+        try:
+            os.remove("file.json")
+        except FileNotFoundError:
+            pass
+
+    def test_page(self):
+        """Test the page is served with an ETag and 304 when it matches"""
+        Place().name = "My home"
+        status, headers, body = respond("GET", "/hbnb", {}, b"")
+        self.assertEqual(status, 200)
+        self.assertEqual(headers["Content-Type"], "text/html; charset=utf-8")
+        self.assertIn(b"My home", body)
+        tag = headers["ETag"]
+        self.assertEqual(respond("GET", "/", {"if-none-match": tag}, b""),
+                         (304, {"ETag": tag}, b""))
+        Place().name = "Tiny house"
+        self.assertEqual(respond("GET", "/", {"if-none-match": tag},
+                                 b"")[0], 200)
+
+    def test_bad_requests(self):
+        """Test unknown pages and methods are refused"""
+        self.assertEqual(respond("GET", "/hbnb?page=9", {}, b"")[0], 404)
+        self.assertEqual(respond("GET", "/hbnb?page=x", {}, b"")[0], 404)
+        self.assertEqual(respond("POST", "/hbnb", {}, b"")[0], 405)
+
+    def test_static(self):
+        """Test styles are served from web_static, and nothing else"""
+        status, headers, body = respond("GET", "/styles/8-places.css", {},
+                                        b"")
+        self.assertEqual((status, headers["Content-Type"]), (200, "text/css"))
+        self.assertIn(b".places", body)
+        self.assertEqual(respond("GET", "/styles/../8-index.html", {},
+                                 b"")[0], 404)
+        self.assertEqual(respond("GET", "/styles/missing.css", {},
+                                 b"")[0], 404)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,111 @@
+#!/usr/bin/python3
+"""Unit tests for the Pages renderer"""
+import unittest
+import os
+from models import storage
+from models.amenity import Amenity
+from models.city import City
+from models.place import Place
+from models.state import State
+from models.user import User
+from web_dynamic.pages import Pages
+
+class TestPages(unittest.TestCase):
+    """Test cases for Pages"""
+
+    def setUp(self):
+        """Set up a small store and a renderer"""
+        storage.all().clear()
+        self.state = State()
+        self.state.name = "California"
+        self.city = City()
+        self.city.name = "San Francisco"
+        self.city.state_id = self.state.id
+        self.wifi = Amenity()
+        self.wifi.name = "Wifi"
+        self.owner = User()
+        self.owner.first_name = "Jon"
+        self.owner.last_name = "Snow"
+        self.place = Place()
+        self.place.name = "My <home>"
+        self.place.user_id = self.owner.id
+        self.place.price_by_night = 80
+        self.place.max_guest = 1
+        self.place.amenity_ids = [self.wifi.id]
+        self.pages = Pages(storage, per_page=2)
+
+    def tearDown(self):
+        """Clean up test environment"""
+        storage.all().clear()
+        try:
+            os.remove("file.json")
+        except FileNotFoundError:
+            pass
+
+    def test_render(self):
+        """Test the page joins places to their owner and amenities"""
+        html = self.pages.render()
+        self.assertIn("<h2>California:</h2>", html)
+        self.assertIn("> San Francisco</li>", html)
+        self.assertIn("<h2>My &lt;home&gt;</h2>", html)
+        self.assertIn("<p>$80</p>", html)
+        self.assertIn("<p>1 Guest</p>", html)
+        self.assertIn("<p>0 Bedrooms</p>", html)
+        self.assertIn("<b>Owner: </b>Jon Snow", html)
+        self.assertIn("<li>Wifi</li>", html)
+        self.assertNotIn("${", html)
+
+    def test_cache(self):
+        """Test fragments are reused until one of their classes changes"""
+        html = self.pages.render()
+        misses = self.pages.misses
+        self.assertEqual(self.pages.render(), html)
+        self.assertEqual(self.pages.misses, misses)
+        self.owner.first_name = "Aegon"
+        html = self.pages.render()
+        self.assertIn("<b>Owner: </b>Aegon Snow", html)
+        self.assertGreater(self.pages.misses, misses)
+        misses = self.pages.misses
+        self.pages.render()
+        self.assertEqual(self.pages.misses, misses)
+
+    def test_filters_kept_on_place_change(self):
+        """Test the filters are not rendered again for a Place change"""
+        self.pages.render()
+        filters = self.pages.filters()
+        misses = self.pages.misses
+        self.place.name = "Tiny house"
+        self.assertIs(self.pages.filters(), filters)
+        self.assertEqual(self.pages.misses, misses)
+        self.assertIn("Tiny house", self.pages.render())
+
+    def test_paging(self):
+        """Test places are split in pages sorted by name"""
+        for name in ("A suite", "Tiny house"):
+            Place().name = name
+        self.assertEqual(self.pages.count(), 2)
+        first, second = self.pages.places(1), self.pages.places(2)
+        self.assertLess(first.index("A suite"), first.index("My &lt;home"))
+        self.assertIn("Tiny house", second)
+        self.assertIn('href="/hbnb?page=2">Next', self.pages.render(1))
+
+    def test_search(self):
+        """Test the page shows the places found by the checked filters"""
+        other = Place()
+        other.name = "Tiny house"
+        self.place.city_id = self.city.id
+        html = self.pages.render(amenities=[self.wifi.id])
+        self.assertIn("My &lt;home&gt;", html)
+        self.assertNotIn("Tiny house", html)
+        self.assertIn(f'value="{self.wifi.id}" checked', html)
+        html = self.pages.render(states=[self.state.id])
+        self.assertIn("My &lt;home&gt;", html)
+        self.assertNotIn("Tiny house", html)
+        for _ in range(2):
+            place = Place()
+            place.city_id = self.city.id
+        self.assertIn(f"page=2&amp;states={self.state.id}",
+                      self.pages.pages(1, states=[self.state.id]))
+
+if __name__ == '__main__':
+    unittest.main()
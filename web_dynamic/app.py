@@ -0,0 +1,91 @@
+#!/usr/bin/python3
+"""Dynamic web server module for AirBnB clone project
+
+Serves the HBNB page rendered from storage at / and /hbnb, with the
+styles and images of web_static, on the server of the API:
+
+    $ HBNB_WEB_HOST=0.0.0.0 HBNB_WEB_PORT=5001 python3 -m web_dynamic.app
+"""
+import asyncio
+import os
+import sys
+from os import getenv
+from urllib.parse import parse_qs, urlsplit
+from models import storage
+from api.v1.app import Server
+from api.v1.views import etag, etags
+from web_dynamic.pages import Pages
+
+STATIC = os.path.join(os.path.dirname(os.path.dirname(
+    os.path.abspath(__file__))), "web_static")
+_TYPES = {
+    ".css": "text/css",
+    ".png": "image/png",
+    ".jpg": "image/jpeg",
+    ".svg": "image/svg+xml"
+}
+pages = Pages(storage)
+
+
+def respond(method, target, headers, body):
+    """Return (status, headers, body) answering one request
+
+    The page number and the ids checked in the filters come from the
+    query, as in /hbnb?page=2&states=<id>&amenities=<id>&amenities=<id>.
+    Responses carry an ETag and become 304 Not Modified when it is
+    listed in If-None-Match.
+    """
+    url = urlsplit(target)
+    if method != "GET":
+        return 405, {"Allow": "GET"}, b""
+    if url.path in ("/", "/hbnb"):
+        query = parse_qs(url.query)
+        search = [query.get(name, []) for name in
+                  ("states", "cities", "amenities")]
+        try:
+            page = int(query.get("page", ["1"])[0])
+        except ValueError:
+            page = 0
+        if not 1 <= page <= pages.count(*search):
+            return 404, {"Content-Type": "text/plain"}, b"Not found"
+        data = pages.render(page, *search).encode()
+        content_type = "text/html; charset=utf-8"
+    else:
+        data = _static(url.path)
+        if data is None:
+            return 404, {"Content-Type": "text/plain"}, b"Not found"
+        content_type = _TYPES[os.path.splitext(url.path)[1]]
+    tag = etag(data)
+    if tag in etags(headers.get("if-none-match", "")):
+        return 304, {"ETag": tag}, b""
+    return 200, {"Content-Type": content_type, "ETag": tag}, data
+
+
+def _static(path):
+    """Return the content of the web_static file at path, or None"""
+    if not path.startswith(("/styles/", "/images/")) or \
+            os.path.splitext(path)[1] not in _TYPES:
+        return None
+    full = os.path.normpath(os.path.join(STATIC, path.lstrip("/")))
+    if not full.startswith(STATIC + os.sep):
+        return None
+    try:
+        with open(full, 'rb') as f:
+            return f.read()
+    except OSError:
+        return None
+
+
+def main(argv):
+    """Run the web server until interrupted"""
+    server = Server(getenv("HBNB_WEB_HOST", "0.0.0.0"),
+                    int(getenv("HBNB_WEB_PORT", "5001")), respond=respond)
+    try:
+        asyncio.run(server.serve_forever())
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main(sys.argv[1:]))
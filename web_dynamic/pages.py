@@ -0,0 +1,256 @@
+#!/usr/bin/python3
+"""Page rendering module for AirBnB clone project
+
+Pages renders the HBNB page of web_static from storage: the States with
+their Cities and the Amenities in the filters, then one card per Place
+with its owner and its amenities. Every fragment is cached with the
+versions (see storage.version()) of the classes it was built from, so a
+fragment is only rendered again once one of those classes changed, and
+requests in between cost neither a scan of storage nor any formatting.
+
+The filters are a form asking the page again with the ids of the States,
+Cities and Amenities checked; the places shown are then the ones
+places_search() finds, cached for each search like the other fragments.
+"""
+import os
+from collections import OrderedDict
+from html import escape
+from string import Template
+from urllib.parse import urlencode
+from models.amenity import Amenity
+from models.city import City
+from models.place import Place
+from models.state import State
+from models.user import User
+from models.engine.search import places_search
+
+PER_PAGE = 100
+TEMPLATE = os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                        "templates", "hbnb.html")
+
+
+class Pages:
+    """Renders the HBNB page, caching fragments until storage changes"""
+
+    def __init__(self, storage, per_page=PER_PAGE, cache_size=128):
+        """Initialize the renderer
+
+        Args:
+            storage: the storage engine to render from
+            per_page: number of Place cards on a page
+            cache_size: maximum number of fragments kept
+        """
+        self.storage = storage
+        self.per_page = per_page
+        self.cache_size = cache_size
+        self.hits = 0
+        self.misses = 0
+        self.__fragments = OrderedDict()
+        with open(TEMPLATE, 'r') as f:
+            self.__template = Template(f.read())
+
+    def render(self, page=1, states=(), cities=(), amenities=()):
+        """Return the HTML of the page showing the places of page
+
+        states, cities and amenities are the ids checked in the filters.
+        """
+        search = self.__search(states, cities, amenities)
+        return self.__cached(
+            ("page", page, search), (State, City, Amenity, Place, User),
+            lambda: self.__template.substitute(
+                filters=self.filters(*search),
+                places=self.places(page, *search),
+                pages=self.pages(page, *search)))
+
+    def count(self, states=(), cities=(), amenities=()):
+        """Return the number of pages of places found, at least 1"""
+        search = self.__search(states, cities, amenities)
+        return max(1, -(-len(self.__order(search)) // self.per_page))
+
+    def filters(self, states=(), cities=(), amenities=()):
+        """Return the HTML of the filters section, with the ids checked"""
+        search = self.__search(states, cities, amenities)
+        return self.__cached(("filters", search), (State, City, Amenity),
+                             lambda: self.__filters(*search))
+
+    def places(self, page=1, states=(), cities=(), amenities=()):
+        """Return the HTML of the Place cards of page"""
+        search = self.__search(states, cities, amenities)
+        start = (page - 1) * self.per_page
+        return self.__cached(
+            ("places", page, search), (Place, User, Amenity, City),
+            lambda: "\n".join(self.card(place) for place in
+                              self.__order(search)[start:start +
+                                                   self.per_page]))
+
+    def pages(self, page=1, states=(), cities=(), amenities=()):
+        """Return the HTML of the links to the other pages"""
+        search = self.__search(states, cities, amenities)
+        count = self.count(*search)
+        if count == 1:
+            return ""
+        links = []
+        if page > 1:
+            links.append(f'<a href="{self.__link(page - 1, search)}">'
+                         f'Previous</a>')
+        links.append(f"<p>Page {page} of {count}</p>")
+        if page < count:
+            links.append(f'<a href="{self.__link(page + 1, search)}">'
+                         f'Next</a>')
+        return "\n".join(["        <nav class=\"pages\">"] +
+                         [f"          {link}" for link in links] +
+                         ["        </nav>"])
+
+    def card(self, place):
+        """Return the HTML of the card of place"""
+        owner = self.storage.get(User, place.user_id)
+        amenities = [amenity for amenity in
+                     (self.storage.get(Amenity, amenity_id)
+                      for amenity_id in place.amenity_ids or ())
+                     if amenity is not None]
+        lines = [
+            "        <article>",
+            f"          <h2>{escape(str(place.name))}</h2>",
+            "          <div class=\"price_by_night\">",
+            f"            <p>${escape(str(place.price_by_night))}</p>",
+            "          </div>",
+            "          <div class=\"information\">"]
+        for kind, image, count, label in (
+                ("max_guest", "guest_image", place.max_guest, "Guest"),
+                ("number_rooms", "bed_image", place.number_rooms, "Bedroom"),
+                ("number_bathrooms", "bath_image", place.number_bathrooms,
+                 "Bathroom")):
+            lines += [f"            <div class=\"{kind}\">",
+                      f"              <div class=\"{image}\"></div>",
+                      f"              <p>{escape(str(count))} {label}"
+                      f"{'' if count == 1 else 's'}</p>",
+                      "            </div>"]
+        lines.append("          </div>")
+        if owner is not None:
+            name = f"{owner.first_name} {owner.last_name}".strip()
+            lines += ["          <div class=\"user\">",
+                      f"            <p><b>Owner: </b>{escape(name)}</p>",
+                      "          </div>"]
+        lines += ["          <div class=\"description\">",
+                  f"            <p>{escape(str(place.description))}</p>",
+                  "          </div>"]
+        if amenities:
+            lines += ["          <div class=\"place_amenities\">",
+                      "            <h2>Amenities</h2>",
+                      "            <ul>"]
+            lines += [f"              <li>{escape(str(amenity.name))}</li>"
+                      for amenity in self.__sorted(amenities)]
+            lines += ["            </ul>",
+                      "          </div>"]
+        lines.append("        </article>")
+        return "\n".join(lines)
+
+    def __filters(self, states, cities, amenities):
+        """Render the filters section, a form asking for /hbnb again"""
+        locations = [(state, self.__sorted(
+            self.storage.find(City, state_id=state.id).values()))
+            for state in self.__sorted(self.storage.all(State).values())]
+        all_amenities = self.__sorted(self.storage.all(Amenity).values())
+        checked = [state for state, _ in locations if state.id in states] + \
+            [city for _, found in locations for city in found
+             if city.id in cities] or [state for state, _ in locations]
+        lines = ["      <section class=\"filters\">",
+                 "        <form id=\"search\" action=\"/hbnb\" "
+                 "method=\"get\"></form>",
+                 "        <div class=\"locations\">",
+                 "          <h3>States</h3>",
+                 f"          <h4>{self.__summary(checked)}</h4>",
+                 "          <ul class=\"popover\">"]
+        for state, found in locations:
+            lines += ["            <li>",
+                      f"              {self.__box('states', state, states)}",
+                      f"              <h2>{escape(str(state.name))}:</h2>",
+                      "              <ul>"]
+            lines += [f"                <li>"
+                      f"{self.__box('cities', city, cities)} "
+                      f"{escape(str(city.name))}</li>" for city in found]
+            lines += ["              </ul>",
+                      "            </li>"]
+        checked = [amenity for amenity in all_amenities
+                   if amenity.id in amenities]
+        lines += ["          </ul>",
+                  "        </div>",
+                  "        <div class=\"amenities\">",
+                  "          <h3>Amenities</h3>",
+                  f"          <h4>{self.__summary(checked or all_amenities)}"
+                  f"</h4>",
+                  "          <ul class=\"popover\">"]
+        lines += [f"            <li>"
+                  f"{self.__box('amenities', amenity, amenities)} "
+                  f"{escape(str(amenity.name))}</li>"
+                  for amenity in all_amenities]
+        lines += ["          </ul>",
+                  "        </div>",
+                  "        <button form=\"search\">",
+                  "          Search",
+                  "        </button>",
+                  "      </section>"]
+        return "\n".join(lines)
+
+    def __order(self, search):
+        """Return the Places found by search sorted by name"""
+        if not any(search):
+            return self.__cached(("order", search), (Place,),
+                                 lambda: self.__sorted(
+                                     self.storage.all(Place).values()))
+        return self.__cached(("order", search), (Place, City),
+                             lambda: self.__sorted(places_search(
+                                 self.storage, *search).values()))
+
+    def __cached(self, name, classes, build):
+        """Return the fragment name, built with build() if stale
+
+        A fragment is stale once one of classes changed since it was
+        built. Only the cache_size most recently used fragments are kept.
+        """
+        versions = tuple(self.storage.version(cls) for cls in classes)
+        fragments = self.__fragments
+        cached = fragments.get(name)
+        if cached is not None and cached[0] == versions:
+            self.hits += 1
+            fragments.move_to_end(name)
+            return cached[1]
+        self.misses += 1
+        value = build()
+        fragments[name] = (versions, value)
+        fragments.move_to_end(name)
+        while len(fragments) > self.cache_size:
+            fragments.popitem(last=False)
+        return value
+
+    @staticmethod
+    def __search(states, cities, amenities):
+        """Return the search for the given ids as a hashable tuple"""
+        return (tuple(sorted(set(states))), tuple(sorted(set(cities))),
+                tuple(sorted(set(amenities))))
+
+    @staticmethod
+    def __link(page, search):
+        """Return the URL of page for search"""
+        query = [("page", page)]
+        for name, ids in zip(("states", "cities", "amenities"), search):
+            query += [(name, obj_id) for obj_id in ids]
+        return escape(f"/hbnb?{urlencode(query)}")
+
+    @staticmethod
+    def __box(name, obj, checked):
+        """Return the HTML of the checkbox of obj in the field name"""
+        return (f'<input type="checkbox" form="search" name="{name}" '
+                f'value="{escape(str(obj.id))}"'
+                f'{" checked" if obj.id in checked else ""}>')
+
+    @staticmethod
+    def __sorted(objects):
+        """Return objects sorted by name, then id"""
+        return sorted(objects, key=lambda obj: (str(obj.name), obj.id))
+
+    @staticmethod
+    def __summary(objects):
+        """Return the names of the first two objects, then an ellipsis"""
+        names = ", ".join(escape(str(obj.name)) for obj in objects[:2])
+        return names + "..." if len(objects) > 2 else names or "&nbsp;"